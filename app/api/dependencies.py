@@ -1,29 +1,31 @@
-from typing import Annotated
-from fastapi import Depends, HTTPException, status
+from typing import Annotated, Optional
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordBearer
-from sqlalchemy.orm import Session
-from app.db.session import get_db
-from app.services.auth import AuthService
-from app.services.user import UserService
+from app.core.request_context import RequestContext, get_request_context
+from app.db.session import get_db  # noqa: F401 (routers import it from here)
 from app.models.user import User
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/login")
+# Same scheme for dependencies that also serve anonymous requests
+optional_oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/login", auto_error=False)
 
 
-async def get_current_user(
+# The user lookups below query the database, so they are plain functions
+# that FastAPI runs in its threadpool rather than on the event loop
+def get_current_user(
     token: Annotated[str, Depends(oauth2_scheme)],
-    db: Session = Depends(get_db)
+    request: Request,
+    context: RequestContext = Depends(get_request_context)
 ) -> User:
     """Get current authenticated user"""
-    username = AuthService.verify_token(token)
-    if not username:
+    user = context.resolve_user(token)
+    if not context.username:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid authentication credentials",
             headers={"WWW-Authenticate": "Bearer"},
         )
     
-    user = UserService.get_user_by_username(db, username)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -36,9 +38,19 @@ async def get_current_user(
             detail="Inactive user"
         )
     
+    request.state.user = user
     return user
 
 
+def get_optional_user(
+    token: Annotated[Optional[str], Depends(optional_oauth2_scheme)],
+    context: RequestContext = Depends(get_request_context)
+) -> Optional[User]:
+    """The authenticated user if a valid token was sent, else None"""
+    user = context.resolve_user(token)
+    return user if user and user.is_active else None
+
+
 async def get_current_active_superuser(
     current_user: Annotated[User, Depends(get_current_user)]
 ) -> User:
@@ -1,19 +1,47 @@
-from typing import Annotated
-from fastapi import APIRouter, Depends, HTTPException, status
+import logging
+from typing import Annotated, Optional
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.orm import Session
+from app.api.dependencies import oauth2_scheme
+from app.config.settings import settings
 from app.db.session import get_db
-from app.schemas.auth import Token, LoginRequest, RefreshTokenRequest
+from app.core.oauth2 import GoogleOAuth2
+from app.schemas.auth import Token, LoginRequest, RefreshTokenRequest, GoogleLoginRequest
 from app.schemas.user import UserCreate, UserResponse
 from app.services.auth import AuthService
 from app.services.user import UserService
 from app.services.subscription import SubscriptionService
+from app.models.subscription import PlanType
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
 subscription_service = SubscriptionService()
 
 
+def client_ip(request: Request) -> Optional[str]:
+    """
+    The caller's IP. Behind TRUSTED_PROXY_HOPS proxies it's the address the
+    outermost one saw; entries left of that are client-supplied and ignored.
+    """
+    peer = request.client.host if request.client else None
+    hops = settings.TRUSTED_PROXY_HOPS
+    if hops <= 0:
+        return peer
+    forwarded = [
+        address.strip()
+        for header in request.headers.getlist("x-forwarded-for")
+        for address in header.split(",")
+        if address.strip()
+    ]
+    if len(forwarded) < hops:
+        # Fewer entries than proxies: the request skipped one of them
+        return peer
+    return forwarded[-hops]
+
+
 @router.post("/register", response_model=UserResponse)
 async def register(
     user_create: UserCreate,
@@ -43,27 +71,58 @@ async def register(
 @router.post("/login", response_model=Token)
 async def login(
     form_data: Annotated[OAuth2PasswordRequestForm, Depends()],
+    request: Request,
     db: Session = Depends(get_db)
 ):
     """
     OAuth2 compatible token login, get an access token for future requests
     """
-    token = AuthService.login(db, form_data.username, form_data.password)
+    token = AuthService.login(
+        db, form_data.username, form_data.password, client_ip(request)
+    )
     return token
 
 
 @router.post("/login-json", response_model=Token)
 async def login_json(
     login_data: LoginRequest,
+    request: Request,
     db: Session = Depends(get_db)
 ):
     """
     Alternative JSON login endpoint
     """
-    token = AuthService.login(db, login_data.username, login_data.password)
+    token = AuthService.login(
+        db, login_data.username, login_data.password, client_ip(request)
+    )
     return token
 
 
+@router.post("/google", response_model=Token)
+async def google_login(
+    google_data: GoogleLoginRequest,
+    db: Session = Depends(get_db)
+):
+    """
+    Sign in with Google, linking or creating the account
+    """
+    id_token = google_data.id_token or await GoogleOAuth2.exchange_code(
+        google_data.code, google_data.redirect_uri
+    )
+    idinfo = await GoogleOAuth2.verify_token(id_token)
+    user, created = UserService.get_or_create_google_user(db, idinfo)
+
+    if created:
+        try:
+            await subscription_service.create_initial_subscription(
+                db=db, user=user, plan_type=PlanType.FREE
+            )
+        except Exception as e:
+            logger.error(f"Error setting up subscription for user {user.id}: {str(e)}")
+
+    return AuthService.issue_tokens(user)
+
+
 @router.post("/refresh", response_model=Token)
 async def refresh_token(
     refresh_data: RefreshTokenRequest,
@@ -74,3 +133,15 @@ async def refresh_token(
     """
     token = AuthService.refresh_token(db, refresh_data.refresh_token)
     return token
+
+
+@router.post("/logout")
+async def logout(
+    refresh_data: RefreshTokenRequest,
+    token: Annotated[str, Depends(oauth2_scheme)]
+):
+    """
+    Revoke the current access token and its refresh token
+    """
+    AuthService.logout(token, refresh_data.refresh_token)
+    return {"status": "success"}
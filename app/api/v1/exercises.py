@@ -1,14 +1,21 @@
 from typing import List, Optional
-from fastapi import APIRouter, Depends, Query
+from uuid import UUID
+from fastapi import APIRouter, Depends, Header, Query, Response
 from sqlalchemy.orm import Session
+from app.core.cache import cached_json_response, exercise_response_cache
+from app.config.settings import settings
 from app.core.rate_limiter import rate_limiter
+from app.core.responses import FastJSONResponse
 from app.api.dependencies import get_db, get_current_user
 from app.models.user import User
 from app.schemas.exercise import (
     Exercise, ExerciseCreate, ExerciseUpdate,
-    ExerciseCategory, MuscleGroup, Equipment
+    ExerciseCategory, MuscleGroup, Equipment,
+    ExerciseAlternative, CatalogManifest
 )
+from app.services.catalog_snapshot import CatalogSnapshotService
 from app.services.exercise import ExerciseService
+from app.services.exercise_similarity import ExerciseSimilarityService
 
 router = APIRouter()
 
@@ -21,14 +28,43 @@ def create_exercise(
     """Create a new custom exercise"""
     return ExerciseService.create_exercise(db, exercise, current_user)
 
+# Declared before /exercises/{exercise_id} so the path isn't captured as an id
+@router.get("/exercises/catalog-manifest", response_model=CatalogManifest, dependencies=[Depends(rate_limiter)])
+def get_catalog_manifest(response: Response, db: Session = Depends(get_db)):
+    """Version and download URLs of the latest exercise catalog bundle"""
+    response.headers["Cache-Control"] = "public, max-age=300"
+    return CatalogSnapshotService.get_manifest(db)
+
 @router.get("/exercises/{exercise_id}", response_model=Exercise, dependencies=[Depends(rate_limiter)])
 def get_exercise(
     exercise_id: str,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(get_current_user),
+    if_none_match: Optional[str] = Header(None)
 ):
     """Get exercise details"""
-    return ExerciseService.get_exercise(db, exercise_id)
+    return cached_json_response(
+        exercise_response_cache,
+        exercise_id,
+        ExerciseService.get_exercise_version(db, exercise_id),
+        if_none_match,
+        lambda: Exercise.model_validate(
+            ExerciseService.get_exercise(db, exercise_id)
+        ).model_dump_json().encode(),
+    )
+
+@router.get("/exercises/{exercise_id}/alternatives", response_model=List[ExerciseAlternative], dependencies=[Depends(rate_limiter)])
+def get_exercise_alternatives(
+    exercise_id: str,
+    equipment_ids: Optional[List[UUID]] = Query(None, description="Equipment the user has; omit to skip the filter"),
+    limit: int = Query(10, ge=1, le=50),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Similar exercises that can substitute for this one"""
+    return ExerciseSimilarityService.get_alternatives(
+        db, exercise_id, equipment_ids=equipment_ids, limit=limit
+    )
 
 @router.put("/exercises/{exercise_id}", response_model=Exercise, dependencies=[Depends(rate_limiter)])
 def update_exercise(
@@ -63,6 +99,18 @@ def list_exercises(
     include_custom: bool = True
 ):
     """List exercises with optional filters"""
+    if settings.FAST_LIST_SERIALIZATION:
+        return FastJSONResponse(ExerciseService.list_exercise_dicts(
+            db,
+            skip=skip,
+            limit=limit,
+            category_id=category_id,
+            difficulty=difficulty,
+            equipment_id=equipment_id,
+            muscle_group_id=muscle_group_id,
+            include_custom=include_custom
+        ))
+
     return ExerciseService.list_exercises(
         db,
         skip=skip,
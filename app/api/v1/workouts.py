@@ -1,16 +1,27 @@
+from datetime import date
 from typing import List, Optional
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, Header, HTTPException, Query
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
+from app.core.cache import cached_json_response, workout_response_cache
+from app.config.settings import settings
 from app.core.rate_limiter import rate_limiter
+from app.core.responses import FastJSONResponse
 from app.api.dependencies import get_db, get_current_user
 from app.models.user import User
 from app.schemas.workout import (
-    Workout, WorkoutCreate,
+    Workout, WorkoutCreate, CloneRequest,
     WorkoutPlan, WorkoutPlanCreate,
-    WorkoutSession, WorkoutSessionCreate,
-    ExerciseSet, ExerciseSetCreate,
-    WorkoutSessionUpdate
+    WorkoutSession, WorkoutSessionCreate, WorkoutSessionHistory, WorkoutStatus,
+    ExerciseSetCreate, RecordedExerciseSet, PersonalRecord,
+    WorkoutSessionUpdate,
+    PlanEnrollment, PlanEnrollmentCreate,
+    ScheduledWorkout, PlanAdherence
 )
+from app.services.history_archive import HistoryArchiveService
+from app.services.personal_records import PersonalRecordService
+from app.services.plan_limits import PlanLimitService
+from app.services.schedule import ScheduleService
 from app.services.workout import WorkoutService
 
 router = APIRouter()
@@ -29,10 +40,34 @@ def create_workout(
 def get_workout(
     workout_id: str,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(get_current_user),
+    if_none_match: Optional[str] = Header(None)
 ):
     """Get workout details"""
-    return WorkoutService.get_workout(db, workout_id, current_user)
+    version = WorkoutService.get_public_workout_version(db, workout_id, current_user)
+    if version is None:
+        # Private workouts are per-user; don't share them through the cache
+        return WorkoutService.get_workout(db, workout_id, current_user)
+
+    return cached_json_response(
+        workout_response_cache,
+        workout_id,
+        version,
+        if_none_match,
+        lambda: Workout.model_validate(
+            WorkoutService.get_workout(db, workout_id, current_user)
+        ).model_dump_json().encode(),
+    )
+
+@router.post("/workouts/{workout_id}/clone", response_model=Workout, dependencies=[Depends(rate_limiter)])
+def clone_workout(
+    workout_id: str,
+    clone: CloneRequest = CloneRequest(),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Copy a workout template into the current user's library"""
+    return WorkoutService.clone_workout(db, workout_id, current_user, name=clone.name)
 
 @router.get("/workouts/", response_model=List[Workout], dependencies=[Depends(rate_limiter)])
 def list_workouts(
@@ -44,6 +79,16 @@ def list_workouts(
     difficulty: Optional[str] = None
 ):
     """List workouts"""
+    if settings.FAST_LIST_SERIALIZATION:
+        return FastJSONResponse(WorkoutService.list_workout_dicts(
+            db,
+            current_user,
+            skip=skip,
+            limit=limit,
+            include_public=include_public,
+            difficulty=difficulty
+        ))
+
     return WorkoutService.list_workouts(
         db,
         current_user,
@@ -63,15 +108,120 @@ def create_workout_plan(
     """Create a new workout plan"""
     return WorkoutService.create_workout_plan(db, plan, current_user)
 
+@router.post("/workout-plans/{plan_id}/clone", response_model=WorkoutPlan, dependencies=[Depends(rate_limiter)])
+def clone_workout_plan(
+    plan_id: str,
+    clone: CloneRequest = CloneRequest(),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Instantiate a workout plan, with copies of all its workouts, for the current user"""
+    return WorkoutService.clone_workout_plan(db, plan_id, current_user, name=clone.name)
+
+# Plan enrollment and calendar routes
+@router.post("/workout-plans/{plan_id}/enrollments", response_model=PlanEnrollment, dependencies=[Depends(rate_limiter)])
+def enroll_in_workout_plan(
+    plan_id: str,
+    enrollment: PlanEnrollmentCreate,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Start following a workout plan and schedule its workouts"""
+    return ScheduleService.enroll(db, plan_id, enrollment, current_user)
+
+@router.post("/plan-enrollments/{enrollment_id}/cancel", response_model=PlanEnrollment, dependencies=[Depends(rate_limiter)])
+def cancel_plan_enrollment(
+    enrollment_id: str,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Stop following a workout plan"""
+    return ScheduleService.cancel_enrollment(db, enrollment_id, current_user)
+
+@router.get("/plan-enrollments/{enrollment_id}/adherence", response_model=PlanAdherence, dependencies=[Depends(rate_limiter)])
+def get_plan_adherence(
+    enrollment_id: str,
+    as_of: Optional[date] = None,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Completed, missed and upcoming workouts of an enrollment"""
+    return ScheduleService.get_adherence(db, enrollment_id, current_user, as_of or date.today())
+
+@router.get("/schedule/today", response_model=List[ScheduledWorkout], dependencies=[Depends(rate_limiter)])
+def get_todays_workouts(
+    on: Optional[date] = Query(None, description="The client's local date; defaults to the server's"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Workouts scheduled for today"""
+    day = on or date.today()
+    return ScheduleService.get_schedule(db, current_user, day, day)
+
+@router.get("/schedule", response_model=List[ScheduledWorkout], dependencies=[Depends(rate_limiter)])
+def get_schedule(
+    start: date,
+    end: date,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Scheduled workouts in a date range"""
+    return ScheduleService.get_schedule(db, current_user, start, end)
+
 # Workout Session routes
 @router.post("/workout-sessions/", response_model=WorkoutSession, dependencies=[Depends(rate_limiter)])
 def start_workout_session(
     session: WorkoutSessionCreate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(get_current_user),
+    resume: bool = Query(False, description="Return the active session instead of failing if one exists")
 ):
     """Start a new workout session"""
-    return WorkoutService.start_workout_session(db, session, current_user)
+    return WorkoutService.start_workout_session(db, session, current_user, resume=resume)
+
+@router.get("/workout-sessions", response_model=WorkoutSessionHistory, dependencies=[Depends(rate_limiter)])
+def list_workout_sessions(
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    start: Optional[date] = Query(None, description="Sessions started on or after this day (UTC)"),
+    end: Optional[date] = Query(None, description="Sessions started on or before this day (UTC)"),
+    status: Optional[WorkoutStatus] = None
+):
+    """Past workout sessions, newest first"""
+    return WorkoutService.list_session_history(
+        db,
+        current_user,
+        limit=limit,
+        cursor=cursor,
+        start=start,
+        end=end,
+        status=status.value if status else None
+    )
+
+@router.get("/workout-sessions/export", dependencies=[Depends(rate_limiter)])
+def export_workout_sessions(
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """All of the user's sessions with their sets, as NDJSON"""
+    if not PlanLimitService.can_export_data(db, current_user):
+        raise HTTPException(status_code=403, detail="Data export is not available on your plan")
+    return StreamingResponse(
+        HistoryArchiveService.export_sessions(db, current_user),
+        media_type="application/x-ndjson",
+        headers={"Content-Disposition": 'attachment; filename="workout-sessions.ndjson"'},
+    )
+
+@router.get("/workout-sessions/{session_id}", response_model=WorkoutSession, dependencies=[Depends(rate_limiter)])
+def get_workout_session(
+    session_id: str,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Get a workout session with its sets"""
+    return WorkoutService.get_workout_session(db, session_id, current_user)
 
 @router.post("/workout-sessions/{session_id}/complete", response_model=WorkoutSession, dependencies=[Depends(rate_limiter)])
 def complete_workout_session(
@@ -83,7 +233,7 @@ def complete_workout_session(
     """Complete a workout session"""
     return WorkoutService.complete_workout_session(db, session_id, update_data, current_user)
 
-@router.post("/workout-sessions/{session_id}/sets", response_model=ExerciseSet, dependencies=[Depends(rate_limiter)])
+@router.post("/workout-sessions/{session_id}/sets", response_model=RecordedExerciseSet, dependencies=[Depends(rate_limiter)])
 def record_exercise_set(
     session_id: str,
     set_data: ExerciseSetCreate,
@@ -92,3 +242,13 @@ def record_exercise_set(
 ):
     """Record an exercise set in a workout session"""
     return WorkoutService.record_exercise_set(db, session_id, set_data, current_user)
+
+# Personal records
+@router.get("/personal-records", response_model=List[PersonalRecord], dependencies=[Depends(rate_limiter)])
+def list_personal_records(
+    exercise_id: Optional[str] = None,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Current personal records, optionally for one exercise"""
+    return PersonalRecordService.list_records(db, current_user, exercise_id=exercise_id)
@@ -1,4 +1,4 @@
-from typing import List, Union
+from typing import Dict, List, Union
 from pydantic import AnyHttpUrl, field_validator, EmailStr, Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
 import secrets
@@ -13,6 +13,19 @@ class Settings(BaseSettings):
 
     # Database
     DATABASE_URL: str = Field(..., env="DATABASE_URL")
+    # Optional read replica for read-only service calls (see replica_reads)
+    DATABASE_REPLICA_URL: str | None = Field(None, env="DATABASE_REPLICA_URL")
+    # After a user's write, their reads stay on the primary this long
+    READ_YOUR_WRITES_SECONDS: int = Field(5, env="READ_YOUR_WRITES_SECONDS")
+    # Monthly exercise_sets partitions are created this many months ahead
+    # (scripts/maintain_partitions.py)
+    PARTITION_MONTHS_AHEAD: int = Field(3, env="PARTITION_MONTHS_AHEAD")
+    # Also create them when the API starts (DDL against the primary on every boot)
+    PARTITION_ENSURE_ON_STARTUP: bool = Field(False, env="PARTITION_ENSURE_ON_STARTUP")
+    # Partitions older than this many months are detached into the archive
+    # schema; unset keeps every partition attached
+    PARTITION_RETENTION_MONTHS: int | None = Field(None, env="PARTITION_RETENTION_MONTHS")
+    PARTITION_ARCHIVE_SCHEMA: str = Field("archive", env="PARTITION_ARCHIVE_SCHEMA")
 
     # Security
     SECRET_KEY: str = Field(
@@ -21,6 +34,40 @@ class Settings(BaseSettings):
     ALGORITHM: str = Field("HS256", env="ALGORITHM")
     ACCESS_TOKEN_EXPIRE_MINUTES: int = Field(30, env="ACCESS_TOKEN_EXPIRE_MINUTES")
     REFRESH_TOKEN_EXPIRE_DAYS: int = Field(7, env="REFRESH_TOKEN_EXPIRE_DAYS")
+    # With ALGORITHM=EdDSA or ES256 tokens are signed with JWT_PRIVATE_KEY (PEM)
+    # under JWT_ACTIVE_KID; JWT_PUBLIC_KEYS maps retired kids to PEM public
+    # keys that still verify. HS* algorithms sign with SECRET_KEY.
+    JWT_ACTIVE_KID: str = Field("default", env="JWT_ACTIVE_KID")
+    JWT_PRIVATE_KEY: str | None = Field(None, env="JWT_PRIVATE_KEY")
+    JWT_PUBLIC_KEYS: Dict[str, str] = Field(default_factory=dict, env="JWT_PUBLIC_KEYS")
+
+    # Password hashing: "bcrypt" or "argon2" (argon2id). Hashes in the other
+    # scheme or at a lower cost are upgraded on login. Tune the costs with
+    # scripts/calibrate_password_hash.py; ARGON2_MEMORY_COST is in KiB.
+    PASSWORD_HASH_SCHEME: str = Field("bcrypt", env="PASSWORD_HASH_SCHEME")
+    BCRYPT_ROUNDS: int = Field(12, env="BCRYPT_ROUNDS")
+    ARGON2_TIME_COST: int = Field(2, env="ARGON2_TIME_COST")
+    ARGON2_MEMORY_COST: int = Field(19456, env="ARGON2_MEMORY_COST")
+    ARGON2_PARALLELISM: int = Field(1, env="ARGON2_PARALLELISM")
+    # Logins whose hash upgrade can wait in the background at once
+    PASSWORD_REHASH_MAX_PENDING: int = Field(100, env="PASSWORD_REHASH_MAX_PENDING")
+
+    # Failed-login throttling: past the threshold within the window, the
+    # account or IP is locked for base * 2^(failures - threshold) seconds
+    LOGIN_FAILURE_WINDOW_SECONDS: int = Field(900, env="LOGIN_FAILURE_WINDOW_SECONDS")
+    LOGIN_MAX_FAILURES_PER_ACCOUNT: int = Field(5, env="LOGIN_MAX_FAILURES_PER_ACCOUNT")
+    LOGIN_MAX_FAILURES_PER_IP: int = Field(50, env="LOGIN_MAX_FAILURES_PER_IP")
+    LOGIN_LOCKOUT_BASE_SECONDS: int = Field(30, env="LOGIN_LOCKOUT_BASE_SECONDS")
+    LOGIN_LOCKOUT_MAX_SECONDS: int = Field(3600, env="LOGIN_LOCKOUT_MAX_SECONDS")
+    # Reverse proxies in front of the API that append to X-Forwarded-For.
+    # The client IP is the entry this many hops from the right; with 0 the
+    # header is ignored, since clients can send any value in it
+    TRUSTED_PROXY_HOPS: int = Field(0, env="TRUSTED_PROXY_HOPS")
+
+    # Token revocation (Redis-backed, mirrored into a per-process Bloom filter)
+    TOKEN_REVOCATION_SYNC_INTERVAL: float = Field(5.0, env="TOKEN_REVOCATION_SYNC_INTERVAL")
+    TOKEN_REVOCATION_BLOOM_CAPACITY: int = Field(100000, env="TOKEN_REVOCATION_BLOOM_CAPACITY")
+    TOKEN_REVOCATION_BLOOM_ERROR_RATE: float = Field(0.001, env="TOKEN_REVOCATION_BLOOM_ERROR_RATE")
 
     # CORS
     BACKEND_CORS_ORIGINS: List[AnyHttpUrl] = Field(
@@ -30,6 +77,12 @@ class Settings(BaseSettings):
     # Google OAuth2
     GOOGLE_CLIENT_ID: str = Field(..., env="GOOGLE_CLIENT_ID")
     GOOGLE_CLIENT_SECRET: str = Field(..., env="GOOGLE_CLIENT_SECRET")
+    GOOGLE_JWKS_URL: str = Field(
+        "https://www.googleapis.com/oauth2/v3/certs", env="GOOGLE_JWKS_URL"
+    )
+    GOOGLE_TOKEN_URL: str = Field(
+        "https://oauth2.googleapis.com/token", env="GOOGLE_TOKEN_URL"
+    )
 
     # Email settings
     MAIL_USERNAME: str = Field(..., env="MAIL_USERNAME")
@@ -41,9 +94,50 @@ class Settings(BaseSettings):
     MAIL_SSL_TLS: bool = Field(False, env="MAIL_SSL_TLS")
     MAIL_USE_CREDENTIALS: bool = Field(True, env="MAIL_USE_CREDENTIALS")
 
+    # Outbound email queue
+    EMAIL_QUEUE_MAX_SIZE: int = Field(10000, env="EMAIL_QUEUE_MAX_SIZE")
+    EMAIL_QUEUE_BATCH_SIZE: int = Field(50, env="EMAIL_QUEUE_BATCH_SIZE")
+    EMAIL_QUEUE_FLUSH_INTERVAL: float = Field(0.5, env="EMAIL_QUEUE_FLUSH_INTERVAL")
+    EMAIL_QUEUE_MAX_RETRIES: int = Field(5, env="EMAIL_QUEUE_MAX_RETRIES")
+    EMAIL_QUEUE_RETRY_BACKOFF: float = Field(2.0, env="EMAIL_QUEUE_RETRY_BACKOFF")
+    EMAIL_QUEUE_IDLE_TIMEOUT: float = Field(60.0, env="EMAIL_QUEUE_IDLE_TIMEOUT")
+
+    # Telemetry
+    METRICS_ENABLED: bool = Field(True, env="METRICS_ENABLED")
+    # Bearer token Prometheus sends to scrape /metrics; when unset, only
+    # loopback clients may scrape
+    METRICS_TOKEN: str | None = Field(None, env="METRICS_TOKEN")
+    SLOW_REQUEST_THRESHOLD_MS: int | None = Field(None, env="SLOW_REQUEST_THRESHOLD_MS")
+
+    # Response compression
+    COMPRESSION_ENABLED: bool = Field(True, env="COMPRESSION_ENABLED")
+    COMPRESSION_MINIMUM_SIZE: int = Field(1024, env="COMPRESSION_MINIMUM_SIZE")
+    COMPRESSION_GZIP_LEVEL: int = Field(6, env="COMPRESSION_GZIP_LEVEL")
+    COMPRESSION_BROTLI_QUALITY: int = Field(4, env="COMPRESSION_BROTLI_QUALITY")
+    COMPRESSION_CONTENT_TYPES: List[str] = Field(
+        default_factory=lambda: [
+            "application/json",
+            "application/x-ndjson",
+            "text/",
+        ],
+        env="COMPRESSION_CONTENT_TYPES",
+    )
+
     # Redis
     REDIS_URL: str = Field("redis://localhost:6379", env="REDIS_URL")
 
+    # Response cache
+    RESPONSE_CACHE_ENABLED: bool = Field(True, env="RESPONSE_CACHE_ENABLED")
+    RESPONSE_CACHE_LOCAL_SIZE: int = Field(2048, env="RESPONSE_CACHE_LOCAL_SIZE")
+    RESPONSE_CACHE_LOCAL_TTL: int = Field(30, env="RESPONSE_CACHE_LOCAL_TTL")
+    RESPONSE_CACHE_REDIS_TTL: int = Field(600, env="RESPONSE_CACHE_REDIS_TTL")
+
+    # How many days either side of a scheduled date a completed session counts
+    SCHEDULE_MATCH_WINDOW_DAYS: int = Field(1, env="SCHEDULE_MATCH_WINDOW_DAYS")
+
+    # Serve list endpoints from row tuples encoded with orjson
+    FAST_LIST_SERIALIZATION: bool = Field(False, env="FAST_LIST_SERIALIZATION")
+
     # Stripe
     STRIPE_SECRET_KEY: str = Field(..., env="STRIPE_SECRET_KEY")
     STRIPE_PUBLISHABLE_KEY: str = Field(..., env="STRIPE_PUBLISHABLE_KEY")
@@ -55,6 +149,22 @@ class Settings(BaseSettings):
     AWS_SECRET_ACCESS_KEY: str | None = Field(None, env="AWS_SECRET_ACCESS_KEY")
     # S3_BUCKET: str = Field(..., env="S3_BUCKET")
     S3_EXERCISE_CATALOG_BUCKET: str = Field(..., env="S3_EXERCISE_CATALOG_BUCKET")
+    # CDN or custom domain in front of the bucket; defaults to the S3 URL
+    S3_PUBLIC_BASE_URL: str | None = Field(None, env="S3_PUBLIC_BASE_URL")
+
+    # Cold history archive: completed sessions older than
+    # HISTORY_ARCHIVE_AFTER_DAYS have their sets moved to per-user, per-month
+    # Parquet files in this (private) bucket; unset disables archiving
+    HISTORY_ARCHIVE_BUCKET: str | None = Field(None, env="HISTORY_ARCHIVE_BUCKET")
+    HISTORY_ARCHIVE_PREFIX: str = Field("history", env="HISTORY_ARCHIVE_PREFIX")
+    HISTORY_ARCHIVE_AFTER_DAYS: int = Field(365, env="HISTORY_ARCHIVE_AFTER_DAYS")
+    # Archive files are cached (local LRU of this many files, then Redis)
+    HISTORY_ARCHIVE_CACHE_LOCAL_SIZE: int = Field(64, env="HISTORY_ARCHIVE_CACHE_LOCAL_SIZE")
+    HISTORY_ARCHIVE_CACHE_TTL: int = Field(3600, env="HISTORY_ARCHIVE_CACHE_TTL")
+
+    # Catalog snapshots
+    CATALOG_SNAPSHOT_PREFIX: str = Field("catalog", env="CATALOG_SNAPSHOT_PREFIX")
+    CATALOG_SNAPSHOT_DELTAS: int = Field(5, env="CATALOG_SNAPSHOT_DELTAS")
 
     # Frontend URL for email links
     FRONTEND_URL: str = Field("http://localhost:3000", env="FRONTEND_URL")
@@ -77,3 +187,6 @@ class Settings(BaseSettings):
 @lru_cache
 def get_settings() -> Settings:
     return Settings()
+
+
+settings = get_settings()
@@ -0,0 +1,162 @@
+import hashlib
+import logging
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+from fastapi import Response, status
+from redis.exceptions import RedisError
+
+from app.config.settings import settings
+from app.core.metrics import record_cache_lookup
+from app.core.redis_client import get_redis
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class CachedResponse:
+    version: str
+    etag: str
+    body: bytes
+
+
+def make_etag(body: bytes) -> str:
+    """Strong ETag derived from the exact response bytes"""
+    return f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """If-None-Match uses weak comparison, so W/ prefixes are ignored"""
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*":
+            return True
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+    return False
+
+
+class ResponseCache:
+    """
+    Two-tier cache of serialized response bodies: a small per-process LRU in
+    front of Redis.
+
+    Entries are stored with the version of the resource they were built from
+    (normally its updated_at), and a lookup only hits when the caller's
+    current version matches. Edits therefore miss automatically; invalidate()
+    drops entries eagerly when a change doesn't move the version.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        local_size: Optional[int] = None,
+        local_ttl: Optional[int] = None,
+        redis_ttl: Optional[int] = None,
+    ):
+        self.name = name
+        self.local_size = local_size or settings.RESPONSE_CACHE_LOCAL_SIZE
+        self.local_ttl = local_ttl or settings.RESPONSE_CACHE_LOCAL_TTL
+        self.redis_ttl = redis_ttl or settings.RESPONSE_CACHE_REDIS_TTL
+        self._local: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _redis_key(self, key: str) -> str:
+        return f"cache:{self.name}:{key}"
+
+    def get(self, key: str, version: str) -> Optional[CachedResponse]:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._local.get(key)
+            if entry is not None:
+                cached, expires_at = entry
+                if cached.version == version and expires_at > now:
+                    self._local.move_to_end(key)
+                    record_cache_lookup(f"{self.name}.local", True)
+                    return cached
+                del self._local[key]
+        record_cache_lookup(f"{self.name}.local", False)
+
+        try:
+            raw = get_redis().get(self._redis_key(key))
+        except RedisError as e:
+            logger.warning(f"Response cache read failed: {str(e)}")
+            return None
+
+        if raw is not None:
+            cached_version, etag, body = raw.split(b"\0", 2)
+            if cached_version.decode() == version:
+                cached = CachedResponse(version=version, etag=etag.decode(), body=body)
+                self._store_local(key, cached)
+                record_cache_lookup(f"{self.name}.redis", True)
+                return cached
+        record_cache_lookup(f"{self.name}.redis", False)
+        return None
+
+    def set(self, key: str, version: str, body: bytes) -> CachedResponse:
+        cached = CachedResponse(version=version, etag=make_etag(body), body=body)
+        self._store_local(key, cached)
+        try:
+            get_redis().set(
+                self._redis_key(key),
+                b"\0".join([version.encode(), cached.etag.encode(), body]),
+                ex=self.redis_ttl,
+            )
+        except RedisError as e:
+            logger.warning(f"Response cache write failed: {str(e)}")
+        return cached
+
+    def invalidate(self, *keys: str) -> None:
+        if not keys:
+            return
+        with self._lock:
+            for key in keys:
+                self._local.pop(key, None)
+        try:
+            get_redis().delete(*(self._redis_key(key) for key in keys))
+        except RedisError as e:
+            logger.warning(f"Response cache invalidation failed: {str(e)}")
+
+    def _store_local(self, key: str, cached: CachedResponse) -> None:
+        with self._lock:
+            self._local[key] = (cached, time.monotonic() + self.local_ttl)
+            self._local.move_to_end(key)
+            while len(self._local) > self.local_size:
+                self._local.popitem(last=False)
+
+
+def cached_json_response(
+    cache: ResponseCache,
+    key: str,
+    version: str,
+    if_none_match: Optional[str],
+    build: Callable[[], bytes],
+) -> Response:
+    """
+    Serve a JSON body from the cache, building it on a miss, and answer
+    If-None-Match with 304 when the client already has this version.
+    """
+    cached = cache.get(key, version) if settings.RESPONSE_CACHE_ENABLED else None
+    if cached is None:
+        body = build()
+        cached = (
+            cache.set(key, version, body)
+            if settings.RESPONSE_CACHE_ENABLED
+            else CachedResponse(version=version, etag=make_etag(body), body=body)
+        )
+
+    headers = {"ETag": cached.etag, "Cache-Control": "private, no-cache"}
+    if etag_matches(if_none_match, cached.etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=cached.body, media_type="application/json", headers=headers)
+
+
+workout_response_cache = ResponseCache("workout")
+exercise_response_cache = ResponseCache("exercise")
@@ -0,0 +1,135 @@
+import asyncio
+import logging
+import re
+import time
+from typing import Dict, Optional
+
+import httpx
+import jwt
+
+logger = logging.getLogger(__name__)
+
+_MAX_AGE = re.compile(r"max-age=(\d+)")
+
+
+class JWKSError(Exception):
+    """The provider's key set could not be used"""
+
+
+def cache_max_age(cache_control: Optional[str], default: int) -> int:
+    """max-age of a Cache-Control header, or default when absent"""
+    match = _MAX_AGE.search(cache_control or "")
+    return int(match.group(1)) if match else default
+
+
+class JWKSCache:
+    """
+    A provider's signing keys (JWKS), fetched once and kept parsed in memory.
+
+    Nothing is fetched until a token needs verifying. The first successful
+    fetch starts a background task that refetches the document before its
+    Cache-Control max-age runs out, so later verifications never wait on
+    the network. A
+    kid we haven't seen triggers one immediate refetch, at most every
+    min_refresh_interval seconds, in case the provider rotated early. If a
+    refetch fails the previous keys stay in use.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        default_max_age: int = 3600,
+        min_refresh_interval: float = 60.0,
+        timeout: float = 5.0,
+    ):
+        self.url = url
+        self.default_max_age = default_max_age
+        self.min_refresh_interval = min_refresh_interval
+        self.timeout = timeout
+
+        self._keys: Dict[str, jwt.PyJWK] = {}
+        self._expires_at = 0.0
+        self._attempted_at = float("-inf")
+        self._lock: Optional[asyncio.Lock] = None
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def is_running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    async def start(self) -> None:
+        """Start the background refresher"""
+        if self.is_running:
+            return
+        self._task = asyncio.create_task(self._run(), name="jwks-refresher")
+
+    async def stop(self) -> None:
+        if not self.is_running:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def get_key(self, kid: Optional[str]) -> jwt.PyJWK:
+        """
+        Parsed key for a kid; raises LookupError if the provider has none,
+        httpx.HTTPError or JWKSError if its key set can't be fetched
+        """
+        key = self._keys.get(kid)
+        if key is not None:
+            return key
+        if time.monotonic() - self._attempted_at >= self.min_refresh_interval:
+            await self.refresh()
+            # Keep the keys fresh in the background from now on
+            await self.start()
+        key = self._keys.get(kid)
+        if key is None:
+            raise LookupError(f"Unknown signing key {kid}")
+        return key
+
+    async def refresh(self) -> None:
+        """Fetch the key set now; concurrent callers share one request"""
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        attempted_at = self._attempted_at
+        async with self._lock:
+            if self._attempted_at != attempted_at:
+                return
+            self._attempted_at = time.monotonic()
+            async with httpx.AsyncClient(timeout=self.timeout) as client:
+                response = await client.get(self.url)
+            response.raise_for_status()
+
+            try:
+                jwks = response.json()["keys"]
+                if not isinstance(jwks, list):
+                    raise TypeError("keys is not a list")
+            except (ValueError, KeyError, TypeError) as e:
+                raise JWKSError(f"Malformed JWKS from {self.url}: {str(e)}")
+
+            keys = {}
+            for jwk in jwks:
+                try:
+                    keys[jwk["kid"]] = jwt.PyJWK(jwk)
+                except (KeyError, TypeError, jwt.PyJWKError) as e:
+                    logger.warning(f"Skipping unusable key from {self.url}: {str(e)}")
+
+            self._keys = keys
+            self._expires_at = time.monotonic() + cache_max_age(
+                response.headers.get("cache-control"), self.default_max_age
+            )
+
+    async def _run(self) -> None:
+        while True:
+            # Refetch a little before the provider's max-age lapses
+            delay = (self._expires_at - time.monotonic()) * 0.9
+            if delay <= 0:
+                try:
+                    await self.refresh()
+                    continue
+                except (httpx.HTTPError, JWKSError) as e:
+                    logger.warning(f"JWKS refresh from {self.url} failed: {str(e)}")
+            await asyncio.sleep(max(delay, self.min_refresh_interval))
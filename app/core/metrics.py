@@ -0,0 +1,122 @@
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+from prometheus_client import Counter, Histogram
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import QueuePool
+
+# Latency buckets tuned for an API whose typical responses take 5-500 ms
+LATENCY_BUCKETS = (
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.075,
+    0.1, 0.25, 0.5, 0.75, 1.0, 2.5, 5.0, 10.0,
+)
+
+# Maximum number of statements kept per request for the slow-request log
+MAX_CAPTURED_STATEMENTS = 50
+
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by route",
+    ["method", "route", "status"],
+    buckets=LATENCY_BUCKETS,
+)
+REQUEST_DB_QUERIES = Histogram(
+    "http_request_db_queries",
+    "Number of SQL statements issued per request",
+    ["method", "route"],
+    buckets=(0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 89),
+)
+REQUEST_DB_DURATION = Histogram(
+    "http_request_db_duration_seconds",
+    "Total time spent in SQL per request",
+    ["method", "route"],
+    buckets=LATENCY_BUCKETS,
+)
+DB_QUERY_DURATION = Histogram(
+    "db_query_duration_seconds",
+    "Duration of individual SQL statements",
+    buckets=LATENCY_BUCKETS,
+)
+DB_POOL_CHECKOUT_WAIT = Histogram(
+    "db_pool_checkout_wait_seconds",
+    "Time spent waiting for a pooled database connection",
+    buckets=LATENCY_BUCKETS,
+)
+REDIS_LATENCY = Histogram(
+    "redis_command_duration_seconds",
+    "Latency of Redis round trips",
+    ["component", "operation"],
+    buckets=LATENCY_BUCKETS,
+)
+CACHE_REQUESTS = Counter(
+    "cache_requests_total",
+    "Cache lookups by cache and result (hit/miss)",
+    ["cache", "result"],
+)
+LOGIN_LOCKOUTS = Counter(
+    "auth_login_lockouts_total",
+    "Lockouts started after repeated failed logins, by scope (account/ip)",
+    ["scope"],
+)
+LOGIN_THROTTLED = Counter(
+    "auth_login_throttled_total",
+    "Login attempts rejected by an active lockout before password verification",
+    ["scope"],
+)
+
+
+@dataclass
+class RequestStats:
+    """SQL activity recorded for the request currently being handled"""
+
+    query_count: int = 0
+    query_duration: float = 0.0
+    capture_statements: bool = False
+    statements: List[str] = field(default_factory=list)
+
+
+# Set by MetricsMiddleware for the duration of a request. Sync route handlers
+# run in a worker thread with a copy of this context, and since RequestStats is
+# mutable their updates are visible to the middleware.
+current_request_stats: ContextVar[Optional[RequestStats]] = ContextVar(
+    "current_request_stats", default=None
+)
+
+
+def record_cache_lookup(cache: str, hit: bool) -> None:
+    CACHE_REQUESTS.labels(cache=cache, result="hit" if hit else "miss").inc()
+
+
+class TimedQueuePool(QueuePool):
+    """QueuePool that records how long callers wait to check out a connection"""
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            DB_POOL_CHECKOUT_WAIT.observe(time.perf_counter() - started)
+
+
+def instrument_engine(engine: Engine) -> None:
+    """Attach statement timing listeners to an engine"""
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info["query_start_time"].pop()
+        DB_QUERY_DURATION.observe(elapsed)
+
+        stats = current_request_stats.get()
+        if stats is None:
+            return
+        stats.query_count += 1
+        stats.query_duration += elapsed
+        if stats.capture_statements and len(stats.statements) < MAX_CAPTURED_STATEMENTS:
+            stats.statements.append(f"[{elapsed * 1000:.1f} ms] {statement}")
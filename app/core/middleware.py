@@ -0,0 +1,270 @@
+import logging
+import time
+import zlib
+from typing import List, Optional, Sequence
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.metrics import (
+    REQUEST_DB_DURATION,
+    REQUEST_DB_QUERIES,
+    REQUEST_LATENCY,
+    RequestStats,
+    current_request_stats,
+)
+
+try:
+    import brotli
+except ImportError:  # brotli is optional; fall back to gzip only
+    brotli = None
+
+logger = logging.getLogger("app.slow_requests")
+
+
+class MetricsMiddleware:
+    """
+    Records per-route latency and SQL activity for every HTTP request.
+
+    When slow_request_threshold_ms is set, the SQL statements issued by a
+    request are captured and logged if the request exceeds the threshold.
+    """
+
+    def __init__(self, app: ASGIApp, slow_request_threshold_ms: Optional[int] = None):
+        self.app = app
+        self.slow_request_threshold = (
+            slow_request_threshold_ms / 1000 if slow_request_threshold_ms else None
+        )
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats(capture_statements=self.slow_request_threshold is not None)
+        token = current_request_stats.set(stats)
+        status_code = 500
+        started = time.perf_counter()
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - started
+            current_request_stats.reset(token)
+            self._observe(scope, status_code, elapsed, stats)
+
+    def _observe(self, scope: Scope, status_code: int, elapsed: float, stats: RequestStats) -> None:
+        method = scope["method"]
+        route = self._route_template(scope)
+
+        REQUEST_LATENCY.labels(method=method, route=route, status=str(status_code)).observe(elapsed)
+        REQUEST_DB_QUERIES.labels(method=method, route=route).observe(stats.query_count)
+        REQUEST_DB_DURATION.labels(method=method, route=route).observe(stats.query_duration)
+
+        if self.slow_request_threshold is not None and elapsed >= self.slow_request_threshold:
+            statements = "\n  ".join(stats.statements) or "(none)"
+            logger.warning(
+                f"Slow request: {method} {scope['path']} ({route}) -> {status_code} "
+                f"in {elapsed * 1000:.1f} ms, {stats.query_count} queries "
+                f"({stats.query_duration * 1000:.1f} ms in SQL)\n  {statements}"
+            )
+
+    def _route_template(self, scope: Scope) -> str:
+        """Label requests by route template rather than raw path to bound cardinality"""
+        # The router records the matched route in the scope
+        route = scope.get("route")
+        if route is None:
+            return "unmatched"
+        return getattr(route, "path", scope["path"])
+
+
+class _GzipEncoder:
+    name = "gzip"
+
+    def __init__(self, level: int):
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, zlib.MAX_WBITS | 16)
+
+    def compress(self, data: bytes, flush: bool = True) -> bytes:
+        # Sync-flush so every chunk reaches the client as soon as it's produced
+        chunk = self._compressor.compress(data)
+        return chunk + self._compressor.flush(zlib.Z_SYNC_FLUSH) if flush else chunk
+
+    def finish(self) -> bytes:
+        return self._compressor.flush(zlib.Z_FINISH)
+
+
+class _BrotliEncoder:
+    name = "br"
+
+    def __init__(self, quality: int):
+        self._compressor = brotli.Compressor(quality=quality)
+
+    def compress(self, data: bytes, flush: bool = True) -> bytes:
+        chunk = self._compressor.process(data)
+        return chunk + self._compressor.flush() if flush else chunk
+
+    def finish(self) -> bytes:
+        return self._compressor.finish()
+
+
+class CompressionMiddleware:
+    """
+    Gzip/Brotli response compression.
+
+    Only responses whose content type is in content_types (exact types, or
+    prefixes ending in "/") and whose body reaches minimum_size are
+    compressed. Streaming bodies are buffered until they reach minimum_size
+    and then compressed chunk by chunk, flushing after each one, so
+    StreamingResponse exports keep flowing instead of waiting for the end.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = 1024,
+        gzip_level: int = 6,
+        brotli_quality: int = 4,
+        content_types: Sequence[str] = ("application/json", "text/"),
+    ):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+        self.content_types = tuple(content_types)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = self._negotiate(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        await _CompressedResponder(self, encoding)(scope, receive, send)
+
+    def _negotiate(self, accept_encoding: str) -> Optional[str]:
+        """Pick br or gzip from Accept-Encoding, honouring q=0"""
+        accepted = {}
+        for part in accept_encoding.lower().split(","):
+            coding, _, params = part.strip().partition(";")
+            if not coding:
+                continue
+            quality = 1.0
+            params = params.strip()
+            if params.startswith("q="):
+                try:
+                    quality = float(params[2:])
+                except ValueError:
+                    quality = 0.0
+            accepted[coding] = quality
+
+        wildcard = accepted.get("*", 0.0)
+        candidates = ["br", "gzip"] if brotli is not None else ["gzip"]
+        for coding in candidates:
+            if accepted.get(coding, wildcard) > 0:
+                return coding
+        return None
+
+    def compressible(self, content_type: str) -> bool:
+        media_type = content_type.split(";", 1)[0].strip().lower()
+        return any(
+            media_type.startswith(allowed) if allowed.endswith("/") else media_type == allowed
+            for allowed in self.content_types
+        )
+
+    def encoder(self, encoding: str):
+        if encoding == "br":
+            return _BrotliEncoder(self.brotli_quality)
+        return _GzipEncoder(self.gzip_level)
+
+
+class _CompressedResponder:
+    """Per-request state for CompressionMiddleware"""
+
+    def __init__(self, middleware: CompressionMiddleware, encoding: str):
+        self.middleware = middleware
+        self.encoding = encoding
+        self.send = None
+        self.start_message: Optional[Message] = None
+        self.passthrough = False
+        self.encoder = None
+        self.buffered: List[bytes] = []
+        self.buffered_size = 0
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        self.send = send
+        await self.middleware.app(scope, receive, self.send_wrapper)
+
+    async def send_wrapper(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            headers = Headers(raw=message["headers"])
+            self.start_message = message
+            self.passthrough = (
+                "content-encoding" in headers
+                or message["status"] in (204, 304)
+                or not self.middleware.compressible(headers.get("content-type", ""))
+            )
+            if not self.passthrough:
+                MutableHeaders(scope=message).add_vary_header("Accept-Encoding")
+                content_length = headers.get("content-length")
+                if content_length is not None and int(content_length) < self.middleware.minimum_size:
+                    self.passthrough = True
+            if self.passthrough:
+                await self.send(message)
+            return
+
+        if message["type"] != "http.response.body" or self.passthrough:
+            await self.send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if self.encoder is None:
+            self.buffered.append(body)
+            self.buffered_size += len(body)
+            if self.buffered_size < self.middleware.minimum_size:
+                if more_body:
+                    return
+                # Ended below the threshold: send it as it was
+                await self.send(self.start_message)
+                await self.send({"type": "http.response.body", "body": b"".join(self.buffered)})
+                return
+
+            body = b"".join(self.buffered)
+            self.buffered = []
+            self.encoder = self.middleware.encoder(self.encoding)
+            await self._start_compressed(streaming=more_body, body=body)
+            return
+
+        chunk = self.encoder.compress(body, flush=more_body)
+        if not more_body:
+            chunk += self.encoder.finish()
+        if chunk or not more_body:
+            await self.send({"type": "http.response.body", "body": chunk, "more_body": more_body})
+
+    async def _start_compressed(self, streaming: bool, body: bytes) -> None:
+        headers = MutableHeaders(scope=self.start_message)
+        headers["Content-Encoding"] = self.encoder.name
+        # The compressed bytes are a different representation of the resource
+        etag = headers.get("etag")
+        if etag and not etag.startswith("W/"):
+            headers["ETag"] = f"W/{etag}"
+
+        compressed = self.encoder.compress(body, flush=streaming)
+        if not streaming:
+            compressed += self.encoder.finish()
+            headers["Content-Length"] = str(len(compressed))
+        elif "content-length" in headers:
+            del headers["Content-Length"]
+
+        await self.send(self.start_message)
+        await self.send({"type": "http.response.body", "body": compressed, "more_body": streaming})
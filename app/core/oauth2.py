@@ -1,27 +1,41 @@
+import logging
+import httpx
+import jwt
 from fastapi import HTTPException, status
-from google.oauth2 import id_token
-from google.auth.transport import requests
 from app.config.settings import settings
+from app.core.jwks import JWKSCache, JWKSError
+
+logger = logging.getLogger(__name__)
+
+GOOGLE_ISSUERS = ["accounts.google.com", "https://accounts.google.com"]
+
+google_jwks = JWKSCache(settings.GOOGLE_JWKS_URL)
 
 
 class GoogleOAuth2:
     """Google OAuth2 authentication helper"""
-    
+
     @staticmethod
-    async def verify_token(token: str) -> dict:
+    async def verify_token(token: str, jwks: JWKSCache = google_jwks) -> dict:
+        """Verify a Google ID token against the cached JWKS"""
         try:
-            idinfo = id_token.verify_oauth2_token(
+            key = await jwks.get_key(jwt.get_unverified_header(token).get("kid"))
+            idinfo = jwt.decode(
                 token,
-                requests.Request(),
-                settings.GOOGLE_CLIENT_ID
+                key.key,
+                algorithms=["RS256"],
+                audience=settings.GOOGLE_CLIENT_ID,
+                # Accounts are keyed by email, so a token without one is useless
+                options={"require": ["exp", "iat", "iss", "aud", "sub", "email"]},
+                leeway=10,
             )
-            
-            if idinfo['iss'] not in ['accounts.google.com', 'https://accounts.google.com']:
+
+            if idinfo['iss'] not in GOOGLE_ISSUERS:
                 raise ValueError('Wrong issuer.')
-            
+
             return {
                 'email': idinfo['email'],
-                'email_verified': idinfo['email_verified'],
+                'email_verified': idinfo.get('email_verified', False),
                 'name': idinfo.get('name'),
                 'picture': idinfo.get('picture'),
                 'given_name': idinfo.get('given_name'),
@@ -29,8 +43,43 @@ class GoogleOAuth2:
                 'locale': idinfo.get('locale'),
                 'sub': idinfo['sub']  # Google User ID
             }
-        except ValueError:
+        except (httpx.HTTPError, JWKSError) as e:
+            logger.error(f"Could not fetch Google signing keys: {str(e)}")
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Google sign-in is temporarily unavailable"
+            )
+        except (jwt.PyJWTError, LookupError, ValueError):
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Invalid Google token"
             )
+
+    @staticmethod
+    async def exchange_code(code: str, redirect_uri: str) -> str:
+        """Exchange an authorization code for the ID token it grants"""
+        try:
+            async with httpx.AsyncClient(timeout=10.0) as client:
+                response = await client.post(
+                    settings.GOOGLE_TOKEN_URL,
+                    data={
+                        "code": code,
+                        "client_id": settings.GOOGLE_CLIENT_ID,
+                        "client_secret": settings.GOOGLE_CLIENT_SECRET,
+                        "redirect_uri": redirect_uri,
+                        "grant_type": "authorization_code",
+                    },
+                )
+        except httpx.HTTPError as e:
+            logger.error(f"Google token exchange failed: {str(e)}")
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Google sign-in is temporarily unavailable"
+            )
+
+        if response.status_code != 200:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Invalid Google authorization code"
+            )
+        return response.json()["id_token"]
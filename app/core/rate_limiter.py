@@ -1,11 +1,17 @@
-from fastapi import Request, HTTPException
+from typing import Optional
+from fastapi import Depends, Request, HTTPException
+from fastapi.concurrency import run_in_threadpool
 from fastapi_limiter import FastAPILimiter
 from fastapi_limiter.depends import RateLimiter
+from app.api.dependencies import get_optional_user
+from app.core.request_context import RequestContext, get_request_context
 from app.models.subscription import PLAN_FEATURES, PlanType
-from app.services.user import UserService
+from app.models.user import User
 import redis.asyncio as redis
 from app.config.settings import settings
+from app.core.metrics import REDIS_LATENCY
 import logging
+import time
 
 logger = logging.getLogger(__name__)
 
@@ -24,19 +30,10 @@ async def init_redis():
     await FastAPILimiter.init(redis_instance)
 
 
-def get_user_rate_limit(request: Request) -> int:
+def get_user_rate_limit(context: RequestContext) -> int:
     """Get rate limit based on user's subscription plan"""
     try:
-        user = request.state.user
-        if not user:
-            return PLAN_FEATURES[PlanType.FREE]["api_rate_limit"]
-        
-        # Get user's active subscription
-        active_subscription = UserService.get_active_subscription(user.id)
-        if not active_subscription:
-            return PLAN_FEATURES[PlanType.FREE]["api_rate_limit"]
-        
-        return PLAN_FEATURES[active_subscription.plan.type]["api_rate_limit"]
+        return PLAN_FEATURES[context.plan_type]["api_rate_limit"]
     except Exception as e:
         logger.error(f"Error determining rate limit: {str(e)}")
         return PLAN_FEATURES[PlanType.FREE]["api_rate_limit"]
@@ -45,20 +42,31 @@ def get_user_rate_limit(request: Request) -> int:
 class DynamicRateLimiter(RateLimiter):
     """Rate limiter with dynamic limits based on subscription"""
     
-    async def __call__(self, request: Request):
+    async def __call__(
+        self,
+        request: Request,
+        user: Optional[User] = Depends(get_optional_user),
+        context: RequestContext = Depends(get_request_context)
+    ):
         if not redis_instance:
             await init_redis()
         
-        # Get rate limit for the user
-        rate_limit = get_user_rate_limit(request)
+        # Get rate limit for the user; the user and plan are resolved on the
+        # request's shared session and reused by the handler. The plan lookup
+        # queries the database, so keep it off the event loop.
+        rate_limit = await run_in_threadpool(get_user_rate_limit, context)
         
         # Create identifier (e.g., IP + user_id if authenticated)
         identifier = f"rate_limit:{request.client.host}"
-        if hasattr(request.state, "user") and request.state.user:
-            identifier = f"{identifier}:{request.state.user.id}"
+        if user:
+            identifier = f"{identifier}:{user.id}"
         
         # Check rate limit
+        started = time.perf_counter()
         current = await redis_instance.get(identifier)
+        REDIS_LATENCY.labels(component="rate_limiter", operation="get").observe(
+            time.perf_counter() - started
+        )
         if current is not None and int(current) >= rate_limit:
             raise HTTPException(
                 status_code=429,
@@ -66,10 +74,14 @@ class DynamicRateLimiter(RateLimiter):
             )
         
         # Update counter
+        started = time.perf_counter()
         pipeline = redis_instance.pipeline()
         pipeline.incr(identifier)
         pipeline.expire(identifier, 3600)  # Reset after 1 hour
         await pipeline.execute()
+        REDIS_LATENCY.labels(component="rate_limiter", operation="incr").observe(
+            time.perf_counter() - started
+        )
 
 
 rate_limiter = DynamicRateLimiter()
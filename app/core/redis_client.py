@@ -0,0 +1,17 @@
+from functools import lru_cache
+import redis
+from app.config.settings import settings
+
+
+@lru_cache
+def get_redis() -> redis.Redis:
+    """
+    Shared synchronous Redis client for code running in sync route handlers
+    and services. The async limiter keeps its own client in rate_limiter.
+    """
+    return redis.Redis.from_url(
+        settings.REDIS_URL,
+        socket_timeout=0.25,
+        socket_connect_timeout=0.25,
+        health_check_interval=30,
+    )
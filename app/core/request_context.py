@@ -0,0 +1,74 @@
+from typing import Optional
+from fastapi import Depends, Request
+from sqlalchemy.orm import Session
+from app.db.session import USER_ID, get_db
+from app.models.subscription import PlanType
+from app.models.user import User
+from app.services.auth import AuthService
+from app.services.user import UserService
+
+_UNRESOLVED = object()
+
+
+class RequestContext:
+    """
+    State shared by every dependency, service and handler of one request.
+
+    It holds the request's single session (from get_db, so FastAPI hands
+    the same one to everything that asks, and it only checks out a pooled
+    connection on first use), plus the authenticated user and their plan,
+    each looked up at most once. Services that only receive the session
+    reach it through current_plan_type.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+        db.info["request_context"] = self
+        self.username: Optional[str] = None
+        self.user: Optional[User] = None
+        self._token = _UNRESOLVED
+        self._plan_type: Optional[PlanType] = None
+
+    def resolve_user(self, token: Optional[str]) -> Optional[User]:
+        """The user a bearer token belongs to, or None"""
+        if token != self._token:
+            self._token = token
+            self.username = AuthService.verify_token(token) if token else None
+            self.user = (
+                UserService.get_user_by_username(self.db, self.username)
+                if self.username else None
+            )
+            self._plan_type = None
+            # Lets the session keep this user's reads on the primary after a write
+            self.db.info[USER_ID] = self.user.id if self.user else None
+        return self.user
+
+    @property
+    def plan_type(self) -> PlanType:
+        """The user's active plan; anonymous requests count as free"""
+        if self._plan_type is None:
+            subscription = (
+                UserService.get_active_subscription(self.db, self.user.id)
+                if self.user else None
+            )
+            self._plan_type = subscription.plan.type if subscription else PlanType.FREE
+        return self._plan_type
+
+
+def current_plan_type(db: Session, user: User) -> PlanType:
+    """A user's plan, reusing the request context's lookup when there is one"""
+    context = db.info.get("request_context")
+    if context is not None and context.user is not None and context.user.id == user.id:
+        return context.plan_type
+    subscription = UserService.get_active_subscription(db, user.id)
+    return subscription.plan.type if subscription else PlanType.FREE
+
+
+def get_request_context(request: Request, db: Session = Depends(get_db)) -> RequestContext:
+    """
+    The request's context. FastAPI caches dependencies per request, so
+    every Depends(get_request_context) receives this same instance.
+    """
+    context = RequestContext(db)
+    request.state.context = context
+    return context
@@ -0,0 +1,17 @@
+from typing import Any
+
+import orjson
+from fastapi.responses import ORJSONResponse
+
+
+class FastJSONResponse(ORJSONResponse):
+    """
+    orjson-encoded response for pre-built dicts.
+
+    UUIDs, datetimes and enums are encoded natively; UTC datetimes use the
+    same "Z" suffix the Pydantic serializer emits, so clients see identical
+    payloads on either path.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS)
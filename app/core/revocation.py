@@ -0,0 +1,133 @@
+import hashlib
+import logging
+import math
+import threading
+import time
+from typing import Iterable, Optional
+
+from fastapi import HTTPException, status
+from redis.exceptions import RedisError
+
+from app.config.settings import settings
+from app.core.redis_client import get_redis
+
+logger = logging.getLogger(__name__)
+
+# Sorted set of revoked jtis scored by the token's exp, so expired entries
+# can be pruned; the version counter tells processes when to re-sync
+REVOKED_KEY = "auth:revoked"
+REVOKED_VERSION_KEY = "auth:revoked:version"
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter over strings using double hashing"""
+
+    def __init__(self, capacity: int, error_rate: float):
+        capacity = max(capacity, 1)
+        self.size = max(8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, item: str) -> Iterable[int]:
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return ((h1 + i * h2) % self.size for i in range(self.hashes))
+
+    def add(self, item: str) -> None:
+        for position in self._positions(item):
+            self._bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, item: str) -> bool:
+        return all(
+            self._bits[position >> 3] & (1 << (position & 7))
+            for position in self._positions(item)
+        )
+
+
+class RevocationList:
+    """
+    Revoked token ids, checked without I/O on the common path.
+
+    Redis holds the authoritative set. Each process keeps a Bloom filter of
+    it, rebuilt at most every sync_interval seconds and only when the
+    version counter moved. A miss means "not revoked"; a hit is confirmed
+    against Redis since it may be a false positive. Revocations made in
+    another process become visible here within one sync interval.
+    """
+
+    def __init__(
+        self,
+        capacity: Optional[int] = None,
+        error_rate: Optional[float] = None,
+        sync_interval: Optional[float] = None,
+    ):
+        self.capacity = capacity or settings.TOKEN_REVOCATION_BLOOM_CAPACITY
+        self.error_rate = error_rate or settings.TOKEN_REVOCATION_BLOOM_ERROR_RATE
+        self.sync_interval = (
+            settings.TOKEN_REVOCATION_SYNC_INTERVAL if sync_interval is None else sync_interval
+        )
+        self._filter = BloomFilter(self.capacity, self.error_rate)
+        self._version: Optional[bytes] = None
+        self._synced_at = float("-inf")
+        self._lock = threading.Lock()
+
+    def revoke(self, jti: str, expires_at: int) -> None:
+        """
+        Revoke a token id until its expiry timestamp. Raises a 503 if the
+        revocation can't be stored, since other processes would still
+        accept the token.
+        """
+        self._filter.add(jti)
+        try:
+            pipe = get_redis().pipeline()
+            pipe.zadd(REVOKED_KEY, {jti: expires_at})
+            pipe.incr(REVOKED_VERSION_KEY)
+            pipe.execute()
+        except RedisError as e:
+            logger.error(f"Token revocation not stored, Redis unavailable: {str(e)}")
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Token service unavailable"
+            )
+
+    def is_revoked(self, jti: str) -> bool:
+        self.sync()
+        if jti not in self._filter:
+            return False
+        try:
+            return get_redis().zscore(REVOKED_KEY, jti) is not None
+        except RedisError as e:
+            # Only reached on a filter hit, so failing closed is cheap
+            logger.warning(f"Token revocation check failed, rejecting token: {str(e)}")
+            return True
+
+    def sync(self, force: bool = False) -> None:
+        """Rebuild the filter from Redis if the revocation set changed"""
+        now = time.monotonic()
+        if not force and now - self._synced_at < self.sync_interval:
+            return
+        # One thread syncs; the rest keep using the current filter
+        if not self._lock.acquire(blocking=False):
+            return
+        try:
+            self._synced_at = now
+            redis = get_redis()
+            version = redis.get(REVOKED_VERSION_KEY)
+            if version == self._version and not force:
+                return
+            redis.zremrangebyscore(REVOKED_KEY, "-inf", time.time())
+            jtis = redis.zrange(REVOKED_KEY, 0, -1)
+
+            fresh = BloomFilter(max(self.capacity, len(jtis)), self.error_rate)
+            for jti in jtis:
+                fresh.add(jti.decode())
+            self._filter = fresh
+            self._version = version
+        except RedisError as e:
+            logger.warning(f"Token revocation sync failed: {str(e)}")
+        finally:
+            self._lock.release()
+
+
+revocation_list = RevocationList()
@@ -1,38 +1,63 @@
-from datetime import datetime, timedelta
+from datetime import timedelta
 from typing import Optional, Union
-from jose import jwt
 from passlib.context import CryptContext
 from app.config.settings import settings
+from app.core.tokens import issue_token
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+PASSWORD_SCHEMES = ("argon2", "bcrypt")
+
+
+def build_crypt_context(
+    scheme: Optional[str] = None,
+    bcrypt_rounds: Optional[int] = None,
+    argon2_time_cost: Optional[int] = None,
+    argon2_memory_cost: Optional[int] = None,
+    argon2_parallelism: Optional[int] = None,
+) -> CryptContext:
+    """
+    Context that hashes with one scheme at the configured cost and still
+    verifies the others. Hashes from another scheme or below the cost are
+    flagged by needs_update, so they get upgraded on the next login.
+    """
+    scheme = scheme or settings.PASSWORD_HASH_SCHEME
+    if scheme not in PASSWORD_SCHEMES:
+        raise ValueError(f"Unsupported password hash scheme: {scheme}")
+    bcrypt_rounds = bcrypt_rounds or settings.BCRYPT_ROUNDS
+    return CryptContext(
+        schemes=[scheme, *(s for s in PASSWORD_SCHEMES if s != scheme)],
+        deprecated="auto",
+        bcrypt__default_rounds=bcrypt_rounds,
+        bcrypt__min_rounds=bcrypt_rounds,
+        argon2__type="ID",
+        argon2__time_cost=argon2_time_cost or settings.ARGON2_TIME_COST,
+        argon2__memory_cost=argon2_memory_cost or settings.ARGON2_MEMORY_COST,
+        argon2__parallelism=argon2_parallelism or settings.ARGON2_PARALLELISM,
+    )
+
+
+pwd_context = build_crypt_context()
 
 
 def create_access_token(subject: Union[str, int], expires_delta: Optional[timedelta] = None) -> str:
     """
     Create JWT access token
     """
-    if expires_delta:
-        expire = datetime.utcnow() + expires_delta
-    else:
-        expire = datetime.utcnow() + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
-    
-    to_encode = {"exp": expire, "sub": str(subject), "type": "access"}
-    encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
-    return encoded_jwt
+    if not expires_delta:
+        expires_delta = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
+    return issue_token(str(subject), "access", expires_delta)
 
 
-def create_refresh_token(subject: Union[str, int], expires_delta: Optional[timedelta] = None) -> str:
+def create_refresh_token(
+    subject: Union[str, int],
+    expires_delta: Optional[timedelta] = None,
+    claims: Optional[dict] = None
+) -> str:
     """
     Create JWT refresh token
     """
-    if expires_delta:
-        expire = datetime.utcnow() + expires_delta
-    else:
-        expire = datetime.utcnow() + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS)
-    
-    to_encode = {"exp": expire, "sub": str(subject), "type": "refresh"}
-    encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
-    return encoded_jwt
+    if not expires_delta:
+        expires_delta = timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS)
+    return issue_token(str(subject), "refresh", expires_delta, claims)
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
@@ -42,6 +67,13 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
 
 
+def password_needs_update(hashed_password: str) -> bool:
+    """
+    Whether a hash uses a deprecated scheme or a lower cost than configured
+    """
+    return pwd_context.needs_update(hashed_password)
+
+
 def get_password_hash(password: str) -> str:
     """
     Hash a password
@@ -0,0 +1,135 @@
+import uuid
+from datetime import datetime, timedelta
+from functools import lru_cache
+from typing import Dict, Optional, Tuple
+
+import jwt
+from cryptography.hazmat.primitives.asymmetric import ec, ed25519
+from cryptography.hazmat.primitives.serialization import (
+    load_pem_private_key,
+    load_pem_public_key,
+)
+
+from app.config.settings import settings
+from app.core.revocation import revocation_list
+
+REQUIRED_CLAIMS = ["exp", "sub", "type"]
+
+
+def _load_pem(pem: str) -> bytes:
+    # Keys passed through env vars usually arrive with escaped newlines
+    return pem.replace("\\n", "\n").encode()
+
+
+def _algorithm_for(public_key) -> str:
+    """JWS algorithm implied by an asymmetric public key"""
+    if isinstance(public_key, ed25519.Ed25519PublicKey):
+        return "EdDSA"
+    if isinstance(public_key, ec.EllipticCurvePublicKey) and isinstance(
+        public_key.curve, ec.SECP256R1
+    ):
+        return "ES256"
+    raise ValueError(f"Unsupported JWT key type: {type(public_key).__name__}")
+
+
+class KeySet:
+    """
+    Parsed signing and verification keys, keyed by kid.
+
+    Tokens are signed with the active key and carry its kid in the header;
+    verification picks the key (and its algorithm) by kid, so retired keys
+    keep verifying until their tokens expire. Tokens without a kid predate
+    rotation and are checked against the active key.
+    """
+
+    def __init__(
+        self,
+        active_kid: str,
+        algorithm: str,
+        signing_key,
+        verification_keys: Dict[str, Tuple[str, object]],
+    ):
+        self.active_kid = active_kid
+        self.algorithm = algorithm
+        self.signing_key = signing_key
+        self.verification_keys = verification_keys
+        self._headers = {"kid": active_kid}
+
+    @classmethod
+    def from_settings(cls) -> "KeySet":
+        algorithm = settings.ALGORITHM
+        if algorithm.startswith("HS"):
+            signing_key = verification_key = settings.SECRET_KEY
+        else:
+            if not settings.JWT_PRIVATE_KEY:
+                raise RuntimeError(f"JWT_PRIVATE_KEY is required for {algorithm} tokens")
+            signing_key = load_pem_private_key(_load_pem(settings.JWT_PRIVATE_KEY), password=None)
+            verification_key = signing_key.public_key()
+            if _algorithm_for(verification_key) != algorithm:
+                raise RuntimeError(f"JWT_PRIVATE_KEY is not a {algorithm} key")
+
+        verification_keys = {}
+        for kid, pem in settings.JWT_PUBLIC_KEYS.items():
+            public_key = load_pem_public_key(_load_pem(pem))
+            verification_keys[kid] = (_algorithm_for(public_key), public_key)
+        verification_keys[settings.JWT_ACTIVE_KID] = (algorithm, verification_key)
+        return cls(settings.JWT_ACTIVE_KID, algorithm, signing_key, verification_keys)
+
+    def encode(self, claims: dict) -> str:
+        return jwt.encode(claims, self.signing_key, algorithm=self.algorithm, headers=self._headers)
+
+    def decode(self, token: str) -> dict:
+        """Verified claims of a token; raises jwt.PyJWTError"""
+        kid = jwt.get_unverified_header(token).get("kid", self.active_kid)
+        if not isinstance(kid, str):
+            raise jwt.InvalidTokenError("Key ID must be a string")
+        try:
+            algorithm, key = self.verification_keys[kid]
+        except KeyError:
+            raise jwt.InvalidKeyError(f"Unknown key id {kid}")
+        return jwt.decode(
+            token, key, algorithms=[algorithm], options={"require": REQUIRED_CLAIMS}
+        )
+
+
+@lru_cache
+def get_key_set() -> KeySet:
+    return KeySet.from_settings()
+
+
+def issue_token(
+    subject: str,
+    token_type: str,
+    expires_delta: timedelta,
+    claims: Optional[dict] = None
+) -> str:
+    """Sign a token with the active key; every token gets a unique jti"""
+    now = datetime.utcnow()
+    return get_key_set().encode({
+        "exp": now + expires_delta,
+        "iat": now,
+        "sub": subject,
+        "type": token_type,
+        "jti": uuid.uuid4().hex,
+        **(claims or {}),
+    })
+
+
+def decode_token(token: str, token_type: str) -> Optional[dict]:
+    """Claims of a valid, unrevoked token of the given type, else None"""
+    try:
+        payload = get_key_set().decode(token)
+    except jwt.PyJWTError:
+        return None
+    if payload["type"] != token_type:
+        return None
+    jti = payload.get("jti")
+    if jti and revocation_list.is_revoked(jti):
+        return None
+    return payload
+
+
+def revoke_token(payload: dict) -> None:
+    """Revoke a decoded token for the rest of its lifetime"""
+    if payload.get("jti"):
+        revocation_list.revoke(payload["jti"], payload["exp"])
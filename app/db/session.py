@@ -1,9 +1,134 @@
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+import functools
+import logging
+from typing import Optional
+from redis.exceptions import RedisError
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session, sessionmaker
 from app.config.settings import settings
+from app.core.metrics import TimedQueuePool, instrument_engine
+from app.core.redis_client import get_redis
 
-engine = create_engine(settings.DATABASE_URL)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+logger = logging.getLogger(__name__)
+
+engine = create_engine(settings.DATABASE_URL, poolclass=TimedQueuePool)
+instrument_engine(engine)
+
+replica_engine: Optional[Engine] = None
+if settings.DATABASE_REPLICA_URL:
+    replica_engine = create_engine(settings.DATABASE_REPLICA_URL, poolclass=TimedQueuePool)
+    instrument_engine(replica_engine)
+
+# Session.info keys
+READ_REPLICA = "read_replica"
+USER_ID = "user_id"
+WROTE = "wrote"
+STICKY = "sticky_to_primary"
+
+
+def _recent_write_key(user_id) -> str:
+    return f"db:recent_write:{user_id}"
+
+
+class RoutingSession(Session):
+    """
+    Session that sends reads made inside replica_reads() to the replica
+    engine and everything else to its bind, the primary.
+
+    Reads stay on the primary once the session has written, and for
+    READ_YOUR_WRITES_SECONDS after the session's user last committed a
+    write (tracked in Redis), so users always see their own changes.
+    """
+
+    def __init__(self, *args, replica: Optional[Engine] = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.replica = replica
+
+    def get_bind(self, mapper=None, clause=None, **kw):
+        if (
+            self.replica is not None
+            and self.info.get(READ_REPLICA)
+            and not self._flushing
+            and not getattr(clause, "is_dml", False)
+            and not self.info.get(WROTE)
+            and not self._sticky_to_primary()
+        ):
+            return self.replica
+        return super().get_bind(mapper, clause=clause, **kw)
+
+    def _sticky_to_primary(self) -> bool:
+        """Whether this session's user wrote recently; checked once per session"""
+        if STICKY not in self.info:
+            user_id = self.info.get(USER_ID)
+            if user_id is None:
+                return False
+            try:
+                self.info[STICKY] = bool(get_redis().exists(_recent_write_key(user_id)))
+            except RedisError as e:
+                logger.warning(f"Replica routing disabled for this request: {str(e)}")
+                self.info[STICKY] = True
+        return self.info[STICKY]
+
+
+@event.listens_for(RoutingSession, "do_orm_execute")
+def _track_dml(orm_execute_state):
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        orm_execute_state.session.info[WROTE] = True
+
+
+@event.listens_for(RoutingSession, "after_flush")
+def _track_flush(session, flush_context):
+    session.info[WROTE] = True
+
+
+@event.listens_for(RoutingSession, "after_soft_rollback")
+def _forget_write(session, previous_transaction):
+    session.info.pop(WROTE, None)
+
+
+@event.listens_for(RoutingSession, "after_commit")
+def _remember_write(session):
+    if not session.info.pop(WROTE, False):
+        return
+    session.info[STICKY] = True
+    user_id = session.info.get(USER_ID)
+    if session.replica is None or user_id is None:
+        return
+    try:
+        get_redis().set(
+            _recent_write_key(user_id), 1, ex=settings.READ_YOUR_WRITES_SECONDS
+        )
+    except RedisError as e:
+        logger.warning(f"Could not record write for read-your-writes: {str(e)}")
+
+
+def replica_reads(func):
+    """
+    Mark a read-only service call (taking the session as `db`, first) as
+    safe to serve from the replica
+    """
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        db = kwargs["db"] if "db" in kwargs else args[0]
+        previous = db.info.get(READ_REPLICA, False)
+        db.info[READ_REPLICA] = True
+        try:
+            return func(*args, **kwargs)
+        finally:
+            db.info[READ_REPLICA] = previous
+    return wrapper
+
+
+# Objects stay loaded after commit so responses can be serialized without
+# re-fetching every row that was just written.
+SessionLocal = sessionmaker(
+    class_=RoutingSession,
+    autocommit=False,
+    autoflush=False,
+    expire_on_commit=False,
+    bind=engine,
+    replica=replica_engine,
+)
 
 
 def get_db():
@@ -1,7 +1,15 @@
-from fastapi import FastAPI
+import secrets
+from fastapi import FastAPI, HTTPException, Request, Response, status
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.concurrency import run_in_threadpool
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
 from app.config.settings import settings
-from app.api.v1 import auth, users, webhooks
+from app.api.v1 import auth, users, exercises, workouts, webhooks
+from app.core.middleware import CompressionMiddleware, MetricsMiddleware
+from app.core.oauth2 import google_jwks
+from app.services.email import warm_templates
+from app.services.email_queue import email_queue
+from app.services.partitions import ensure_upcoming_partitions
 
 # Create FastAPI instance
 app = FastAPI(
@@ -20,11 +28,45 @@ if settings.BACKEND_CORS_ORIGINS:
         allow_headers=["*"],
     )
 
+# Request latency and SQL instrumentation
+if settings.METRICS_ENABLED:
+    app.add_middleware(
+        MetricsMiddleware,
+        slow_request_threshold_ms=settings.SLOW_REQUEST_THRESHOLD_MS,
+    )
+
+# Response compression (outermost, so it sees the final body)
+if settings.COMPRESSION_ENABLED:
+    app.add_middleware(
+        CompressionMiddleware,
+        minimum_size=settings.COMPRESSION_MINIMUM_SIZE,
+        gzip_level=settings.COMPRESSION_GZIP_LEVEL,
+        brotli_quality=settings.COMPRESSION_BROTLI_QUALITY,
+        content_types=settings.COMPRESSION_CONTENT_TYPES,
+    )
+
 # Include routers
 app.include_router(auth.router, prefix="/api/v1/auth", tags=["Authentication"])
 app.include_router(users.router, prefix="/api/v1/users", tags=["Users"])
+app.include_router(exercises.router, prefix="/api/v1/fitness", tags=["Exercises"])
+app.include_router(workouts.router, prefix="/api/v1/fitness", tags=["Workouts"])
 app.include_router(webhooks.router, prefix="/api/v1/webhooks", tags=["Webhooks"])
 
+
+@app.on_event("startup")
+async def startup():
+    warm_templates()
+    if settings.PARTITION_ENSURE_ON_STARTUP:
+        await run_in_threadpool(ensure_upcoming_partitions)
+    await email_queue.start()
+
+
+@app.on_event("shutdown")
+async def shutdown():
+    await google_jwks.stop()
+    await email_queue.stop()
+
+
 @app.get("/")
 async def root():
     return {"message": "Welcome to the Fitness Tracker API!"}
@@ -33,3 +75,23 @@ async def root():
 async def health_check():
     return {"status": "healthy"}
 
+
+def _authorize_metrics(request: Request) -> None:
+    """Allow the configured bearer token, or loopback clients if there is none"""
+    if settings.METRICS_TOKEN:
+        scheme, _, token = request.headers.get("authorization", "").partition(" ")
+        if scheme.lower() == "bearer" and secrets.compare_digest(
+            token.encode(), settings.METRICS_TOKEN.encode()
+        ):
+            return
+    elif request.client and request.client.host in ("127.0.0.1", "::1"):
+        return
+    raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Forbidden")
+
+
+if settings.METRICS_ENABLED:
+    @app.get("/metrics", include_in_schema=False)
+    async def metrics(request: Request):
+        _authorize_metrics(request)
+        return Response(generate_latest(), media_type=CONTENT_TYPE_LATEST)
+
@@ -7,3 +7,7 @@ class TimeStampMixin:
     """Mixin to add created_at and updated_at timestamps to models"""
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
+
+    # Fetch server-generated timestamps with INSERT/UPDATE ... RETURNING instead
+    # of expiring them and issuing a SELECT on next access
+    __mapper_args__ = {"eager_defaults": True}
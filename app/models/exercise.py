@@ -1,5 +1,5 @@
-from sqlalchemy import Column, String, Boolean, Integer, ForeignKey, Text, Enum
-from sqlalchemy.dialects.postgresql import UUID, ARRAY
+from sqlalchemy import Column, String, Boolean, Integer, Float, ForeignKey, Text, Enum, Index, text
+from sqlalchemy.dialects.postgresql import UUID, ARRAY, JSONB
 from sqlalchemy.orm import relationship
 from app.db.base import Base
 from app.models.base import TimeStampMixin
@@ -18,6 +18,9 @@ class DifficultyLevel(enum.Enum):
 # Junction Tables
 class ExerciseMuscleGroup(Base):
     __tablename__ = "exercise_muscle_groups"
+    __table_args__ = (
+        Index("ix_exercise_muscle_groups_muscle_group_id", "muscle_group_id"),
+    )
 
     exercise_id = Column(
         UUID(as_uuid=True), ForeignKey("exercise_catalog.id"), primary_key=True
@@ -29,6 +32,7 @@ class ExerciseMuscleGroup(Base):
 
 class ExerciseEquipment(Base):
     __tablename__ = "exercise_equipment"
+    __table_args__ = (Index("ix_exercise_equipment_equipment_id", "equipment_id"),)
 
     exercise_id = Column(
         UUID(as_uuid=True), ForeignKey("exercise_catalog.id"), primary_key=True
@@ -40,6 +44,12 @@ class ExerciseEquipment(Base):
 
 class ExerciseMovementPattern(Base):
     __tablename__ = "exercise_movement_patterns"
+    __table_args__ = (
+        Index(
+            "ix_exercise_movement_patterns_movement_pattern_id", "movement_pattern_id"
+        ),
+    )
+
     exercise_id = Column(
         UUID(as_uuid=True),
         ForeignKey("exercise_catalog.id", ondelete="CASCADE"),
@@ -110,6 +120,20 @@ class MovementPattern(Base, TimeStampMixin):
 
 class ExerciseCatalog(Base, TimeStampMixin):
     __tablename__ = "exercise_catalog"
+    __table_args__ = (
+        Index("ix_exercise_catalog_category_id_difficulty", "category_id", "difficulty"),
+        # list_exercises(include_custom=False)
+        Index(
+            "ix_exercise_catalog_system_difficulty",
+            "difficulty",
+            postgresql_where=text("is_custom = false"),
+        ),
+        Index(
+            "ix_exercise_catalog_created_by_id",
+            "created_by_id",
+            postgresql_where=text("created_by_id IS NOT NULL"),
+        ),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     name = Column(String, nullable=False)
@@ -156,3 +180,40 @@ class ExerciseCatalog(Base, TimeStampMixin):
         "Equipment", secondary="exercise_equipment", back_populates="exercises"
     )
     created_by = relationship("User", backref="created_exercises")
+
+
+class ExerciseSimilarity(Base):
+    """
+    Precomputed top-K nearest neighbours of each system exercise, ranked by
+    cosine similarity of their feature vectors. Rebuilt by
+    ExerciseSimilarityService.rebuild (run by the catalog importer).
+    """
+
+    __tablename__ = "exercise_similarities"
+
+    exercise_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("exercise_catalog.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    rank = Column(Integer, primary_key=True)
+    similar_exercise_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("exercise_catalog.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    score = Column(Float, nullable=False)
+
+
+class CatalogSnapshot(Base, TimeStampMixin):
+    """A published, immutable bundle of the system exercise catalog"""
+
+    __tablename__ = "catalog_snapshots"
+    __table_args__ = (Index("ix_catalog_snapshots_created_at", "created_at"),)
+
+    version = Column(String, primary_key=True)  # content hash of the bundle
+    key = Column(String, nullable=False)
+    size_bytes = Column(Integer, nullable=False)
+    exercise_count = Column(Integer, nullable=False)
+    # {from_version: {"key": ..., "size_bytes": ...}} for delta bundles to this version
+    deltas = Column(JSONB, nullable=False, default=dict)
@@ -7,7 +7,12 @@ from sqlalchemy import (
     Text,
     Enum,
     Float,
+    Date,
     DateTime,
+    Index,
+    UniqueConstraint,
+    func,
+    text,
 )
 from sqlalchemy.dialects.postgresql import UUID, ARRAY, JSONB
 from sqlalchemy.orm import relationship
@@ -30,8 +35,31 @@ class WorkoutStatus(enum.Enum):
     ABANDONED = "abandoned"
 
 
+class PersonalRecordType(enum.Enum):
+    MAX_WEIGHT = "max_weight"
+    MAX_REPS_AT_WEIGHT = "max_reps_at_weight"
+    ESTIMATED_1RM = "estimated_1rm"
+    MAX_VOLUME = "max_volume"
+
+
+class EnrollmentStatus(enum.Enum):
+    ACTIVE = "active"
+    COMPLETED = "completed"
+    CANCELLED = "cancelled"
+
+
 class Workout(Base, TimeStampMixin):
     __tablename__ = "workouts"
+    __table_args__ = (
+        # Owner listings and the plan-limit count (created_by_id, is_template)
+        Index("ix_workouts_created_by_id_is_template", "created_by_id", "is_template"),
+        # Public side of list_workouts' "mine OR public" filter
+        Index(
+            "ix_workouts_public_difficulty",
+            "difficulty",
+            postgresql_where=text("is_public = true"),
+        ),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     name = Column(String, nullable=False)
@@ -56,10 +84,14 @@ class Workout(Base, TimeStampMixin):
 
 class WorkoutExercise(Base, TimeStampMixin):
     __tablename__ = "workout_exercises"
+    __table_args__ = (
+        Index("ix_workout_exercises_workout_id_order", "workout_id", "order"),
+        Index("ix_workout_exercises_exercise_id", "exercise_id"),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     workout_id = Column(UUID(as_uuid=True), ForeignKey("workouts.id"), nullable=False)
-    exercise_id = Column(UUID(as_uuid=True), ForeignKey("exercises.id"), nullable=False)
+    exercise_id = Column(UUID(as_uuid=True), ForeignKey("exercise_catalog.id"), nullable=False)
     order = Column(Integer, nullable=False)
     sets = Column(Integer, nullable=False)
     reps = Column(Integer, nullable=True)  # Nullable for time-based exercises
@@ -79,6 +111,7 @@ class WorkoutExercise(Base, TimeStampMixin):
 
 class WorkoutPlan(Base, TimeStampMixin):
     __tablename__ = "workout_plans"
+    __table_args__ = (Index("ix_workout_plans_created_by_id", "created_by_id"),)
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     name = Column(String, nullable=False)
@@ -92,11 +125,18 @@ class WorkoutPlan(Base, TimeStampMixin):
     workouts = relationship(
         "Workout", secondary="workout_plan_workouts", back_populates="workout_plans"
     )
+    # The association rows themselves, in calendar order
+    schedule = relationship(
+        "WorkoutPlanWorkout",
+        order_by="[WorkoutPlanWorkout.week_number, WorkoutPlanWorkout.day_number]",
+        viewonly=True,
+    )
     created_by = relationship("User", backref="created_workout_plans")
 
 
 class WorkoutPlanWorkout(Base):
     __tablename__ = "workout_plan_workouts"
+    __table_args__ = (Index("ix_workout_plan_workouts_workout_id", "workout_id"),)
 
     workout_plan_id = Column(
         UUID(as_uuid=True), ForeignKey("workout_plans.id"), primary_key=True
@@ -105,9 +145,31 @@ class WorkoutPlanWorkout(Base):
     week_number = Column(Integer, nullable=False)
     day_number = Column(Integer, nullable=False)  # 1-7 for days of the week
 
+    workout = relationship("Workout", viewonly=True)
+
 
 class WorkoutSession(Base, TimeStampMixin):
     __tablename__ = "workout_sessions"
+    __table_args__ = (
+        Index("ix_workout_sessions_user_id_status", "user_id", "status"),
+        Index("ix_workout_sessions_workout_id", "workout_id"),
+        # WorkoutService.list_session_history: newest first per user, served
+        # by an index-only scan (id breaks ties for the keyset cursor)
+        Index(
+            "ix_workout_sessions_user_id_start_time",
+            "user_id",
+            text("start_time DESC"),
+            text("id DESC"),
+            postgresql_include=["status", "total_duration", "workout_id"],
+        ),
+        # At most one in-progress session per user
+        Index(
+            "uq_workout_sessions_user_in_progress",
+            "user_id",
+            unique=True,
+            postgresql_where=text("status = 'IN_PROGRESS'"),
+        ),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
@@ -125,18 +187,44 @@ class WorkoutSession(Base, TimeStampMixin):
     mood_rating = Column(Integer, nullable=True)  # 1-5 scale
     difficulty_rating = Column(Integer, nullable=True)  # 1-5 scale
 
+    # Set once the session's sets have moved to the history archive; the
+    # row stays behind as a stub (see HistoryArchiveService)
+    archived_at = Column(DateTime(timezone=True), nullable=True)
+    archive_key = Column(String, nullable=True)
+
     # Relationships
     user = relationship("User", backref="workout_sessions")
     workout = relationship("Workout", back_populates="sessions")
+    # A session's sets are never older than the session, so the bound on
+    # created_at lets Postgres skip earlier exercise_sets partitions
     exercise_sets = relationship(
-        "ExerciseSet", back_populates="workout_session", cascade="all, delete-orphan"
+        "ExerciseSet",
+        primaryjoin=(
+            "and_(WorkoutSession.id == foreign(ExerciseSet.workout_session_id), "
+            "ExerciseSet.created_at >= WorkoutSession.created_at)"
+        ),
+        back_populates="workout_session",
+        cascade="all, delete-orphan",
     )
 
 
 class ExerciseSet(Base, TimeStampMixin):
+    """
+    Range-partitioned by month on created_at (see
+    app/services/partitions.py). The primary key has to include the
+    partition key, so nothing can hold a foreign key to this table.
+    """
     __tablename__ = "exercise_sets"
+    __table_args__ = (
+        Index("ix_exercise_sets_workout_session_id", "workout_session_id"),
+        Index("ix_exercise_sets_workout_exercise_id", "workout_exercise_id"),
+        {"postgresql_partition_by": "RANGE (created_at)"},
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    created_at = Column(
+        DateTime(timezone=True), primary_key=True, server_default=func.now(), nullable=False
+    )
     workout_session_id = Column(
         UUID(as_uuid=True), ForeignKey("workout_sessions.id"), nullable=False
     )
@@ -153,3 +241,121 @@ class ExerciseSet(Base, TimeStampMixin):
     # Relationships
     workout_session = relationship("WorkoutSession", back_populates="exercise_sets")
     workout_exercise = relationship("WorkoutExercise")
+
+    # Rows are identified by id alone; created_at is only in the table's key
+    __mapper_args__ = {**TimeStampMixin.__mapper_args__, "primary_key": [id]}
+
+
+class PlanEnrollment(Base, TimeStampMixin):
+    __tablename__ = "plan_enrollments"
+    __table_args__ = (
+        Index("ix_plan_enrollments_user_id_status", "user_id", "status"),
+        # A plan can only be followed once at a time
+        Index(
+            "uq_plan_enrollments_user_plan_active",
+            "user_id",
+            "workout_plan_id",
+            unique=True,
+            postgresql_where=text("status = 'ACTIVE'"),
+        ),
+    )
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
+    workout_plan_id = Column(
+        UUID(as_uuid=True), ForeignKey("workout_plans.id"), nullable=False
+    )
+    start_date = Column(Date, nullable=False)
+    status = Column(
+        Enum(EnrollmentStatus), nullable=False, default=EnrollmentStatus.ACTIVE
+    )
+
+    # Relationships
+    user = relationship("User", backref="plan_enrollments")
+    workout_plan = relationship("WorkoutPlan")
+    scheduled_workouts = relationship(
+        "ScheduledWorkout", back_populates="enrollment", passive_deletes=True
+    )
+
+
+class ScheduledWorkout(Base, TimeStampMixin):
+    """One calendar entry of an enrollment, materialized when the user enrolls"""
+
+    __tablename__ = "scheduled_workouts"
+    __table_args__ = (
+        # "What's on my calendar" range scans and today's lookup
+        Index("ix_scheduled_workouts_user_id_scheduled_date", "user_id", "scheduled_date"),
+        Index("ix_scheduled_workouts_enrollment_id", "enrollment_id"),
+    )
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    enrollment_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("plan_enrollments.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
+    workout_id = Column(UUID(as_uuid=True), ForeignKey("workouts.id"), nullable=False)
+    scheduled_date = Column(Date, nullable=False)
+    week_number = Column(Integer, nullable=False)
+    day_number = Column(Integer, nullable=False)
+
+    # Adherence: the completed session that fulfilled this entry, if any
+    workout_session_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("workout_sessions.id", ondelete="SET NULL"),
+        nullable=True,
+    )
+    completed_at = Column(DateTime(timezone=True), nullable=True)
+
+    # Relationships
+    enrollment = relationship("PlanEnrollment", back_populates="scheduled_workouts")
+    workout = relationship("Workout")
+    workout_session = relationship("WorkoutSession")
+
+
+class PersonalRecord(Base, TimeStampMixin):
+    """
+    A user's current best for one exercise and record type.
+
+    MAX_REPS_AT_WEIGHT keeps one row per weight (scope_weight); the other
+    types use scope_weight = 0. value is what's compared: kg for
+    MAX_WEIGHT/ESTIMATED_1RM, reps for MAX_REPS_AT_WEIGHT, kg x reps for
+    MAX_VOLUME.
+    """
+
+    __tablename__ = "personal_records"
+    __table_args__ = (
+        UniqueConstraint(
+            "user_id",
+            "exercise_id",
+            "record_type",
+            "scope_weight",
+            name="uq_personal_records_user_exercise_type_scope",
+        ),
+    )
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
+    exercise_id = Column(
+        UUID(as_uuid=True), ForeignKey("exercise_catalog.id"), nullable=False
+    )
+    record_type = Column(Enum(PersonalRecordType), nullable=False)
+    scope_weight = Column(Float, nullable=False, default=0)
+    value = Column(Float, nullable=False)
+
+    # The set that holds the record
+    weight = Column(Float, nullable=True)
+    reps = Column(Integer, nullable=True)
+    # No foreign key: exercise_sets is partitioned (see ExerciseSet)
+    exercise_set_id = Column(UUID(as_uuid=True), nullable=True)
+    workout_session_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("workout_sessions.id", ondelete="SET NULL"),
+        nullable=True,
+    )
+    achieved_at = Column(DateTime(timezone=True), nullable=False)
+
+    # Relationships
+    user = relationship("User", backref="personal_records")
+    exercise = relationship("ExerciseCatalog")
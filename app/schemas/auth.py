@@ -1,4 +1,5 @@
-from pydantic import BaseModel, EmailStr
+from typing import Optional
+from pydantic import BaseModel, EmailStr, model_validator
 
 
 class LoginRequest(BaseModel):
@@ -18,3 +19,17 @@ class TokenData(BaseModel):
 
 class RefreshTokenRequest(BaseModel):
     refresh_token: str
+
+
+class GoogleLoginRequest(BaseModel):
+    # Either an ID token from client-side sign-in, or an authorization code
+    # (with the redirect_uri it was issued for) to exchange server-side
+    id_token: Optional[str] = None
+    code: Optional[str] = None
+    redirect_uri: Optional[str] = None
+
+    @model_validator(mode="after")
+    def check_credential(self):
+        if not self.id_token and not (self.code and self.redirect_uri):
+            raise ValueError("Provide id_token, or code and redirect_uri")
+        return self
@@ -1,4 +1,4 @@
-from typing import List, Optional
+from typing import Dict, List, Optional
 from pydantic import BaseModel, UUID4, HttpUrl
 from datetime import datetime
 from enum import Enum
@@ -89,3 +89,17 @@ class Exercise(ExerciseBase):
 
     class Config:
         orm_mode = True
+
+class ExerciseAlternative(BaseModel):
+    exercise: Exercise
+    score: float  # cosine similarity to the requested exercise, 0-1
+
+class CatalogBundle(BaseModel):
+    url: str
+    size_bytes: int
+
+class CatalogManifest(CatalogBundle):
+    version: str
+    exercise_count: int
+    generated_at: datetime
+    deltas: Dict[str, CatalogBundle]  # keyed by the version the delta starts from
@@ -1,6 +1,6 @@
 from typing import List, Optional, Dict, Union
-from pydantic import BaseModel, UUID4, conint, confloat
-from datetime import datetime
+from pydantic import BaseModel, Field, UUID4, conint, confloat
+from datetime import date, datetime
 from enum import Enum
 from .exercise import Exercise
 
@@ -15,6 +15,17 @@ class WorkoutStatus(str, Enum):
     COMPLETED = "completed"
     ABANDONED = "abandoned"
 
+class PersonalRecordType(str, Enum):
+    MAX_WEIGHT = "max_weight"
+    MAX_REPS_AT_WEIGHT = "max_reps_at_weight"
+    ESTIMATED_1RM = "estimated_1rm"
+    MAX_VOLUME = "max_volume"
+
+class EnrollmentStatus(str, Enum):
+    ACTIVE = "active"
+    COMPLETED = "completed"
+    CANCELLED = "cancelled"
+
 class WorkoutExerciseBase(BaseModel):
     exercise_id: UUID4
     order: int
@@ -50,6 +61,9 @@ class WorkoutBase(BaseModel):
 class WorkoutCreate(WorkoutBase):
     exercises: List[WorkoutExerciseCreate]
 
+class CloneRequest(BaseModel):
+    name: Optional[str] = None  # defaults to the source's name
+
 class Workout(WorkoutBase):
     id: UUID4
     created_by_id: UUID4
@@ -80,6 +94,24 @@ class ExerciseSet(ExerciseSetBase):
     class Config:
         orm_mode = True
 
+class PersonalRecord(BaseModel):
+    id: UUID4
+    exercise_id: UUID4
+    record_type: PersonalRecordType
+    scope_weight: float  # the weight for max_reps_at_weight, else 0
+    value: float
+    weight: Optional[float] = None
+    reps: Optional[int] = None
+    exercise_set_id: Optional[UUID4] = None
+    workout_session_id: Optional[UUID4] = None
+    achieved_at: datetime
+
+    class Config:
+        orm_mode = True
+
+class RecordedExerciseSet(ExerciseSet):
+    new_records: List[PersonalRecord] = []
+
 class WorkoutSessionBase(BaseModel):
     workout_id: UUID4
     notes: Optional[str] = None
@@ -109,6 +141,18 @@ class WorkoutSession(WorkoutSessionBase):
     class Config:
         orm_mode = True
 
+class WorkoutSessionSummary(BaseModel):
+    id: UUID4
+    workout_id: UUID4
+    workout_name: str
+    start_time: datetime
+    status: WorkoutStatus
+    total_duration: Optional[int] = None
+
+class WorkoutSessionHistory(BaseModel):
+    items: List[WorkoutSessionSummary]
+    next_cursor: Optional[str] = None  # pass back as `cursor` for the next page
+
 class WorkoutPlanBase(BaseModel):
     name: str
     description: Optional[str] = None
@@ -133,9 +177,42 @@ class WorkoutPlanWorkout(WorkoutPlanWorkoutCreate):
 class WorkoutPlan(WorkoutPlanBase):
     id: UUID4
     created_by_id: UUID4
-    workouts: List[WorkoutPlanWorkout]
+    workouts: List[WorkoutPlanWorkout] = Field(validation_alias="schedule")
     created_at: datetime
     updated_at: datetime
 
     class Config:
         orm_mode = True
+
+class PlanEnrollmentCreate(BaseModel):
+    start_date: date  # day 1 of week 1
+
+class PlanEnrollment(PlanEnrollmentCreate):
+    id: UUID4
+    user_id: UUID4
+    workout_plan_id: UUID4
+    status: EnrollmentStatus
+    created_at: datetime
+    updated_at: datetime
+
+    class Config:
+        orm_mode = True
+
+class ScheduledWorkout(BaseModel):
+    id: UUID4
+    enrollment_id: UUID4
+    workout_id: UUID4
+    workout_name: str
+    scheduled_date: date
+    week_number: int
+    day_number: int
+    workout_session_id: Optional[UUID4] = None
+    completed_at: Optional[datetime] = None
+
+class PlanAdherence(BaseModel):
+    enrollment_id: UUID4
+    scheduled: int
+    completed: int
+    missed: int
+    upcoming: int
+    adherence_rate: Optional[float] = None  # completed / (completed + missed)
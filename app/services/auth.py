@@ -1,71 +1,90 @@
-from datetime import datetime
 from typing import Optional
-from jose import JWTError, jwt
 from sqlalchemy.orm import Session
-from app.config.settings import settings
-from app.core.security import create_access_token, create_refresh_token
+from app.core.security import create_access_token
+from app.core.tokens import decode_token, revoke_token
 from app.core.exceptions import InvalidCredentialsException, UnauthorizedException
+from app.models.user import User
 from app.schemas.auth import Token
+from app.services.login_throttle import LoginThrottle
+from app.services.refresh_tokens import RefreshTokenService
 from app.services.user import UserService
 
 
 class AuthService:
     @staticmethod
-    def login(db: Session, username: str, password: str) -> Token:
+    def login(
+        db: Session,
+        username: str,
+        password: str,
+        client_ip: Optional[str] = None
+    ) -> Token:
         """Authenticate user and return tokens"""
+        LoginThrottle.check(username, client_ip)
         user = UserService.authenticate_user(db, username, password)
         if not user:
+            LoginThrottle.record_failure(username, client_ip)
             raise InvalidCredentialsException()
 
+        LoginThrottle.record_success(username)
+
+        return AuthService.issue_tokens(user)
+
+    @staticmethod
+    def issue_tokens(user: User) -> Token:
+        """Tokens for a user authenticated by other means"""
         if not user.is_active:
             raise UnauthorizedException("User account is inactive")
 
         access_token = create_access_token(subject=user.username)
-        refresh_token = create_refresh_token(subject=user.username)
+        refresh_token = RefreshTokenService.issue(user.username)
 
         return Token(access_token=access_token, refresh_token=refresh_token)
 
     @staticmethod
     def refresh_token(db: Session, refresh_token: str) -> Token:
-        """Refresh access token using refresh token"""
-        try:
-            payload = jwt.decode(
-                refresh_token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]
-            )
-            username: str = payload.get("sub")
-            token_type: str = payload.get("type")
-
-            if username is None or token_type != "refresh":
-                raise UnauthorizedException("Invalid refresh token")
-
-        except JWTError:
+        """
+        Refresh access token using refresh token. The presented token is
+        rotated out of its family; replaying it later revokes the family.
+        """
+        payload = decode_token(refresh_token, "refresh")
+        if payload is None:
             raise UnauthorizedException("Invalid refresh token")
 
-        user = UserService.get_user_by_username(db, username)
+        user = UserService.get_user_by_username(db, payload["sub"])
         if not user:
             raise UnauthorizedException("User not found")
 
         if not user.is_active:
+            RefreshTokenService.revoke_all(user.username)
             raise UnauthorizedException("User account is inactive")
 
-        access_token = create_access_token(subject=user.username)
-        new_refresh_token = create_refresh_token(subject=user.username)
+        if "fam" in payload:
+            new_refresh_token = RefreshTokenService.rotate(payload)
+        else:
+            # Issued before token families; start one
+            revoke_token(payload)
+            new_refresh_token = RefreshTokenService.issue(user.username)
 
+        access_token = create_access_token(subject=payload["sub"])
         return Token(access_token=access_token, refresh_token=new_refresh_token)
 
     @staticmethod
-    def verify_token(token: str) -> Optional[str]:
-        """Verify JWT token and return username"""
-        try:
-            payload = jwt.decode(
-                token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]
-            )
-            username: str = payload.get("sub")
-            token_type: str = payload.get("type")
+    def logout(access_token: str, refresh_token: str) -> None:
+        """Revoke the caller's access token and end the refresh token's family"""
+        access = decode_token(access_token, "access")
+        if access is None:
+            raise UnauthorizedException("Invalid authentication credentials")
+        revoke_token(access)
 
-            if username is None or token_type != "access":
-                return None
+        refresh = decode_token(refresh_token, "refresh")
+        if refresh is not None and refresh["sub"] == access["sub"]:
+            if "fam" in refresh:
+                RefreshTokenService.revoke_family(refresh["fam"])
+            else:
+                revoke_token(refresh)
 
-            return username
-        except JWTError:
-            return None
+    @staticmethod
+    def verify_token(token: str) -> Optional[str]:
+        """Verify JWT token and return username"""
+        payload = decode_token(token, "access")
+        return payload["sub"] if payload else None
@@ -0,0 +1,243 @@
+import gzip
+import hashlib
+import io
+import logging
+from functools import lru_cache
+from typing import Dict, List, Optional
+import orjson
+from fastapi import HTTPException
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+from app.config.settings import settings
+from app.models.exercise import (
+    CatalogSnapshot,
+    Equipment,
+    ExerciseCatalog as Exercise,
+    ExerciseCategory,
+    ExerciseEquipment,
+    ExerciseMovementPattern,
+    ExerciseMuscleGroup,
+    MovementPattern,
+    MuscleGroup,
+)
+from app.services.s3 import S3Service
+
+logger = logging.getLogger(__name__)
+
+BUNDLE_FORMAT = 1
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+EXERCISE_FIELDS = (
+    Exercise.id,
+    Exercise.name,
+    Exercise.description,
+    Exercise.instructions,
+    Exercise.difficulty,
+    Exercise.category_id,
+    Exercise.video_url,
+    Exercise.image_urls,
+    Exercise.mechanics,
+    Exercise.unilateral,
+    Exercise.is_bodyweight,
+    Exercise.default_tempo,
+    Exercise.supports_gps,
+    Exercise.supports_pool,
+    Exercise.supports_hr,
+    Exercise.cadence_metric,
+    Exercise.default_sport_profile,
+    Exercise.updated_at,
+)
+
+LOOKUP_TABLES = {
+    "categories": ExerciseCategory,
+    "muscle_groups": MuscleGroup,
+    "equipment": Equipment,
+    "movement_patterns": MovementPattern,
+}
+
+
+@lru_cache
+def _s3_service() -> S3Service:
+    return S3Service()
+
+
+def _dumps(content) -> bytes:
+    # Sorted keys keep the bytes, and so the version hash, stable
+    return orjson.dumps(content, option=orjson.OPT_SORT_KEYS)
+
+
+def compute_delta(old: dict, new: dict) -> dict:
+    """Per-table rows to upsert and ids to delete to turn `old` into `new`"""
+    tables = {}
+    for table in ("exercises", *LOOKUP_TABLES):
+        old_rows = {row["id"]: row for row in old.get(table, [])}
+        new_rows = {row["id"]: row for row in new.get(table, [])}
+        tables[table] = {
+            "upserted": [row for row_id, row in new_rows.items() if old_rows.get(row_id) != row],
+            "deleted": sorted(row_id for row_id in old_rows if row_id not in new_rows),
+        }
+    return {
+        "format": BUNDLE_FORMAT,
+        "from_version": old["version"],
+        "version": new["version"],
+        "tables": tables,
+    }
+
+
+class CatalogSnapshotService:
+    @staticmethod
+    def build_catalog(db: Session) -> dict:
+        """
+        The system catalog as one normalized, JSON-ready document: lookup
+        tables plus exercises that reference them by id. Rows are sorted by
+        id so identical catalogs serialize identically.
+        """
+        content = {"format": BUNDLE_FORMAT}
+        for table, model in LOOKUP_TABLES.items():
+            content[table] = [
+                dict(row)
+                for row in db.execute(
+                    select(model.id, model.name, model.description).order_by(model.id)
+                ).mappings()
+            ]
+
+        exercises = {
+            row["id"]: {
+                **row,
+                "muscle_group_ids": [],
+                "equipment_ids": [],
+                "movement_pattern_ids": [],
+            }
+            for row in db.execute(
+                select(*EXERCISE_FIELDS)
+                .where(Exercise.is_custom == False)
+                .order_by(Exercise.id)
+            ).mappings()
+        }
+        for field, junction, column in (
+            ("muscle_group_ids", ExerciseMuscleGroup, ExerciseMuscleGroup.muscle_group_id),
+            ("equipment_ids", ExerciseEquipment, ExerciseEquipment.equipment_id),
+            ("movement_pattern_ids", ExerciseMovementPattern, ExerciseMovementPattern.movement_pattern_id),
+        ):
+            for exercise_id, value in db.execute(
+                select(junction.exercise_id, column).order_by(junction.exercise_id, column)
+            ):
+                if exercise_id in exercises:
+                    exercises[exercise_id][field].append(value)
+        content["exercises"] = list(exercises.values())
+
+        # Round-trip so the document holds plain JSON types (str ids, ISO dates),
+        # which is also what older bundles look like when read back for deltas
+        content = orjson.loads(_dumps(content))
+        content["version"] = hashlib.sha256(_dumps(content)).hexdigest()[:16]
+        return content
+
+    @staticmethod
+    def _upload(s3: S3Service, key: str, document: dict) -> int:
+        body = gzip.compress(_dumps(document), mtime=0)
+        s3.upload_fileobj(
+            io.BytesIO(body),
+            key=key,
+            content_type="application/json",
+            cache_control=IMMUTABLE_CACHE_CONTROL,
+            content_encoding="gzip",
+        )
+        return len(body)
+
+    @staticmethod
+    def _download(s3: S3Service, key: str) -> dict:
+        buffer = io.BytesIO()
+        s3.download_fileobj(key, buffer)
+        return orjson.loads(gzip.decompress(buffer.getvalue()))
+
+    @staticmethod
+    def publish(db: Session, s3: Optional[S3Service] = None) -> CatalogSnapshot:
+        """
+        Upload a bundle of the current catalog, plus delta bundles from the
+        last CATALOG_SNAPSHOT_DELTAS versions, and record it as the latest
+        snapshot. A no-op when the catalog hasn't changed; when it reverts to
+        an earlier version, that snapshot becomes the latest again.
+        """
+        s3 = s3 or _s3_service()
+        prefix = settings.CATALOG_SNAPSHOT_PREFIX.strip("/")
+        content = CatalogSnapshotService.build_catalog(db)
+        version = content["version"]
+
+        latest = (
+            db.query(CatalogSnapshot)
+            .order_by(CatalogSnapshot.created_at.desc())
+            .first()
+        )
+        if latest is not None and latest.version == version:
+            return latest
+
+        # A reverted catalog's bundle is already uploaded; only the deltas
+        # to it from newer versions are missing
+        existing = db.get(CatalogSnapshot, version)
+        if existing is None:
+            key = f"{prefix}/{version}.json.gz"
+            size_bytes = CatalogSnapshotService._upload(s3, key, content)
+
+        deltas: Dict[str, dict] = {}
+        previous: List[CatalogSnapshot] = (
+            db.query(CatalogSnapshot)
+            .order_by(CatalogSnapshot.created_at.desc())
+            .limit(settings.CATALOG_SNAPSHOT_DELTAS)
+            .all()
+        )
+        for snapshot in previous:
+            if snapshot.version == version:
+                continue
+            try:
+                old = CatalogSnapshotService._download(s3, snapshot.key)
+            except Exception as e:
+                logger.warning(f"Skipping delta from catalog {snapshot.version}: {str(e)}")
+                continue
+            delta_key = f"{prefix}/deltas/{snapshot.version}-{version}.json.gz"
+            deltas[snapshot.version] = {
+                "key": delta_key,
+                "size_bytes": CatalogSnapshotService._upload(
+                    s3, delta_key, compute_delta(old, content)
+                ),
+            }
+
+        if existing is not None:
+            existing.deltas = deltas
+            existing.created_at = func.now()
+            db.commit()
+            return existing
+
+        db_snapshot = CatalogSnapshot(
+            version=version,
+            key=key,
+            size_bytes=size_bytes,
+            exercise_count=len(content["exercises"]),
+            deltas=deltas,
+        )
+        db.add(db_snapshot)
+        db.commit()
+        return db_snapshot
+
+    @staticmethod
+    def get_manifest(db: Session) -> dict:
+        """Latest snapshot with download URLs for the full and delta bundles"""
+        snapshot = (
+            db.query(CatalogSnapshot)
+            .order_by(CatalogSnapshot.created_at.desc())
+            .first()
+        )
+        if not snapshot:
+            raise HTTPException(status_code=404, detail="No catalog snapshot published")
+
+        s3 = _s3_service()
+        return {
+            "version": snapshot.version,
+            "url": s3.public_url(snapshot.key),
+            "size_bytes": snapshot.size_bytes,
+            "exercise_count": snapshot.exercise_count,
+            "generated_at": snapshot.created_at,
+            "deltas": {
+                from_version: {"url": s3.public_url(delta["key"]), "size_bytes": delta["size_bytes"]}
+                for from_version, delta in snapshot.deltas.items()
+            },
+        }
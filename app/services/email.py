@@ -1,16 +1,39 @@
 from fastapi_mail import FastMail, MessageSchema, ConnectionConfig
 from app.config.settings import settings
+from app.services.email_queue import email_queue
+from email.message import EmailMessage
+from functools import lru_cache
 from pathlib import Path
-from jinja2 import Environment, select_autoescape, PackageLoader
+from jinja2 import Environment, Template, select_autoescape, PackageLoader
 from typing import List, Dict, Any
+import logging
 
-# Email templates directory
+logger = logging.getLogger(__name__)
+
+# Email templates directory. Templates only change on deploy, so skip the
+# per-render mtime check outside of debug mode.
 templates = Environment(
     loader=PackageLoader("app", "templates/email"),
     autoescape=select_autoescape(["html", "xml"]),
+    auto_reload=settings.DEBUG,
 )
 
 
+@lru_cache(maxsize=None)
+def get_template(template_name: str) -> Template:
+    """Get a compiled email template"""
+    return templates.get_template(f"{template_name}.html")
+
+
+def warm_templates() -> None:
+    """Compile every email template up front so the first send doesn't pay for it"""
+    for name in templates.list_templates(extensions=["html"]):
+        try:
+            get_template(name.rsplit(".", 1)[0])
+        except Exception as e:
+            logger.error(f"Error compiling email template {name}: {str(e)}")
+
+
 class EmailService:
     def __init__(self):
         self.conf = ConnectionConfig(
@@ -19,9 +42,9 @@ class EmailService:
             MAIL_FROM=settings.MAIL_FROM,
             MAIL_PORT=settings.MAIL_PORT,
             MAIL_SERVER=settings.MAIL_SERVER,
-            MAIL_STARTTLS=True,
-            MAIL_SSL_TLS=False,
-            USE_CREDENTIALS=True,
+            MAIL_STARTTLS=settings.MAIL_STARTTLS,
+            MAIL_SSL_TLS=settings.MAIL_SSL_TLS,
+            USE_CREDENTIALS=settings.MAIL_USE_CREDENTIALS,
         )
         self.fast_mail = FastMail(self.conf)
 
@@ -32,9 +55,23 @@ class EmailService:
         template_name: str,
         context: Dict[str, Any],
     ) -> None:
-        """Send email using template"""
-        template = templates.get_template(f"{template_name}.html")
-        html = template.render(**context)
+        """
+        Send email using template.
+
+        The message is handed to the outbound queue when its sender is running,
+        so callers don't wait on SMTP. Outside the app (scripts, shell) it falls
+        back to a direct send.
+        """
+        html = get_template(template_name).render(**context)
+
+        if email_queue.is_running:
+            message = EmailMessage()
+            message["Subject"] = subject
+            message["From"] = settings.MAIL_FROM
+            message["To"] = ", ".join(recipients)
+            message.set_content(html, subtype="html")
+            email_queue.enqueue(message)
+            return
 
         message = MessageSchema(
             subject=subject, recipients=recipients, html=html, subtype="html"
@@ -0,0 +1,319 @@
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from email.message import EmailMessage
+from typing import List, Optional
+
+import aiosmtplib
+from prometheus_client.core import REGISTRY, CounterMetricFamily, GaugeMetricFamily
+from app.config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+# Errors that are worth retrying: the connection dropped or the server
+# answered with a 4xx (temporary) reply.
+TRANSIENT_ERRORS = (
+    aiosmtplib.SMTPServerDisconnected,
+    aiosmtplib.SMTPConnectError,
+    aiosmtplib.SMTPTimeoutError,
+    ConnectionError,
+    OSError,
+)
+
+
+@dataclass
+class OutboundEmail:
+    message: EmailMessage
+    enqueued_at: float = field(default_factory=time.monotonic)
+    attempts: int = 0
+
+
+class EmailQueue:
+    """
+    In-process outbound mail queue.
+
+    Request handlers enqueue rendered messages and return immediately. A single
+    background task drains the queue in batches over one persistent SMTP
+    connection, reconnecting when the server drops it and retrying transient
+    failures with exponential backoff.
+    """
+
+    def __init__(
+        self,
+        hostname: Optional[str] = None,
+        port: Optional[int] = None,
+        username: Optional[str] = None,
+        password: Optional[str] = None,
+        start_tls: Optional[bool] = None,
+        use_tls: Optional[bool] = None,
+        use_credentials: Optional[bool] = None,
+        max_size: Optional[int] = None,
+        batch_size: Optional[int] = None,
+        flush_interval: Optional[float] = None,
+        max_retries: Optional[int] = None,
+        retry_backoff: Optional[float] = None,
+        idle_timeout: Optional[float] = None,
+    ):
+        self.hostname = hostname or settings.MAIL_SERVER
+        self.port = port or settings.MAIL_PORT
+        self.username = username if username is not None else settings.MAIL_USERNAME
+        self.password = password if password is not None else settings.MAIL_PASSWORD
+        self.start_tls = settings.MAIL_STARTTLS if start_tls is None else start_tls
+        self.use_tls = settings.MAIL_SSL_TLS if use_tls is None else use_tls
+        self.use_credentials = (
+            settings.MAIL_USE_CREDENTIALS if use_credentials is None else use_credentials
+        )
+        self.max_size = max_size or settings.EMAIL_QUEUE_MAX_SIZE
+        self.batch_size = batch_size or settings.EMAIL_QUEUE_BATCH_SIZE
+        self.flush_interval = (
+            settings.EMAIL_QUEUE_FLUSH_INTERVAL if flush_interval is None else flush_interval
+        )
+        self.max_retries = (
+            settings.EMAIL_QUEUE_MAX_RETRIES if max_retries is None else max_retries
+        )
+        self.retry_backoff = retry_backoff or settings.EMAIL_QUEUE_RETRY_BACKOFF
+        self.idle_timeout = idle_timeout or settings.EMAIL_QUEUE_IDLE_TIMEOUT
+
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        self._smtp: Optional[aiosmtplib.SMTP] = None
+        self._last_used = 0.0
+        self._pending_retries = 0
+
+        # Metrics
+        self.enqueued_total = 0
+        self.sent_total = 0
+        self.failed_total = 0
+        self.retried_total = 0
+        self.dropped_total = 0
+        self.connections_total = 0
+        self.last_latency = 0.0  # seconds from enqueue to accepted by server
+        self.latency_sum = 0.0
+        self.last_batch_duration = 0.0
+
+    @property
+    def is_running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    @property
+    def depth(self) -> int:
+        """Messages waiting to be sent, including scheduled retries"""
+        if self._queue is None:
+            return 0
+        return self._queue.qsize() + self._pending_retries
+
+    def stats(self) -> dict:
+        """Snapshot of queue depth and delivery metrics"""
+        return {
+            "depth": self.depth,
+            "enqueued_total": self.enqueued_total,
+            "sent_total": self.sent_total,
+            "failed_total": self.failed_total,
+            "retried_total": self.retried_total,
+            "dropped_total": self.dropped_total,
+            "connections_total": self.connections_total,
+            "last_latency_seconds": self.last_latency,
+            "avg_latency_seconds": (
+                self.latency_sum / self.sent_total if self.sent_total else 0.0
+            ),
+            "last_batch_duration_seconds": self.last_batch_duration,
+        }
+
+    async def start(self) -> None:
+        """Start the background sender"""
+        if self.is_running:
+            return
+        self._queue = asyncio.Queue(maxsize=self.max_size)
+        self._task = asyncio.create_task(self._run(), name="email-queue-sender")
+
+    async def stop(self, timeout: float = 10.0) -> None:
+        """Flush pending messages (bounded by timeout) and stop the sender"""
+        if not self.is_running:
+            return
+        try:
+            await asyncio.wait_for(self.join(), timeout=timeout)
+        except asyncio.TimeoutError:
+            logger.warning(f"Email queue stopped with {self.depth} unsent messages")
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        await self._disconnect()
+
+    async def join(self) -> None:
+        """Wait until every enqueued message has been sent or given up on"""
+        # Queue.join also covers messages the sender has taken but not yet
+        # sent; retries are scheduled before their batch is marked done
+        while True:
+            await self._queue.join()
+            if not self._pending_retries:
+                return
+            await asyncio.sleep(self.flush_interval)
+
+    def enqueue(self, message: EmailMessage) -> None:
+        """Queue a message for delivery without waiting on SMTP"""
+        if not self.is_running:
+            raise RuntimeError("Email queue is not running")
+        try:
+            self._queue.put_nowait(OutboundEmail(message=message))
+            self.enqueued_total += 1
+        except asyncio.QueueFull:
+            self.dropped_total += 1
+            logger.error(f"Email queue full, dropping message to {message['To']}")
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                item = await asyncio.wait_for(
+                    self._queue.get(), timeout=self.idle_timeout
+                )
+            except asyncio.TimeoutError:
+                await self._disconnect()
+                continue
+
+            batch = [item]
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(
+                        await asyncio.wait_for(self._queue.get(), timeout=remaining)
+                    )
+                except asyncio.TimeoutError:
+                    break
+
+            try:
+                await self._send_batch(batch)
+            except Exception as e:
+                logger.error(f"Unexpected error in email sender: {str(e)}")
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    async def _send_batch(self, batch: List[OutboundEmail]) -> None:
+        started = time.monotonic()
+        for item in batch:
+            item.attempts += 1
+            try:
+                await self._send_one(item.message)
+            except aiosmtplib.SMTPResponseException as e:
+                if 400 <= e.code < 500:
+                    self._schedule_retry(item, e)
+                else:
+                    self.failed_total += 1
+                    logger.error(
+                        f"Permanent SMTP failure for {item.message['To']}: {e.code} {e.message}"
+                    )
+            except TRANSIENT_ERRORS as e:
+                await self._disconnect()
+                self._schedule_retry(item, e)
+            except (aiosmtplib.SMTPException, ValueError) as e:
+                # e.g. every recipient refused, or no recipients at all; only
+                # this message is lost. Reconnect so no half-finished
+                # transaction leaks into the next one.
+                await self._disconnect()
+                self.failed_total += 1
+                logger.error(f"Permanent SMTP failure for {item.message['To']}: {str(e)}")
+            else:
+                now = time.monotonic()
+                self.sent_total += 1
+                self.last_latency = now - item.enqueued_at
+                self.latency_sum += self.last_latency
+        self.last_batch_duration = time.monotonic() - started
+
+    async def _send_one(self, message: EmailMessage) -> None:
+        smtp = await self._connection()
+        await smtp.send_message(message)
+        self._last_used = time.monotonic()
+
+    def _schedule_retry(self, item: OutboundEmail, error: Exception) -> None:
+        if item.attempts > self.max_retries:
+            self.failed_total += 1
+            logger.error(
+                f"Giving up on email to {item.message['To']} after {item.attempts} attempts: {str(error)}"
+            )
+            return
+
+        delay = self.retry_backoff ** (item.attempts - 1)
+        self.retried_total += 1
+        self._pending_retries += 1
+        logger.warning(
+            f"Retrying email to {item.message['To']} in {delay:.1f}s: {str(error)}"
+        )
+
+        def _requeue():
+            self._pending_retries -= 1
+            try:
+                self._queue.put_nowait(item)
+            except asyncio.QueueFull:
+                self.dropped_total += 1
+                logger.error(f"Email queue full, dropping retry to {item.message['To']}")
+
+        asyncio.get_running_loop().call_later(delay, _requeue)
+
+    async def _connection(self) -> aiosmtplib.SMTP:
+        if self._smtp is not None and self._smtp.is_connected:
+            return self._smtp
+
+        smtp = aiosmtplib.SMTP(
+            hostname=self.hostname,
+            port=self.port,
+            use_tls=self.use_tls,
+            start_tls=self.start_tls,
+        )
+        await smtp.connect()
+        if self.use_credentials and self.username:
+            await smtp.login(self.username, self.password)
+        self._smtp = smtp
+        self.connections_total += 1
+        return smtp
+
+    async def _disconnect(self) -> None:
+        if self._smtp is None:
+            return
+        smtp, self._smtp = self._smtp, None
+        try:
+            if smtp.is_connected:
+                await smtp.quit()
+        except Exception:
+            smtp.close()
+
+
+class EmailQueueCollector:
+    """Exposes EmailQueue.stats() to Prometheus at scrape time"""
+
+    COUNTERS = ("enqueued", "sent", "failed", "retried", "dropped", "connections")
+
+    def __init__(self, queue: EmailQueue):
+        self.queue = queue
+
+    def collect(self):
+        stats = self.queue.stats()
+        yield GaugeMetricFamily(
+            "email_queue_depth", "Emails waiting to be sent", value=stats["depth"]
+        )
+        for name in self.COUNTERS:
+            yield CounterMetricFamily(
+                f"email_queue_{name}",
+                f"Emails {name} by the outbound queue",
+                value=stats[f"{name}_total"],
+            )
+        yield GaugeMetricFamily(
+            "email_queue_last_latency_seconds",
+            "Enqueue-to-accepted latency of the most recent email",
+            value=stats["last_latency_seconds"],
+        )
+        yield GaugeMetricFamily(
+            "email_queue_avg_latency_seconds",
+            "Mean enqueue-to-accepted latency",
+            value=stats["avg_latency_seconds"],
+        )
+
+
+email_queue = EmailQueue()
+REGISTRY.register(EmailQueueCollector(email_queue))
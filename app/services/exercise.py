@@ -1,9 +1,22 @@
-from typing import List, Optional
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional
 from fastapi import HTTPException
+from sqlalchemy import func, select
 from sqlalchemy.orm import Session
-from app.models.exercise import Exercise, MuscleGroup, Equipment, ExerciseCategory
+from app.core.cache import exercise_response_cache, workout_response_cache
+from app.db.session import replica_reads
+from app.models.exercise import (
+    ExerciseCatalog as Exercise,
+    MuscleGroup,
+    Equipment,
+    ExerciseCategory,
+    ExerciseEquipment,
+    ExerciseMuscleGroup,
+)
 from app.models.user import User
+from app.models.workout import WorkoutExercise
 from app.schemas.exercise import ExerciseCreate, ExerciseUpdate
+from app.services import row_serializers
 from app.services.plan_limits import PlanLimitService
 from sqlalchemy.exc import IntegrityError
 
@@ -61,7 +74,6 @@ class ExerciseService:
             )
             db.add(db_exercise)
             db.commit()
-            db.refresh(db_exercise)
             return db_exercise
         except IntegrityError:
             db.rollback()
@@ -77,6 +89,69 @@ class ExerciseService:
             raise HTTPException(status_code=404, detail="Exercise not found")
         return exercise
 
+    @staticmethod
+    def get_exercise_version(db: Session, exercise_id: str) -> str:
+        """
+        Cache version of an exercise: its updated_at and that of the
+        category, muscle groups and equipment its response embeds
+        """
+        row = db.execute(
+            select(
+                Exercise.updated_at,
+                ExerciseService.related_updated_at([exercise_id]),
+            ).where(Exercise.id == exercise_id)
+        ).first()
+        if row is None:
+            raise HTTPException(status_code=404, detail="Exercise not found")
+        return ":".join(str(ts.timestamp()) if ts else "-" for ts in row)
+
+    @staticmethod
+    def related_updated_at(exercise_ids):
+        """
+        SQL expression for the latest updated_at among the categories, muscle
+        groups and equipment of exercise_ids (a list or a subquery), so
+        renaming one of them changes the versions of the responses that
+        embed it
+        """
+        category_updated = (
+            select(func.max(ExerciseCategory.updated_at))
+            .join(Exercise, Exercise.category_id == ExerciseCategory.id)
+            .where(Exercise.id.in_(exercise_ids))
+            .scalar_subquery()
+        )
+        muscle_groups_updated = (
+            select(func.max(MuscleGroup.updated_at))
+            .join(ExerciseMuscleGroup, ExerciseMuscleGroup.muscle_group_id == MuscleGroup.id)
+            .where(ExerciseMuscleGroup.exercise_id.in_(exercise_ids))
+            .scalar_subquery()
+        )
+        equipment_updated = (
+            select(func.max(Equipment.updated_at))
+            .join(ExerciseEquipment, ExerciseEquipment.equipment_id == Equipment.id)
+            .where(ExerciseEquipment.exercise_id.in_(exercise_ids))
+            .scalar_subquery()
+        )
+        # GREATEST skips NULLs, e.g. an exercise without equipment
+        return func.greatest(category_updated, muscle_groups_updated, equipment_updated)
+
+    @staticmethod
+    def get_dependent_workout_ids(db: Session, exercise_id) -> List[str]:
+        """Ids of the workouts that embed an exercise"""
+        return [
+            str(workout_id)
+            for workout_id in db.execute(
+                select(WorkoutExercise.workout_id)
+                .where(WorkoutExercise.exercise_id == exercise_id)
+                .distinct()
+            ).scalars()
+        ]
+
+    @staticmethod
+    def invalidate_cached_responses(exercise_id, workout_ids: List[str]) -> None:
+        """Drop cached responses for an exercise and the workouts embedding it"""
+        exercise_response_cache.invalidate(str(exercise_id))
+        workout_response_cache.invalidate(*workout_ids)
+
     @staticmethod
     def update_exercise(
         db: Session, exercise_id: str, exercise_update: ExerciseUpdate, user: User
@@ -129,9 +204,15 @@ class ExerciseService:
         for field, value in update_data.items():
             setattr(db_exercise, field, value)
 
+        # Bump the version even when only the associations changed
+        db_exercise.updated_at = func.now()
+
         try:
             db.commit()
-            db.refresh(db_exercise)
+            ExerciseService.invalidate_cached_responses(
+                db_exercise.id,
+                ExerciseService.get_dependent_workout_ids(db, db_exercise.id),
+            )
             return db_exercise
         except IntegrityError:
             db.rollback()
@@ -156,23 +237,21 @@ class ExerciseService:
                 status_code=403, detail="Not authorized to delete system exercises"
             )
 
+        workout_ids = ExerciseService.get_dependent_workout_ids(db, exercise.id)
         db.delete(exercise)
         db.commit()
+        ExerciseService.invalidate_cached_responses(exercise.id, workout_ids)
 
     @staticmethod
-    def list_exercises(
-        db: Session,
-        skip: int = 0,
-        limit: int = 20,
+    def apply_list_filters(
+        query,
         category_id: Optional[str] = None,
         difficulty: Optional[str] = None,
         equipment_id: Optional[str] = None,
         muscle_group_id: Optional[str] = None,
         include_custom: bool = True,
-    ) -> List[Exercise]:
-        """List exercises with optional filters"""
-        query = db.query(Exercise)
-
+    ):
+        """Apply list_exercises filters to a Query or select()"""
         if category_id:
             query = query.filter(Exercise.category_id == category_id)
 
@@ -190,4 +269,95 @@ class ExerciseService:
         if not include_custom:
             query = query.filter(Exercise.is_custom == False)
 
+        return query
+
+    @staticmethod
+    @replica_reads
+    def list_exercises(
+        db: Session,
+        skip: int = 0,
+        limit: int = 20,
+        category_id: Optional[str] = None,
+        difficulty: Optional[str] = None,
+        equipment_id: Optional[str] = None,
+        muscle_group_id: Optional[str] = None,
+        include_custom: bool = True,
+    ) -> List[Exercise]:
+        """List exercises with optional filters"""
+        query = ExerciseService.apply_list_filters(
+            db.query(Exercise),
+            category_id=category_id,
+            difficulty=difficulty,
+            equipment_id=equipment_id,
+            muscle_group_id=muscle_group_id,
+            include_custom=include_custom,
+        )
         return query.offset(skip).limit(limit).all()
+
+    @staticmethod
+    @replica_reads
+    def list_exercise_dicts(
+        db: Session,
+        skip: int = 0,
+        limit: int = 20,
+        category_id: Optional[str] = None,
+        difficulty: Optional[str] = None,
+        equipment_id: Optional[str] = None,
+        muscle_group_id: Optional[str] = None,
+        include_custom: bool = True,
+    ) -> List[dict]:
+        """list_exercises as response dicts, read from row tuples"""
+        stmt = ExerciseService.apply_list_filters(
+            select(*row_serializers.EXERCISE_COLUMNS, *row_serializers.CATEGORY_COLUMNS)
+            .join(ExerciseCategory, ExerciseCategory.id == Exercise.category_id),
+            category_id=category_id,
+            difficulty=difficulty,
+            equipment_id=equipment_id,
+            muscle_group_id=muscle_group_id,
+            include_custom=include_custom,
+        )
+        rows = db.execute(stmt.offset(skip).limit(limit)).mappings().all()
+        return ExerciseService._build_exercise_dicts(db, rows)
+
+    @staticmethod
+    def get_exercise_dicts(db: Session, exercise_ids: Iterable) -> Dict[str, dict]:
+        """Response dicts for a batch of exercises, keyed by id"""
+        exercise_ids = list(exercise_ids)
+        if not exercise_ids:
+            return {}
+        rows = db.execute(
+            select(*row_serializers.EXERCISE_COLUMNS, *row_serializers.CATEGORY_COLUMNS)
+            .join(ExerciseCategory, ExerciseCategory.id == Exercise.category_id)
+            .where(Exercise.id.in_(exercise_ids))
+        ).mappings().all()
+        return {
+            exercise["id"]: exercise
+            for exercise in ExerciseService._build_exercise_dicts(db, rows)
+        }
+
+    @staticmethod
+    def _build_exercise_dicts(db: Session, rows) -> List[dict]:
+        """Attach muscle groups and equipment with one query each"""
+        exercise_ids = [row["id"] for row in rows]
+        muscle_groups = defaultdict(list)
+        equipment = defaultdict(list)
+        if exercise_ids:
+            for row in db.execute(
+                select(ExerciseMuscleGroup.exercise_id, *row_serializers.MUSCLE_GROUP_COLUMNS)
+                .join(MuscleGroup, MuscleGroup.id == ExerciseMuscleGroup.muscle_group_id)
+                .where(ExerciseMuscleGroup.exercise_id.in_(exercise_ids))
+            ).mappings():
+                muscle_groups[row["exercise_id"]].append(row_serializers.lookup_dict(row))
+            for row in db.execute(
+                select(ExerciseEquipment.exercise_id, *row_serializers.EQUIPMENT_COLUMNS)
+                .join(Equipment, Equipment.id == ExerciseEquipment.equipment_id)
+                .where(ExerciseEquipment.exercise_id.in_(exercise_ids))
+            ).mappings():
+                equipment[row["exercise_id"]].append(row_serializers.lookup_dict(row))
+
+        return [
+            row_serializers.exercise_dict(
+                row, muscle_groups[row["id"]], equipment[row["id"]]
+            )
+            for row in rows
+        ]
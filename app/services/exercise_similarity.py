@@ -0,0 +1,170 @@
+from collections import defaultdict
+from typing import Dict, List, Optional, Tuple
+from uuid import UUID
+import numpy as np
+from sqlalchemy import delete, exists, insert, select
+from sqlalchemy.orm import Session
+from app.db.session import replica_reads
+from app.models.exercise import (
+    ExerciseCatalog as Exercise,
+    ExerciseEquipment,
+    ExerciseMovementPattern,
+    ExerciseMuscleGroup,
+    ExerciseSimilarity,
+)
+from app.services.exercise import ExerciseService
+
+# Neighbours kept per exercise; generous so equipment filtering still leaves
+# enough candidates
+TOP_K = 50
+
+# How much each attribute family contributes to similarity
+FEATURE_WEIGHTS = {
+    "movement_pattern": 1.5,
+    "muscle_group": 1.0,
+    "equipment": 0.5,
+    "category": 0.5,
+    "mechanics": 0.5,
+    "difficulty": 0.25,
+    "unilateral": 0.25,
+}
+
+_ROW_CHUNK = 512
+
+
+def top_k_neighbours(features: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Cosine top-k for every row of features, excluding the row itself.
+
+    Returns (indices, scores), each of shape (n, min(k, n - 1)), ordered by
+    descending score. Rows are processed in chunks to bound memory.
+    """
+    n = features.shape[0]
+    k = min(k, n - 1)
+    if k <= 0:
+        return np.empty((n, 0), dtype=np.int64), np.empty((n, 0), dtype=np.float32)
+
+    norms = np.linalg.norm(features, axis=1, keepdims=True)
+    unit = features / np.where(norms == 0, 1, norms)
+
+    indices = np.empty((n, k), dtype=np.int64)
+    scores = np.empty((n, k), dtype=np.float32)
+    for start in range(0, n, _ROW_CHUNK):
+        stop = min(start + _ROW_CHUNK, n)
+        sims = unit[start:stop] @ unit.T
+        sims[np.arange(stop - start), np.arange(start, stop)] = -np.inf
+
+        top = np.argpartition(-sims, k - 1, axis=1)[:, :k]
+        top_scores = np.take_along_axis(sims, top, axis=1)
+        order = np.argsort(-top_scores, axis=1, kind="stable")
+        indices[start:stop] = np.take_along_axis(top, order, axis=1)
+        scores[start:stop] = np.take_along_axis(top_scores, order, axis=1)
+    return indices, scores
+
+
+class ExerciseSimilarityService:
+    @staticmethod
+    def _feature_matrix(db: Session) -> Tuple[List, np.ndarray]:
+        """One weighted one-hot vector per system exercise"""
+        rows = db.execute(
+            select(
+                Exercise.id,
+                Exercise.category_id,
+                Exercise.mechanics,
+                Exercise.difficulty,
+                Exercise.unilateral,
+            ).where(Exercise.is_custom == False)
+        ).all()
+        exercise_ids = [row.id for row in rows]
+        position = {exercise_id: i for i, exercise_id in enumerate(exercise_ids)}
+
+        features: Dict[int, List[Tuple[str, object]]] = defaultdict(list)
+        for row in rows:
+            i = position[row.id]
+            features[i].append(("category", row.category_id))
+            features[i].append(("mechanics", row.mechanics))
+            features[i].append(("difficulty", row.difficulty))
+            if row.unilateral:
+                features[i].append(("unilateral", True))
+
+        for family, junction, column in (
+            ("muscle_group", ExerciseMuscleGroup, ExerciseMuscleGroup.muscle_group_id),
+            ("equipment", ExerciseEquipment, ExerciseEquipment.equipment_id),
+            ("movement_pattern", ExerciseMovementPattern, ExerciseMovementPattern.movement_pattern_id),
+        ):
+            for exercise_id, value in db.execute(select(junction.exercise_id, column)):
+                if exercise_id in position:
+                    features[position[exercise_id]].append((family, value))
+
+        vocabulary: Dict[Tuple[str, object], int] = {}
+        for values in features.values():
+            for feature in values:
+                vocabulary.setdefault(feature, len(vocabulary))
+
+        matrix = np.zeros((len(exercise_ids), len(vocabulary)), dtype=np.float32)
+        for i, values in features.items():
+            for feature in values:
+                matrix[i, vocabulary[feature]] = FEATURE_WEIGHTS[feature[0]]
+        return exercise_ids, matrix
+
+    @staticmethod
+    def rebuild(db: Session, top_k: int = TOP_K) -> int:
+        """Recompute the neighbour table for the system catalog; returns rows written"""
+        exercise_ids, matrix = ExerciseSimilarityService._feature_matrix(db)
+        indices, scores = top_k_neighbours(matrix, top_k)
+
+        rows = [
+            {
+                "exercise_id": exercise_id,
+                "rank": rank,
+                "similar_exercise_id": exercise_ids[neighbour],
+                "score": float(score),
+            }
+            for exercise_id, neighbours, neighbour_scores in zip(exercise_ids, indices, scores)
+            for rank, (neighbour, score) in enumerate(zip(neighbours, neighbour_scores), start=1)
+            if score > 0
+        ]
+
+        db.execute(delete(ExerciseSimilarity))
+        if rows:
+            db.execute(insert(ExerciseSimilarity), rows)
+        db.commit()
+        return len(rows)
+
+    @staticmethod
+    @replica_reads
+    def get_alternatives(
+        db: Session,
+        exercise_id: str,
+        equipment_ids: Optional[List[UUID]] = None,
+        limit: int = 10
+    ) -> List[dict]:
+        """
+        Nearest precomputed neighbours of an exercise. With equipment_ids,
+        only exercises whose required equipment is all in that set (or that
+        need none) are returned.
+        """
+        ExerciseService.get_exercise(db, exercise_id)
+
+        stmt = (
+            select(ExerciseSimilarity.similar_exercise_id, ExerciseSimilarity.score)
+            .where(ExerciseSimilarity.exercise_id == exercise_id)
+            .order_by(ExerciseSimilarity.rank)
+            .limit(limit)
+        )
+        if equipment_ids is not None:
+            stmt = stmt.where(
+                ~exists().where(
+                    ExerciseEquipment.exercise_id == ExerciseSimilarity.similar_exercise_id,
+                    ExerciseEquipment.equipment_id.notin_(equipment_ids),
+                )
+            )
+
+        neighbours = db.execute(stmt).all()
+        catalog = ExerciseService.get_exercise_dicts(
+            db, [neighbour.similar_exercise_id for neighbour in neighbours]
+        )
+        return [
+            {"exercise": catalog[neighbour.similar_exercise_id], "score": neighbour.score}
+            for neighbour in neighbours
+        ]
@@ -0,0 +1,304 @@
+import io
+import logging
+import uuid
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from itertools import groupby
+from typing import Dict, Iterator, List, Optional
+import orjson
+import pyarrow as pa
+import pyarrow.parquet as pq
+from botocore.exceptions import BotoCoreError, ClientError
+from fastapi import HTTPException
+from sqlalchemy import delete, func, select, tuple_, update
+from sqlalchemy.orm import Session
+from app.config.settings import settings
+from app.core.cache import ResponseCache
+from app.models.user import User
+from app.models.workout import ExerciseSet, WorkoutSession, WorkoutStatus
+from app.services.s3 import S3Service
+
+logger = logging.getLogger(__name__)
+
+SET_SCHEMA = pa.schema([
+    ("id", pa.string()),
+    ("workout_session_id", pa.string()),
+    ("workout_exercise_id", pa.string()),
+    ("set_number", pa.int32()),
+    ("reps", pa.int32()),
+    ("weight", pa.float64()),
+    ("duration", pa.int32()),
+    ("rpe", pa.int32()),
+    ("notes", pa.string()),
+    ("created_at", pa.timestamp("us", tz="UTC")),
+    ("updated_at", pa.timestamp("us", tz="UTC")),
+])
+
+SET_COLUMNS = [ExerciseSet.__table__.c[name] for name in SET_SCHEMA.names]
+SESSION_COLUMNS = [
+    column for column in WorkoutSession.__table__.c
+    if column.name not in ("archived_at", "archive_key")
+]
+
+EXPORT_BATCH_SIZE = 200
+
+# Archive keys are never rewritten (a merge writes a new object), so cached
+# files never go stale
+archive_cache = ResponseCache(
+    "history_archive",
+    local_size=settings.HISTORY_ARCHIVE_CACHE_LOCAL_SIZE,
+    local_ttl=settings.HISTORY_ARCHIVE_CACHE_TTL,
+    redis_ttl=settings.HISTORY_ARCHIVE_CACHE_TTL,
+)
+ARCHIVE_VERSION = "1"
+
+
+@lru_cache
+def _s3_service() -> S3Service:
+    return S3Service(bucket=settings.HISTORY_ARCHIVE_BUCKET)
+
+
+def archive_key(user_id, month: datetime) -> str:
+    """A new, never reused key for one user's month of archived sets"""
+    return (
+        f"{settings.HISTORY_ARCHIVE_PREFIX}/{user_id}/"
+        f"{month:%Y-%m}-{uuid.uuid4().hex[:12]}.parquet"
+    )
+
+
+def sets_to_parquet(rows: List[dict]) -> bytes:
+    table = pa.Table.from_pylist(
+        [
+            {
+                **row,
+                "id": str(row["id"]),
+                "workout_session_id": str(row["workout_session_id"]),
+                "workout_exercise_id": str(row["workout_exercise_id"]),
+            }
+            for row in rows
+        ],
+        schema=SET_SCHEMA,
+    )
+    buffer = io.BytesIO()
+    pq.write_table(table, buffer, compression="zstd")
+    return buffer.getvalue()
+
+
+def sets_from_parquet(body: bytes) -> List[dict]:
+    return pq.read_table(io.BytesIO(body)).to_pylist()
+
+
+def merge_sets(existing: List[dict], added: List[dict]) -> List[dict]:
+    """
+    Combine a month's archived sets with newly archived ones. Sets already
+    in the file (left there by a run that uploaded but failed to commit)
+    are replaced rather than duplicated.
+    """
+    added_ids = {str(row["id"]) for row in added}
+    rows = [row for row in existing if row["id"] not in added_ids] + added
+    return sorted(rows, key=lambda row: (str(row["workout_session_id"]), row["set_number"]))
+
+
+def _session_dict(session: WorkoutSession, sets: List[dict]) -> dict:
+    return {
+        **{column.key: getattr(session, column.key) for column in SESSION_COLUMNS},
+        "exercise_sets": sets,
+    }
+
+
+class HistoryArchiveService:
+    """
+    Moves the sets of old completed sessions out of Postgres into Parquet
+    files, one per user and month, in HISTORY_ARCHIVE_BUCKET.
+
+    Each session keeps its row as a stub (summary columns plus archive_key),
+    so listing history never touches the archive. Reading an archived
+    session's sets streams its month's file from S3 once and then serves it
+    from archive_cache.
+    """
+
+    @staticmethod
+    def load_sets(key: str) -> Dict[str, List[dict]]:
+        """Archived sets in a file, by session id"""
+        cached = archive_cache.get(key, ARCHIVE_VERSION)
+        if cached is not None:
+            body = cached.body
+        else:
+            try:
+                stream, _, _ = _s3_service().get_object_stream(key)
+                buffer = io.BytesIO()
+                for chunk in stream.iter_chunks():
+                    buffer.write(chunk)
+                body = buffer.getvalue()
+            except (BotoCoreError, ClientError) as e:
+                logger.error(f"Could not read history archive {key}: {str(e)}")
+                raise HTTPException(
+                    status_code=503, detail="Archived history is temporarily unavailable"
+                )
+            archive_cache.set(key, ARCHIVE_VERSION, body)
+
+        return {
+            session_id: list(rows)
+            for session_id, rows in groupby(
+                sets_from_parquet(body), key=lambda row: row["workout_session_id"]
+            )
+        }
+
+    @staticmethod
+    def session_with_sets(session: WorkoutSession) -> dict:
+        """An archived session shaped like the WorkoutSession response"""
+        sets = HistoryArchiveService.load_sets(session.archive_key)
+        return _session_dict(session, sets.get(str(session.id), []))
+
+    @staticmethod
+    def export_sessions(db: Session, user: User) -> Iterator[bytes]:
+        """
+        Every session of the user with its sets, oldest first, as NDJSON
+        lines. Live sets are fetched a batch of sessions at a time; archived
+        ones from their month's file, which consecutive sessions share.
+        """
+        loaded_key, loaded_sets = None, {}
+        after = None
+        while True:
+            query = select(WorkoutSession).where(WorkoutSession.user_id == user.id)
+            if after is not None:
+                query = query.where(tuple_(WorkoutSession.created_at, WorkoutSession.id) > after)
+            sessions = db.execute(
+                query.order_by(WorkoutSession.created_at, WorkoutSession.id)
+                .limit(EXPORT_BATCH_SIZE)
+            ).scalars().all()
+            if not sessions:
+                return
+            after = (sessions[-1].created_at, sessions[-1].id)
+
+            live_ids = [s.id for s in sessions if s.archive_key is None]
+            live_sets: Dict[str, List[dict]] = {}
+            if live_ids:
+                rows = db.execute(
+                    select(*SET_COLUMNS)
+                    .where(
+                        ExerciseSet.workout_session_id.in_(live_ids),
+                        # Sets are never older than their session
+                        ExerciseSet.created_at >= sessions[0].created_at,
+                    )
+                    .order_by(ExerciseSet.workout_session_id, ExerciseSet.set_number)
+                ).mappings()
+                for row in rows:
+                    live_sets.setdefault(str(row["workout_session_id"]), []).append(dict(row))
+
+            for session in sessions:
+                if session.archive_key is None:
+                    sets = live_sets.get(str(session.id), [])
+                else:
+                    if session.archive_key != loaded_key:
+                        loaded_key = session.archive_key
+                        loaded_sets = HistoryArchiveService.load_sets(loaded_key)
+                    sets = loaded_sets.get(str(session.id), [])
+                yield orjson.dumps(_session_dict(session, sets)) + b"\n"
+                db.expunge(session)
+
+    @staticmethod
+    def archive_month(
+        db: Session, user_id, month_start: datetime, month_end: datetime, cutoff: datetime
+    ) -> int:
+        """Archive one user's eligible sessions created in [month_start, month_end)"""
+        sessions = db.execute(
+            select(WorkoutSession)
+            .where(
+                WorkoutSession.user_id == user_id,
+                WorkoutSession.status == WorkoutStatus.COMPLETED,
+                WorkoutSession.archived_at.is_(None),
+                WorkoutSession.created_at >= month_start,
+                WorkoutSession.created_at < min(month_end, cutoff),
+            )
+            .with_for_update(skip_locked=True)
+        ).scalars().all()
+        if not sessions:
+            db.rollback()
+            return 0
+        session_ids = [session.id for session in sessions]
+        set_filter = (
+            ExerciseSet.workout_session_id.in_(session_ids),
+            ExerciseSet.created_at >= month_start,
+        )
+        added = [dict(row) for row in db.execute(select(*SET_COLUMNS).where(*set_filter)).mappings()]
+
+        # Sessions completed after their month was archived join its file
+        previous_key = db.execute(
+            select(WorkoutSession.archive_key).where(
+                WorkoutSession.user_id == user_id,
+                WorkoutSession.archive_key.is_not(None),
+                WorkoutSession.created_at >= month_start,
+                WorkoutSession.created_at < month_end,
+            ).limit(1)
+        ).scalar()
+        existing = []
+        if previous_key:
+            existing = [
+                row
+                for rows in HistoryArchiveService.load_sets(previous_key).values()
+                for row in rows
+            ]
+
+        s3 = _s3_service()
+        key = archive_key(user_id, month_start)
+        s3.upload_fileobj(
+            io.BytesIO(sets_to_parquet(merge_sets(existing, added))),
+            key=key,
+            content_type="application/vnd.apache.parquet",
+        )
+        try:
+            db.execute(
+                update(WorkoutSession)
+                .where(WorkoutSession.id.in_(session_ids))
+                .values(archived_at=func.now(), archive_key=key)
+            )
+            if previous_key:
+                db.execute(
+                    update(WorkoutSession)
+                    .where(WorkoutSession.archive_key == previous_key)
+                    .values(archive_key=key)
+                )
+            db.execute(delete(ExerciseSet).where(*set_filter))
+            db.commit()
+        except Exception:
+            db.rollback()
+            s3.delete(key)
+            raise
+
+        if previous_key:
+            try:
+                s3.delete(previous_key)
+            except (BotoCoreError, ClientError) as e:
+                logger.warning(f"Could not delete replaced archive {previous_key}: {str(e)}")
+        logger.info(f"Archived {len(sessions)} sessions ({len(added)} sets) to {key}")
+        return len(sessions)
+
+    @staticmethod
+    def archive(db: Session, older_than_days: Optional[int] = None) -> int:
+        """Archive completed sessions older than the horizon; returns how many"""
+        if not settings.HISTORY_ARCHIVE_BUCKET:
+            raise RuntimeError("HISTORY_ARCHIVE_BUCKET is not set")
+        if older_than_days is None:
+            older_than_days = settings.HISTORY_ARCHIVE_AFTER_DAYS
+        cutoff = datetime.now(timezone.utc) - timedelta(days=older_than_days)
+
+        month = func.date_trunc("month", WorkoutSession.created_at)
+        user_months = db.execute(
+            select(WorkoutSession.user_id, month, month + func.make_interval(0, 1))
+            .where(
+                WorkoutSession.status == WorkoutStatus.COMPLETED,
+                WorkoutSession.archived_at.is_(None),
+                WorkoutSession.created_at < cutoff,
+            )
+            .group_by(WorkoutSession.user_id, month)
+            .order_by(month, WorkoutSession.user_id)
+        ).all()
+        db.rollback()
+
+        archived = 0
+        for user_id, month_start, month_end in user_months:
+            archived += HistoryArchiveService.archive_month(
+                db, user_id, month_start, month_end, cutoff
+            )
+        return archived
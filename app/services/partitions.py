@@ -0,0 +1,196 @@
+import logging
+import re
+from datetime import date
+from typing import List, Optional, Tuple
+from sqlalchemy import text
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+from app.config.settings import settings
+from app.db.session import SessionLocal
+
+logger = logging.getLogger(__name__)
+
+# Tables range-partitioned by month on created_at
+PARTITIONED_TABLES = ("exercise_sets",)
+
+_PARTITION_SUFFIX = re.compile(r"_p(\d{4})_(\d{2})$")
+
+
+def month_start(day: date) -> date:
+    return day.replace(day=1)
+
+
+def add_months(month: date, months: int) -> date:
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(table: str, month: date) -> str:
+    return f"{table}_p{month.year:04d}_{month.month:02d}"
+
+
+def default_partition_name(table: str) -> str:
+    return f"{table}_default"
+
+
+class PartitionService:
+    """
+    Maintenance for the monthly range partitions.
+
+    Creating a partition locks the parent table briefly, so partitions are
+    made ahead of time rather than on demand, and a month that already has
+    one is skipped without touching the parent. Rows for a month without a
+    partition (a lapsed maintenance run, backdated imports) land in the
+    DEFAULT partition and are moved out once their month's partition is
+    created. Cold partitions are detached CONCURRENTLY, which doesn't block
+    inserts or reads of the hot months, and kept as plain tables in the
+    archive schema.
+    """
+
+    @staticmethod
+    def _child_names(db: Session, table: str) -> List[str]:
+        return db.execute(
+            text(
+                "SELECT child.relname FROM pg_inherits "
+                "JOIN pg_class parent ON parent.oid = pg_inherits.inhparent "
+                "JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+                "WHERE parent.oid = CAST(:table AS regclass)"
+            ),
+            {"table": table},
+        ).scalars().all()
+
+    @staticmethod
+    def list_partitions(db: Session, table: str) -> List[Tuple[str, date]]:
+        """(name, month) of the table's attached monthly partitions, oldest first"""
+        partitions = []
+        for name in PartitionService._child_names(db, table):
+            match = _PARTITION_SUFFIX.search(name)
+            if match:
+                partitions.append((name, date(int(match[1]), int(match[2]), 1)))
+        return sorted(partitions, key=lambda partition: partition[1])
+
+    @staticmethod
+    def ensure_partitions(
+        db: Session,
+        table: str,
+        months_ahead: Optional[int] = None,
+        today: Optional[date] = None,
+    ) -> List[str]:
+        """
+        Create the missing partitions from this month to months_ahead, and
+        the DEFAULT partition if there is none; returns their names
+        """
+        if months_ahead is None:
+            months_ahead = settings.PARTITION_MONTHS_AHEAD
+        current = month_start(today or date.today())
+        default = default_partition_name(table)
+        created = []
+        if default not in PartitionService._child_names(db, table):
+            db.execute(text(f"CREATE TABLE IF NOT EXISTS {default} PARTITION OF {table} DEFAULT"))
+            created.append(default)
+        existing = {month for _, month in PartitionService.list_partitions(db, table)}
+
+        for offset in range(months_ahead + 1):
+            month = add_months(current, offset)
+            if month in existing:
+                continue
+            PartitionService._create_partition(db, table, month)
+            created.append(partition_name(table, month))
+        db.commit()
+
+        for name in created:
+            logger.info(f"Created partition {name}")
+        return created
+
+    @staticmethod
+    def _create_partition(db: Session, table: str, month: date) -> None:
+        """
+        Create one month's partition. A new partition may not overlap rows
+        already in the DEFAULT partition, so any are moved across with the
+        default briefly detached.
+        """
+        name = partition_name(table, month)
+        default = default_partition_name(table)
+        lower, upper = month.isoformat(), add_months(month, 1).isoformat()
+        in_month = f"created_at >= '{lower}' AND created_at < '{upper}'"
+        bounds = f"FOR VALUES FROM ('{lower}') TO ('{upper}')"
+
+        stranded = db.execute(text(f"SELECT EXISTS (SELECT 1 FROM {default} WHERE {in_month})")).scalar()
+        if not stranded:
+            db.execute(text(f"CREATE TABLE IF NOT EXISTS {name} PARTITION OF {table} {bounds}"))
+            return
+
+        db.execute(text(f"ALTER TABLE {table} DETACH PARTITION {default}"))
+        db.execute(text(f"CREATE TABLE {name} PARTITION OF {table} {bounds}"))
+        moved = db.execute(
+            text(f"WITH moved AS (DELETE FROM {default} WHERE {in_month} RETURNING *) "
+                 f"INSERT INTO {name} SELECT * FROM moved")
+        ).rowcount
+        db.execute(text(f"ALTER TABLE {table} ATTACH PARTITION {default} DEFAULT"))
+        logger.warning(f"Moved {moved} rows from {default} into {name}")
+
+    @staticmethod
+    def detach_cold_partitions(
+        db: Session,
+        table: str,
+        retention_months: Optional[int] = None,
+        today: Optional[date] = None,
+    ) -> List[str]:
+        """
+        Detach partitions whose month ended more than retention_months ago
+        and move them into the archive schema; returns their names
+        """
+        if retention_months is None:
+            retention_months = settings.PARTITION_RETENTION_MONTHS
+        if retention_months is None:
+            return []
+        cutoff = add_months(month_start(today or date.today()), -retention_months)
+        cold = [
+            name for name, month in PartitionService.list_partitions(db, table)
+            if month < cutoff
+        ]
+        db.commit()
+        if not cold:
+            return []
+
+        schema = settings.PARTITION_ARCHIVE_SCHEMA
+        # DETACH ... CONCURRENTLY can't run inside a transaction block
+        with db.get_bind().connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+            conn.execute(text(f"CREATE SCHEMA IF NOT EXISTS {schema}"))
+            # An interrupted concurrent detach leaves the partition pending
+            pending = set(conn.execute(
+                text(
+                    "SELECT inhrelid::regclass::text FROM pg_inherits "
+                    "WHERE inhparent = CAST(:table AS regclass) AND inhdetachpending"
+                ),
+                {"table": table},
+            ).scalars())
+            for name in cold:
+                mode = "FINALIZE" if name in pending else "CONCURRENTLY"
+                conn.execute(text(f"ALTER TABLE {table} DETACH PARTITION {name} {mode}"))
+                conn.execute(text(f"ALTER TABLE {name} SET SCHEMA {schema}"))
+                logger.info(f"Detached partition {name} into {schema}")
+        return cold
+
+    @staticmethod
+    def maintain(db: Session, today: Optional[date] = None) -> dict:
+        """Create upcoming and detach cold partitions of every partitioned table"""
+        result = {}
+        for table in PARTITIONED_TABLES:
+            result[table] = {
+                "created": PartitionService.ensure_partitions(db, table, today=today),
+                "detached": PartitionService.detach_cold_partitions(db, table, today=today),
+            }
+        return result
+
+
+def ensure_upcoming_partitions() -> None:
+    """Startup hook: make sure inserts for the coming months have a partition"""
+    db = SessionLocal()
+    try:
+        for table in PARTITIONED_TABLES:
+            PartitionService.ensure_partitions(db, table)
+    except SQLAlchemyError as e:
+        logger.error(f"Could not create upcoming partitions: {str(e)}")
+    finally:
+        db.close()
@@ -0,0 +1,199 @@
+import uuid
+from typing import List, Optional, Tuple
+from sqlalchemy import Float, and_, case, cast, func, literal, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+from app.db.session import replica_reads
+from app.models.workout import (
+    ExerciseSet, PersonalRecord, PersonalRecordType,
+    WorkoutExercise, WorkoutSession
+)
+from app.models.user import User
+
+# Epley overestimates badly past ~12 reps, so higher-rep sets don't count
+EPLEY_MAX_REPS = 12
+
+
+def estimated_1rm(weight: float, reps: int) -> float:
+    """Epley estimate; a single is its own 1RM"""
+    return weight if reps == 1 else weight * (1 + reps / 30)
+
+
+def candidate_records(
+    weight: Optional[float], reps: Optional[int]
+) -> List[Tuple[PersonalRecordType, float, float]]:
+    """(record_type, scope_weight, value) a set could claim"""
+    if not reps or reps < 1:
+        return []
+    weight = weight or 0.0
+    candidates = [(PersonalRecordType.MAX_REPS_AT_WEIGHT, weight, float(reps))]
+    if weight > 0:
+        candidates.append((PersonalRecordType.MAX_WEIGHT, 0.0, weight))
+        candidates.append((PersonalRecordType.MAX_VOLUME, 0.0, weight * reps))
+        if reps <= EPLEY_MAX_REPS:
+            candidates.append((PersonalRecordType.ESTIMATED_1RM, 0.0, estimated_1rm(weight, reps)))
+    return candidates
+
+
+def _record_expressions(weight, reps):
+    """SQL mirror of candidate_records: record_type -> (scope_weight, value, condition)"""
+    reps_float = cast(reps, Float)
+    loaded = and_(weight > 0, reps >= 1)
+    return {
+        PersonalRecordType.MAX_REPS_AT_WEIGHT: (
+            func.coalesce(weight, 0.0), reps_float, reps >= 1
+        ),
+        PersonalRecordType.MAX_WEIGHT: (literal(0.0), weight, loaded),
+        PersonalRecordType.MAX_VOLUME: (literal(0.0), weight * reps_float, loaded),
+        PersonalRecordType.ESTIMATED_1RM: (
+            literal(0.0),
+            case((reps == 1, weight), else_=weight * (1 + reps_float / 30)),
+            and_(loaded, reps <= EPLEY_MAX_REPS),
+        ),
+    }
+
+
+def _upsert(stmt):
+    """Replace a stored record only when the new value beats it"""
+    table = PersonalRecord.__table__
+    return stmt.on_conflict_do_update(
+        constraint="uq_personal_records_user_exercise_type_scope",
+        set_={
+            "value": stmt.excluded.value,
+            "weight": stmt.excluded.weight,
+            "reps": stmt.excluded.reps,
+            "exercise_set_id": stmt.excluded.exercise_set_id,
+            "workout_session_id": stmt.excluded.workout_session_id,
+            "achieved_at": stmt.excluded.achieved_at,
+            "updated_at": func.now(),
+        },
+        where=table.c.value < stmt.excluded.value,
+    )
+
+
+class PersonalRecordService:
+    @staticmethod
+    def update_from_set(
+        db: Session,
+        exercise_set: ExerciseSet,
+        exercise_id,
+        user_id
+    ) -> List[PersonalRecord]:
+        """
+        Fold a newly recorded set into the user's records with one upsert.
+
+        The comparison against the stored bests happens in the ON CONFLICT
+        clause, and RETURNING yields only the rows that were inserted or
+        beaten, i.e. the new PRs. Runs inside the caller's transaction.
+        """
+        candidates = candidate_records(exercise_set.weight, exercise_set.reps)
+        if not candidates:
+            return []
+
+        stmt = pg_insert(PersonalRecord.__table__).values([
+            {
+                "id": uuid.uuid4(),
+                "user_id": user_id,
+                "exercise_id": exercise_id,
+                "record_type": record_type,
+                "scope_weight": scope_weight,
+                "value": value,
+                "weight": exercise_set.weight,
+                "reps": exercise_set.reps,
+                "exercise_set_id": exercise_set.id,
+                "workout_session_id": exercise_set.workout_session_id,
+                "achieved_at": exercise_set.created_at,
+            }
+            for record_type, scope_weight, value in candidates
+        ])
+        stmt = _upsert(stmt).returning(*PersonalRecord.__table__.c)
+        return db.scalars(select(PersonalRecord).from_statement(stmt)).all()
+
+    @staticmethod
+    @replica_reads
+    def list_records(
+        db: Session,
+        user: User,
+        exercise_id: Optional[str] = None
+    ) -> List[PersonalRecord]:
+        """A user's records, optionally for one exercise"""
+        query = db.query(PersonalRecord).filter(PersonalRecord.user_id == user.id)
+        if exercise_id:
+            query = query.filter(PersonalRecord.exercise_id == exercise_id)
+        return query.order_by(
+            PersonalRecord.exercise_id,
+            PersonalRecord.record_type,
+            PersonalRecord.scope_weight
+        ).all()
+
+    @staticmethod
+    def backfill(db: Session, user_id: Optional[str] = None) -> int:
+        """
+        Rebuild records from existing exercise sets, one set-based
+        INSERT ... SELECT DISTINCT ON per record type. Existing records are
+        only replaced when history beats them, so it is safe to re-run.
+        Returns the number of records written.
+        """
+        sets = ExerciseSet.__table__
+        sessions = WorkoutSession.__table__
+        workout_exercises = WorkoutExercise.__table__
+
+        source = (
+            select(
+                sessions.c.user_id,
+                workout_exercises.c.exercise_id,
+                sets.c.id.label("exercise_set_id"),
+                sets.c.workout_session_id,
+                sets.c.weight,
+                sets.c.reps,
+                sets.c.created_at.label("achieved_at"),
+            )
+            .join_from(sets, sessions, sessions.c.id == sets.c.workout_session_id)
+            .join(workout_exercises, workout_exercises.c.id == sets.c.workout_exercise_id)
+        )
+        if user_id:
+            source = source.where(sessions.c.user_id == user_id)
+        source = source.subquery("source")
+
+        record_type_column = PersonalRecord.__table__.c.record_type
+        written = 0
+        for record_type, (scope_weight, value, condition) in _record_expressions(
+            source.c.weight, source.c.reps
+        ).items():
+            best = (
+                select(
+                    func.gen_random_uuid(),
+                    source.c.user_id,
+                    source.c.exercise_id,
+                    literal(record_type, record_type_column.type),
+                    scope_weight,
+                    value,
+                    source.c.weight,
+                    source.c.reps,
+                    source.c.exercise_set_id,
+                    source.c.workout_session_id,
+                    source.c.achieved_at,
+                )
+                .where(condition)
+                .distinct(source.c.user_id, source.c.exercise_id, scope_weight)
+                .order_by(
+                    source.c.user_id,
+                    source.c.exercise_id,
+                    scope_weight,
+                    value.desc(),
+                    source.c.achieved_at,
+                )
+            )
+            stmt = _upsert(
+                pg_insert(PersonalRecord.__table__).from_select(
+                    [
+                        "id", "user_id", "exercise_id", "record_type", "scope_weight",
+                        "value", "weight", "reps", "exercise_set_id",
+                        "workout_session_id", "achieved_at",
+                    ],
+                    best,
+                )
+            )
+            written += db.execute(stmt).rowcount
+            db.commit()
+        return written
@@ -1,23 +1,22 @@
 from typing import Optional
 from fastapi import HTTPException
 from sqlalchemy.orm import Session
-from app.models.subscription import PLAN_FEATURES, PlanType
+from app.core.request_context import current_plan_type
+from app.models.subscription import PLAN_FEATURES
 from app.models.user import User
-from app.services.user import UserService
+from app.models.workout import Workout, WorkoutPlan
 
 class PlanLimitService:
     @staticmethod
     def check_custom_exercise_permission(db: Session, user: User) -> bool:
         """Check if user can create custom exercises"""
-        subscription = UserService.get_active_subscription(db, user.id)
-        plan_type = PlanType.FREE if not subscription else subscription.plan.type
+        plan_type = current_plan_type(db, user)
         return PLAN_FEATURES[plan_type]["custom_exercises"]
 
     @staticmethod
-    def check_workout_limit(db: Session, user: User) -> None:
-        """Check if user has reached their workout limit"""
-        subscription = UserService.get_active_subscription(db, user.id)
-        plan_type = PlanType.FREE if not subscription else subscription.plan.type
+    def check_workout_limit(db: Session, user: User, additional: int = 1) -> None:
+        """Check if user can create `additional` more workouts"""
+        plan_type = current_plan_type(db, user)
         max_workouts = PLAN_FEATURES[plan_type]["max_workouts"]
         
         if max_workouts != -1:  # -1 means unlimited
@@ -26,7 +25,7 @@ class PlanLimitService:
                 Workout.is_template == False
             ).count()
             
-            if current_workouts >= max_workouts:
+            if current_workouts + additional > max_workouts:
                 raise HTTPException(
                     status_code=402,
                     detail=f"Workout limit reached. Upgrade your plan to create more workouts."
@@ -35,8 +34,7 @@ class PlanLimitService:
     @staticmethod
     def check_plan_limit(db: Session, user: User) -> None:
         """Check if user has reached their workout plan limit"""
-        subscription = UserService.get_active_subscription(db, user.id)
-        plan_type = PlanType.FREE if not subscription else subscription.plan.type
+        plan_type = current_plan_type(db, user)
         max_plans = PLAN_FEATURES[plan_type]["max_plans"]
         
         if max_plans != -1:  # -1 means unlimited
@@ -53,13 +51,11 @@ class PlanLimitService:
     @staticmethod
     def can_access_analytics(db: Session, user: User) -> bool:
         """Check if user can access analytics"""
-        subscription = UserService.get_active_subscription(db, user.id)
-        plan_type = PlanType.FREE if not subscription else subscription.plan.type
+        plan_type = current_plan_type(db, user)
         return PLAN_FEATURES[plan_type]["analytics"]
 
     @staticmethod
     def can_export_data(db: Session, user: User) -> bool:
         """Check if user can export their data"""
-        subscription = UserService.get_active_subscription(db, user.id)
-        plan_type = PlanType.FREE if not subscription else subscription.plan.type
+        plan_type = current_plan_type(db, user)
         return PLAN_FEATURES[plan_type]["export_data"]
@@ -0,0 +1,140 @@
+import logging
+import uuid
+from datetime import timedelta
+from functools import lru_cache
+from fastapi import HTTPException, status
+from redis.exceptions import RedisError
+from app.config.settings import settings
+from app.core.exceptions import UnauthorizedException
+from app.core.redis_client import get_redis
+from app.core.security import create_refresh_token
+
+logger = logging.getLogger(__name__)
+
+UNKNOWN_FAMILY = 0
+REUSED = -1
+
+# Swap the family's current jti for the new one, but only if the presented
+# token is the current one, and return the seconds the family has left.
+# Presenting any older token means it was replayed, so the family is dropped
+# and every token in it stops working. The family's TTL is left alone: a
+# login lasts REFRESH_TOKEN_EXPIRE_DAYS however often it is refreshed.
+ROTATE_SCRIPT = """
+local current = redis.call('HGET', KEYS[1], 'jti')
+if not current then
+    return 0
+end
+if current ~= ARGV[1] then
+    redis.call('DEL', KEYS[1])
+    return -1
+end
+local ttl = redis.call('TTL', KEYS[1])
+if ttl <= 0 then
+    return 0
+end
+redis.call('HSET', KEYS[1], 'jti', ARGV[2])
+return ttl
+"""
+
+
+def _family_key(family_id: str) -> str:
+    return f"auth:refresh:family:{family_id}"
+
+
+def _user_key(username: str) -> str:
+    return f"auth:refresh:user:{username}"
+
+
+def _ttl() -> int:
+    return int(timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS).total_seconds())
+
+
+@lru_cache
+def _rotate_script():
+    return get_redis().register_script(ROTATE_SCRIPT)
+
+
+def _unavailable(e: Exception) -> HTTPException:
+    logger.error(f"Refresh token store unavailable: {str(e)}")
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Token service unavailable"
+    )
+
+
+class RefreshTokenService:
+    """
+    Refresh tokens grouped into families, one per login, tracked in Redis.
+
+    A family is a hash holding the jti of its only valid token and the
+    subject, expiring REFRESH_TOKEN_EXPIRE_DAYS after the login; every token
+    in it expires with the family. Rotation is a single script call, and
+    abandoned families cost nothing once their TTL lapses.
+    """
+
+    @staticmethod
+    def issue(username: str) -> str:
+        """
+        Start a new family and return its first refresh token. Fails with a
+        503 without Redis, since a token outside any family could be replayed
+        undetected.
+        """
+        family_id = uuid.uuid4().hex
+        jti = uuid.uuid4().hex
+        ttl = _ttl()
+        try:
+            pipe = get_redis().pipeline()
+            pipe.hset(_family_key(family_id), mapping={"jti": jti, "sub": username})
+            pipe.expire(_family_key(family_id), ttl)
+            pipe.sadd(_user_key(username), family_id)
+            pipe.expire(_user_key(username), ttl)
+            pipe.execute()
+        except RedisError as e:
+            raise _unavailable(e)
+        return create_refresh_token(username, claims={"jti": jti, "fam": family_id})
+
+    @staticmethod
+    def rotate(payload: dict) -> str:
+        """Exchange a decoded refresh token for the next one in its family"""
+        family_id = payload["fam"]
+        jti = uuid.uuid4().hex
+        try:
+            result = _rotate_script()(
+                keys=[_family_key(family_id)], args=[payload["jti"], jti]
+            )
+        except RedisError as e:
+            raise _unavailable(e)
+
+        if result == REUSED:
+            logger.warning(
+                f"Refresh token reuse for {payload['sub']}, revoked family {family_id}"
+            )
+            raise UnauthorizedException("Refresh token has already been used")
+        if result == UNKNOWN_FAMILY:
+            raise UnauthorizedException("Invalid refresh token")
+        return create_refresh_token(
+            payload["sub"],
+            expires_delta=timedelta(seconds=result),
+            claims={"jti": jti, "fam": family_id},
+        )
+
+    @staticmethod
+    def revoke_family(family_id: str) -> None:
+        """End one login"""
+        try:
+            get_redis().delete(_family_key(family_id))
+        except RedisError as e:
+            raise _unavailable(e)
+
+    @staticmethod
+    def revoke_all(username: str) -> None:
+        """End every login of a user, e.g. after a password change"""
+        try:
+            redis = get_redis()
+            family_ids = redis.smembers(_user_key(username))
+            redis.delete(
+                _user_key(username),
+                *(_family_key(family_id.decode()) for family_id in family_ids)
+            )
+        except RedisError as e:
+            logger.error(f"Failed to revoke refresh tokens of {username}: {str(e)}")
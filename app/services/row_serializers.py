@@ -0,0 +1,132 @@
+"""
+Response dicts built straight from SELECT rows.
+
+These mirror the Exercise and Workout response schemas field for field and
+back the FAST_LIST_SERIALIZATION path, which skips ORM hydration and
+Pydantic validation for large list pages. Keep them in step with
+app/schemas when fields change.
+"""
+
+from typing import Any, Dict, List, Mapping
+
+from app.models.exercise import (
+    Equipment,
+    ExerciseCatalog,
+    ExerciseCategory,
+    MuscleGroup,
+)
+from app.models.workout import Workout, WorkoutExercise
+
+EXERCISE_COLUMNS = (
+    ExerciseCatalog.id,
+    ExerciseCatalog.name,
+    ExerciseCatalog.description,
+    ExerciseCatalog.instructions,
+    ExerciseCatalog.difficulty,
+    ExerciseCatalog.category_id,
+    ExerciseCatalog.video_url,
+    ExerciseCatalog.image_urls,
+    ExerciseCatalog.is_custom,
+    ExerciseCatalog.created_by_id,
+    ExerciseCatalog.created_at,
+    ExerciseCatalog.updated_at,
+)
+
+CATEGORY_COLUMNS = (
+    ExerciseCategory.id.label("category__id"),
+    ExerciseCategory.name.label("category__name"),
+    ExerciseCategory.description.label("category__description"),
+    ExerciseCategory.created_at.label("category__created_at"),
+    ExerciseCategory.updated_at.label("category__updated_at"),
+)
+
+MUSCLE_GROUP_COLUMNS = (
+    MuscleGroup.id,
+    MuscleGroup.name,
+    MuscleGroup.description,
+    MuscleGroup.created_at,
+    MuscleGroup.updated_at,
+)
+
+EQUIPMENT_COLUMNS = (
+    Equipment.id,
+    Equipment.name,
+    Equipment.description,
+    Equipment.created_at,
+    Equipment.updated_at,
+)
+
+WORKOUT_COLUMNS = (
+    Workout.id,
+    Workout.name,
+    Workout.description,
+    Workout.difficulty,
+    Workout.estimated_duration,
+    Workout.calories_burn_estimate,
+    Workout.is_public,
+    Workout.is_template,
+    Workout.created_by_id,
+    Workout.created_at,
+    Workout.updated_at,
+)
+
+WORKOUT_EXERCISE_COLUMNS = (
+    WorkoutExercise.id,
+    WorkoutExercise.workout_id,
+    WorkoutExercise.exercise_id,
+    WorkoutExercise.order,
+    WorkoutExercise.sets,
+    WorkoutExercise.reps,
+    WorkoutExercise.duration,
+    WorkoutExercise.rest_duration,
+    WorkoutExercise.notes,
+    WorkoutExercise.rep_scheme,
+    WorkoutExercise.created_at,
+    WorkoutExercise.updated_at,
+)
+
+LOOKUP_FIELDS = ("id", "name", "description", "created_at", "updated_at")
+
+_CATEGORY_PREFIX = "category__"
+
+
+def lookup_dict(row: Mapping[str, Any]) -> Dict[str, Any]:
+    """Muscle group / equipment row, ignoring any join keys selected with it"""
+    return {field: row[field] for field in LOOKUP_FIELDS}
+
+
+def exercise_dict(
+    row: Mapping[str, Any],
+    muscle_groups: List[Dict[str, Any]],
+    equipment: List[Dict[str, Any]],
+) -> Dict[str, Any]:
+    """Exercise row joined with its category columns"""
+    data = {}
+    category = {}
+    for key, value in row.items():
+        if key.startswith(_CATEGORY_PREFIX):
+            category[key[len(_CATEGORY_PREFIX):]] = value
+        else:
+            data[key] = value
+    data["difficulty"] = data["difficulty"].value
+    data["category"] = category
+    data["muscle_groups"] = muscle_groups
+    data["equipment"] = equipment
+    return data
+
+
+def workout_exercise_dict(
+    row: Mapping[str, Any], exercise: Dict[str, Any]
+) -> Dict[str, Any]:
+    data = dict(row)
+    data["exercise"] = exercise
+    return data
+
+
+def workout_dict(
+    row: Mapping[str, Any], exercises: List[Dict[str, Any]]
+) -> Dict[str, Any]:
+    data = dict(row)
+    data["difficulty"] = data["difficulty"].value
+    data["exercises"] = exercises
+    return data
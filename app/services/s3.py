@@ -9,7 +9,7 @@ settings = settings.get_settings()
 
 
 class S3Service:
-    def __init__(self):
+    def __init__(self, bucket: Optional[str] = None):
         session_kwargs = {}
         if settings.AWS_ACCESS_KEY_ID and settings.AWS_SECRET_ACCESS_KEY:
             session_kwargs.update(
@@ -27,7 +27,7 @@ class S3Service:
             config=s3_config,
             **session_kwargs,
         )
-        self.bucket = settings.S3_EXERCISE_CATALOG_BUCKET
+        self.bucket = bucket or settings.S3_EXERCISE_CATALOG_BUCKET
 
     def upload_fileobj(
         self,
@@ -36,6 +36,7 @@ class S3Service:
         content_type: Optional[str] = None,
         acl: Optional[str] = None,  # e.g. "private" (default) or "public-read"
         cache_control: Optional[str] = None,
+        content_encoding: Optional[str] = None,  # e.g. "gzip" for pre-compressed bodies
     ) -> str:
         extra = {}
         if content_type:
@@ -44,6 +45,8 @@ class S3Service:
             extra["ACL"] = acl
         if cache_control:
             extra["CacheControl"] = cache_control
+        if content_encoding:
+            extra["ContentEncoding"] = content_encoding
 
         self._client.upload_fileobj(fileobj, self.bucket, key, ExtraArgs=extra or None)
         return key
@@ -77,6 +80,12 @@ class S3Service:
         )
         return PresignedURL(url=url, method="GET", key=key, expires_in=expires_in)
 
+    def public_url(self, key: str) -> str:
+        """Unsigned URL for an object in a public-read bucket (or behind a CDN)"""
+        if settings.S3_PUBLIC_BASE_URL:
+            return f"{settings.S3_PUBLIC_BASE_URL.rstrip('/')}/{key}"
+        return f"https://{self.bucket}.s3.{settings.AWS_REGION}.amazonaws.com/{key}"
+
     def delete(self, key: str) -> None:
         self._client.delete_object(Bucket=self.bucket, Key=key)
 
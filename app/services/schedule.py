@@ -0,0 +1,205 @@
+from datetime import date, timedelta
+from typing import List
+from fastapi import HTTPException
+from sqlalchemy import Date, func, literal, or_, select, update
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Session
+from sqlalchemy.exc import IntegrityError
+from app.config.settings import settings
+from app.db.session import replica_reads
+from app.models.workout import (
+    EnrollmentStatus, PlanEnrollment, ScheduledWorkout,
+    Workout, WorkoutPlan, WorkoutPlanWorkout, WorkoutSession
+)
+from app.models.user import User
+from app.schemas.workout import PlanEnrollmentCreate
+
+MAX_SCHEDULE_RANGE_DAYS = 92
+
+
+class ScheduleService:
+    @staticmethod
+    def enroll(
+        db: Session,
+        plan_id: str,
+        enrollment: PlanEnrollmentCreate,
+        user: User
+    ) -> PlanEnrollment:
+        """
+        Enroll the user in a plan and materialize its calendar.
+
+        Week 1, day 1 falls on start_date. Every WorkoutPlanWorkout the user
+        can access (public or their own) becomes a dated ScheduledWorkout row
+        in a single INSERT ... SELECT.
+        """
+        plan = db.query(WorkoutPlan).filter(WorkoutPlan.id == plan_id).first()
+        if not plan:
+            raise HTTPException(status_code=404, detail="Workout plan not found")
+        if not plan.is_public and plan.created_by_id != user.id:
+            raise HTTPException(status_code=403, detail="Not authorized to access this workout plan")
+
+        plan_workouts = WorkoutPlanWorkout.__table__
+        try:
+            db_enrollment = PlanEnrollment(
+                user_id=user.id,
+                workout_plan_id=plan.id,
+                start_date=enrollment.start_date,
+                status=EnrollmentStatus.ACTIVE
+            )
+            db.add(db_enrollment)
+            db.flush()
+
+            db.execute(
+                ScheduledWorkout.__table__.insert().from_select(
+                    [
+                        "id", "enrollment_id", "user_id", "workout_id",
+                        "scheduled_date", "week_number", "day_number",
+                    ],
+                    select(
+                        func.gen_random_uuid(),
+                        literal(db_enrollment.id, UUID(as_uuid=True)),
+                        literal(user.id, UUID(as_uuid=True)),
+                        plan_workouts.c.workout_id,
+                        literal(enrollment.start_date, Date)
+                        + (plan_workouts.c.week_number - 1) * 7
+                        + (plan_workouts.c.day_number - 1),
+                        plan_workouts.c.week_number,
+                        plan_workouts.c.day_number,
+                    )
+                    .join(Workout, Workout.id == plan_workouts.c.workout_id)
+                    .where(
+                        plan_workouts.c.workout_plan_id == plan.id,
+                        or_(Workout.is_public == True, Workout.created_by_id == user.id),
+                    ),
+                )
+            )
+            db.commit()
+            return db_enrollment
+        except IntegrityError:
+            db.rollback()
+            raise HTTPException(status_code=400, detail="Already enrolled in this workout plan")
+
+    @staticmethod
+    def get_enrollment(db: Session, enrollment_id: str, user: User) -> PlanEnrollment:
+        """Get one of the user's enrollments"""
+        enrollment = db.query(PlanEnrollment).filter(
+            PlanEnrollment.id == enrollment_id,
+            PlanEnrollment.user_id == user.id
+        ).first()
+        if not enrollment:
+            raise HTTPException(status_code=404, detail="Plan enrollment not found")
+        return enrollment
+
+    @staticmethod
+    def cancel_enrollment(db: Session, enrollment_id: str, user: User) -> PlanEnrollment:
+        """Cancel an enrollment, dropping its outstanding future entries"""
+        enrollment = ScheduleService.get_enrollment(db, enrollment_id, user)
+        if enrollment.status != EnrollmentStatus.ACTIVE:
+            raise HTTPException(status_code=400, detail="Plan enrollment is not active")
+
+        enrollment.status = EnrollmentStatus.CANCELLED
+        db.query(ScheduledWorkout).filter(
+            ScheduledWorkout.enrollment_id == enrollment.id,
+            ScheduledWorkout.scheduled_date >= date.today(),
+            ScheduledWorkout.workout_session_id.is_(None)
+        ).delete(synchronize_session=False)
+        db.commit()
+        return enrollment
+
+    @staticmethod
+    @replica_reads
+    def get_schedule(db: Session, user: User, start: date, end: date) -> List[dict]:
+        """Scheduled workouts between start and end (inclusive), in date order"""
+        if end < start:
+            raise HTTPException(status_code=400, detail="end must not be before start")
+        if (end - start).days >= MAX_SCHEDULE_RANGE_DAYS:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Range cannot exceed {MAX_SCHEDULE_RANGE_DAYS} days"
+            )
+
+        rows = db.execute(
+            select(
+                ScheduledWorkout.id,
+                ScheduledWorkout.enrollment_id,
+                ScheduledWorkout.workout_id,
+                Workout.name.label("workout_name"),
+                ScheduledWorkout.scheduled_date,
+                ScheduledWorkout.week_number,
+                ScheduledWorkout.day_number,
+                ScheduledWorkout.workout_session_id,
+                ScheduledWorkout.completed_at,
+            )
+            .join(Workout, Workout.id == ScheduledWorkout.workout_id)
+            .where(
+                ScheduledWorkout.user_id == user.id,
+                ScheduledWorkout.scheduled_date.between(start, end)
+            )
+            .order_by(ScheduledWorkout.scheduled_date, ScheduledWorkout.week_number)
+        ).mappings().all()
+        return [dict(row) for row in rows]
+
+    @staticmethod
+    @replica_reads
+    def get_adherence(
+        db: Session,
+        enrollment_id: str,
+        user: User,
+        as_of: date
+    ) -> dict:
+        """Completed vs. missed vs. upcoming entries of an enrollment"""
+        enrollment = ScheduleService.get_enrollment(db, enrollment_id, user)
+        pending = ScheduledWorkout.workout_session_id.is_(None)
+
+        scheduled, completed, missed, upcoming = db.execute(
+            select(
+                func.count(),
+                func.count(ScheduledWorkout.workout_session_id),
+                func.count().filter(pending, ScheduledWorkout.scheduled_date < as_of),
+                func.count().filter(pending, ScheduledWorkout.scheduled_date >= as_of),
+            ).where(ScheduledWorkout.enrollment_id == enrollment.id)
+        ).one()
+
+        due = completed + missed
+        return {
+            "enrollment_id": enrollment.id,
+            "scheduled": scheduled,
+            "completed": completed,
+            "missed": missed,
+            "upcoming": upcoming,
+            "adherence_rate": round(completed / due, 4) if due else None,
+        }
+
+    @staticmethod
+    def match_completed_session(db: Session, session: WorkoutSession) -> None:
+        """
+        Mark the scheduled entry a completed session fulfils: the user's
+        nearest open entry for the same workout within the match window.
+        Runs inside the caller's transaction.
+        """
+        completed_on = session.end_time.date()
+        window = timedelta(days=settings.SCHEDULE_MATCH_WINDOW_DAYS)
+
+        nearest = (
+            select(ScheduledWorkout.id)
+            .where(
+                ScheduledWorkout.user_id == session.user_id,
+                ScheduledWorkout.workout_id == session.workout_id,
+                ScheduledWorkout.workout_session_id.is_(None),
+                ScheduledWorkout.scheduled_date.between(
+                    completed_on - window, completed_on + window
+                )
+            )
+            .order_by(
+                func.abs(ScheduledWorkout.scheduled_date - completed_on),
+                ScheduledWorkout.scheduled_date
+            )
+            .limit(1)
+            .scalar_subquery()
+        )
+        db.execute(
+            update(ScheduledWorkout)
+            .where(ScheduledWorkout.id == nearest)
+            .values(workout_session_id=session.id, completed_at=session.end_time)
+            .execution_options(synchronize_session=False)
+        )
@@ -1,10 +1,30 @@
-from typing import Optional
+import logging
+import re
+import secrets
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Tuple
 from sqlalchemy.orm import Session
-from sqlalchemy import or_
+from sqlalchemy import or_, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import joinedload
 from app.models.user import User
+from app.models.subscription import Subscription
 from app.schemas.user import UserCreate, UserUpdate
-from app.core.security import get_password_hash, verify_password
-from app.core.exceptions import UserAlreadyExistsException, UserNotFoundException
+from app.config.settings import settings
+from app.core.security import get_password_hash, password_needs_update, verify_password
+from app.db.session import SessionLocal
+from app.core.exceptions import (
+    InvalidCredentialsException, UserAlreadyExistsException, UserNotFoundException
+)
+from app.services.refresh_tokens import RefreshTokenService
+
+logger = logging.getLogger(__name__)
+
+# Hash upgrades run off the request thread. Past the pending limit they are
+# skipped; the hash is still outdated, so a later login tries again.
+_rehash_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="password-rehash")
+_rehash_slots = threading.BoundedSemaphore(settings.PASSWORD_REHASH_MAX_PENDING)
 
 
 class UserService:
@@ -32,6 +52,17 @@ class UserService:
             .first()
         )
 
+    @staticmethod
+    def get_active_subscription(db: Session, user_id: str) -> Optional[Subscription]:
+        """Get the user's active subscription with its plan"""
+        return (
+            db.query(Subscription)
+            .options(joinedload(Subscription.plan))
+            .filter(Subscription.user_id == user_id, Subscription.is_active == True)
+            .order_by(Subscription.created_at.desc())
+            .first()
+        )
+
     @staticmethod
     def create_user(db: Session, user_create: UserCreate) -> User:
         """Create new user"""
@@ -57,9 +88,59 @@ class UserService:
         )
         db.add(db_user)
         db.commit()
-        db.refresh(db_user)
         return db_user
 
+    @staticmethod
+    def _available_username(db: Session, email: str) -> str:
+        """A free username derived from the local part of an email"""
+        base = re.sub(r"[^a-z0-9_.]", "", email.split("@")[0].lower()) or "user"
+        username = base
+        while UserService.get_user_by_username(db, username):
+            username = f"{base}{secrets.token_hex(2)}"
+        return username
+
+    @staticmethod
+    def get_or_create_google_user(db: Session, idinfo: dict) -> Tuple[User, bool]:
+        """
+        The user a verified Google identity belongs to: matched by Google
+        subject, else linked to the account with the same verified email,
+        else created. Returns (user, created).
+        """
+        user = db.query(User).filter(User.google_sub == idinfo["sub"]).first()
+        if user:
+            return user, False
+
+        if not idinfo["email_verified"]:
+            raise InvalidCredentialsException("Google account email is not verified")
+
+        created = False
+        user = UserService.get_user_by_email(db, idinfo["email"])
+        if user:
+            user.google_sub = idinfo["sub"]
+        else:
+            user = User(
+                email=idinfo["email"],
+                username=UserService._available_username(db, idinfo["email"]),
+                # Never handed out; the account signs in through Google
+                hashed_password=get_password_hash(secrets.token_urlsafe(32)),
+                full_name=idinfo.get("name"),
+                locale=idinfo.get("locale"),
+                google_sub=idinfo["sub"],
+            )
+            db.add(user)
+            created = True
+
+        try:
+            db.commit()
+        except IntegrityError:
+            # A concurrent first sign-in got there first
+            db.rollback()
+            user = db.query(User).filter(User.google_sub == idinfo["sub"]).first()
+            if not user:
+                raise UserAlreadyExistsException("Account could not be linked to Google")
+            created = False
+        return user, created
+
     @staticmethod
     def update_user(db: Session, user_id: str, user_update: UserUpdate) -> User:
         """Update user"""
@@ -89,11 +170,15 @@ class UserService:
             if existing_user:
                 raise UserAlreadyExistsException("Username already taken")
 
+        previous_username = db_user.username
         for field, value in update_data.items():
             setattr(db_user, field, value)
 
         db.commit()
-        db.refresh(db_user)
+
+        # Outstanding refresh tokens name the old username or predate the new password
+        if "hashed_password" in update_data or db_user.username != previous_username:
+            RefreshTokenService.revoke_all(previous_username)
         return db_user
 
     @staticmethod
@@ -104,4 +189,28 @@ class UserService:
             return None
         if not verify_password(password, user.hashed_password):
             return None
+        if password_needs_update(user.hashed_password) and _rehash_slots.acquire(blocking=False):
+            _rehash_executor.submit(
+                UserService._rehash_password, user.id, password, user.hashed_password
+            )
         return user
+
+    @staticmethod
+    def _rehash_password(user_id, password: str, old_hash: str) -> None:
+        """
+        Store a hash at the current scheme and cost. Compare-and-swap on the
+        old hash, so a password changed meanwhile is never overwritten.
+        """
+        try:
+            new_hash = get_password_hash(password)
+            with SessionLocal() as db:
+                db.execute(
+                    update(User)
+                    .where(User.id == user_id, User.hashed_password == old_hash)
+                    .values(hashed_password=new_hash)
+                )
+                db.commit()
+        except Exception as e:
+            logger.error(f"Password rehash failed for user {user_id}: {str(e)}")
+        finally:
+            _rehash_slots.release()
@@ -1,22 +1,53 @@
+from collections import defaultdict
 from typing import List, Optional
-from datetime import datetime
+from datetime import date, datetime, time, timedelta, timezone
+import base64
+import uuid
 from fastapi import HTTPException
-from sqlalchemy.orm import Session
+from sqlalchemy import Text, column, func, literal, or_, select, text, tuple_, values
+from sqlalchemy.dialects.postgresql import UUID, insert as pg_insert
+from sqlalchemy.orm import Session, selectinload
+from sqlalchemy.orm.attributes import set_committed_value
 from sqlalchemy.exc import IntegrityError
+from app.db.session import replica_reads
 from app.models.workout import (
     Workout, WorkoutExercise, WorkoutSession,
     ExerciseSet, WorkoutPlan, WorkoutPlanWorkout,
     WorkoutStatus
 )
 from app.models.user import User
+from app.models.exercise import ExerciseCatalog
 from app.schemas.workout import (
     WorkoutCreate, WorkoutExerciseCreate,
     WorkoutPlanCreate, WorkoutSessionCreate,
     ExerciseSetCreate, WorkoutSessionUpdate
 )
+from app.services import row_serializers
+from app.services.history_archive import HistoryArchiveService
+from app.services.personal_records import PersonalRecordService
 from app.services.plan_limits import PlanLimitService
+from app.services.schedule import ScheduleService
 from app.services.exercise import ExerciseService
 
+def _day_start(day: date) -> datetime:
+    return datetime.combine(day, time(), timezone.utc)
+
+
+def _encode_cursor(start_time: datetime, session_id) -> str:
+    raw = f"{start_time.isoformat()}|{session_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def _decode_cursor(cursor: str):
+    """(start_time, id) of the last session on the previous page"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        start_time, session_id = raw.split("|")
+        return datetime.fromisoformat(start_time), uuid.UUID(session_id)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
 class WorkoutService:
     @staticmethod
     def create_workout(
@@ -29,34 +60,38 @@ class WorkoutService:
         PlanLimitService.check_workout_limit(db, user)
 
         # Verify all exercises exist
-        for exercise in workout.exercises:
+        catalog = [
             ExerciseService.get_exercise(db, exercise.exercise_id)
+            for exercise in workout.exercises
+        ]
 
         try:
             db_workout = Workout(
                 **workout.dict(exclude={'exercises'}),
                 created_by_id=user.id
             )
-            db.add(db_workout)
-            db.flush()  # Get the workout ID without committing
 
-            # Create workout exercises
-            for idx, exercise in enumerate(workout.exercises):
-                db_workout_exercise = WorkoutExercise(
-                    **exercise.dict(),
-                    workout_id=db_workout.id,
+            # Create workout exercises through the relationship so the collection
+            # is already populated for the response
+            db_workout.exercises = [
+                WorkoutExercise(
+                    **exercise.dict(exclude={'order'}),
+                    exercise=catalog_exercise,
                     order=idx + 1
                 )
-                db.add(db_workout_exercise)
-
+                for idx, (exercise, catalog_exercise) in enumerate(
+                    zip(workout.exercises, catalog)
+                )
+            ]
+            db.add(db_workout)
             db.commit()
-            db.refresh(db_workout)
             return db_workout
         except IntegrityError:
             db.rollback()
             raise HTTPException(status_code=400, detail="Error creating workout")
 
     @staticmethod
+    @replica_reads
     def get_workout(db: Session, workout_id: str, user: User) -> Workout:
         """Get workout by ID"""
         workout = db.query(Workout).filter(Workout.id == workout_id).first()
@@ -70,6 +105,56 @@ class WorkoutService:
         return workout
 
     @staticmethod
+    def get_public_workout_version(
+        db: Session, workout_id: str, user: User
+    ) -> Optional[str]:
+        """
+        Cache version of a public workout, or None for private workouts.
+
+        The version covers the workout row, its exercise list, the catalog
+        entries it embeds and their categories, muscle groups and equipment,
+        read in one indexed query without hydrating the ORM graph. Raises
+        404/403 like get_workout.
+        """
+        exercises_updated = (
+            select(func.max(WorkoutExercise.updated_at))
+            .where(WorkoutExercise.workout_id == Workout.id)
+            .scalar_subquery()
+        )
+        catalog_updated = (
+            select(func.max(ExerciseCatalog.updated_at))
+            .join(WorkoutExercise, WorkoutExercise.exercise_id == ExerciseCatalog.id)
+            .where(WorkoutExercise.workout_id == Workout.id)
+            .scalar_subquery()
+        )
+        related_updated = ExerciseService.related_updated_at(
+            select(WorkoutExercise.exercise_id).where(
+                WorkoutExercise.workout_id == Workout.id
+            )
+        )
+        row = db.execute(
+            select(
+                Workout.is_public,
+                Workout.created_by_id,
+                Workout.updated_at,
+                exercises_updated,
+                catalog_updated,
+                related_updated,
+            ).where(Workout.id == workout_id)
+        ).first()
+
+        if not row:
+            raise HTTPException(status_code=404, detail="Workout not found")
+        is_public, created_by_id, *timestamps = row
+        if not is_public:
+            if created_by_id != user.id:
+                raise HTTPException(status_code=403, detail="Not authorized to access this workout")
+            return None
+
+        return ":".join(str(ts.timestamp()) if ts else "-" for ts in timestamps)
+
+    @staticmethod
+    @replica_reads
     def list_workouts(
         db: Session,
         user: User,
@@ -93,6 +178,58 @@ class WorkoutService:
         
         return query.offset(skip).limit(limit).all()
 
+    @staticmethod
+    @replica_reads
+    def list_workout_dicts(
+        db: Session,
+        user: User,
+        skip: int = 0,
+        limit: int = 20,
+        include_public: bool = True,
+        difficulty: Optional[str] = None
+    ) -> List[dict]:
+        """
+        list_workouts as response dicts, read from row tuples.
+
+        Three queries per page regardless of size: workouts, their exercise
+        rows, and the embedded catalog entries (via ExerciseService).
+        """
+        stmt = select(*row_serializers.WORKOUT_COLUMNS)
+
+        if include_public:
+            stmt = stmt.where(
+                (Workout.created_by_id == user.id) | (Workout.is_public == True)
+            )
+        else:
+            stmt = stmt.where(Workout.created_by_id == user.id)
+
+        if difficulty:
+            stmt = stmt.where(Workout.difficulty == difficulty)
+
+        workout_rows = db.execute(stmt.offset(skip).limit(limit)).mappings().all()
+        if not workout_rows:
+            return []
+
+        exercise_rows = db.execute(
+            select(*row_serializers.WORKOUT_EXERCISE_COLUMNS)
+            .where(WorkoutExercise.workout_id.in_([row["id"] for row in workout_rows]))
+            .order_by(WorkoutExercise.workout_id, WorkoutExercise.order)
+        ).mappings().all()
+        catalog = ExerciseService.get_exercise_dicts(
+            db, {row["exercise_id"] for row in exercise_rows}
+        )
+
+        exercises_by_workout = defaultdict(list)
+        for row in exercise_rows:
+            exercises_by_workout[row["workout_id"]].append(
+                row_serializers.workout_exercise_dict(row, catalog[row["exercise_id"]])
+            )
+
+        return [
+            row_serializers.workout_dict(row, exercises_by_workout[row["id"]])
+            for row in workout_rows
+        ]
+
     @staticmethod
     def create_workout_plan(
         db: Session,
@@ -124,48 +261,352 @@ class WorkoutService:
                 db.add(db_plan_workout)
 
             db.commit()
-            db.refresh(db_plan)
             return db_plan
         except IntegrityError:
             db.rollback()
             raise HTTPException(status_code=400, detail="Error creating workout plan")
 
+    @staticmethod
+    def get_workout_plan(db: Session, plan_id: str, user: User) -> WorkoutPlan:
+        """Get workout plan by ID"""
+        plan = db.query(WorkoutPlan).filter(WorkoutPlan.id == plan_id).first()
+        if not plan:
+            raise HTTPException(status_code=404, detail="Workout plan not found")
+
+        if not plan.is_public and plan.created_by_id != user.id:
+            raise HTTPException(status_code=403, detail="Not authorized to access this workout plan")
+
+        return plan
+
+    @staticmethod
+    def _copy_workouts(db: Session, workout_map, user: User, name: Optional[str] = None) -> None:
+        """
+        Deep-copy workouts into the user's library with two INSERT ... SELECTs.
+
+        workout_map is a VALUES clause of (old_id, new_id) pairs; the copies
+        are private, non-template workouts owned by the user.
+        """
+        workouts = Workout.__table__
+        workout_exercises = WorkoutExercise.__table__
+
+        db.execute(
+            workouts.insert().from_select(
+                [
+                    "id", "name", "description", "difficulty", "estimated_duration",
+                    "calories_burn_estimate", "is_public", "is_template", "created_by_id",
+                ],
+                select(
+                    workout_map.c.new_id,
+                    literal(name, Text) if name else workouts.c.name,
+                    workouts.c.description,
+                    workouts.c.difficulty,
+                    workouts.c.estimated_duration,
+                    workouts.c.calories_burn_estimate,
+                    literal(False),
+                    literal(False),
+                    literal(user.id, UUID(as_uuid=True)),
+                ).join_from(workouts, workout_map, workout_map.c.old_id == workouts.c.id),
+            )
+        )
+        db.execute(
+            workout_exercises.insert().from_select(
+                [
+                    "id", "workout_id", "exercise_id", "order", "sets", "reps",
+                    "duration", "rest_duration", "notes", "rep_scheme",
+                ],
+                select(
+                    func.gen_random_uuid(),
+                    workout_map.c.new_id,
+                    workout_exercises.c.exercise_id,
+                    workout_exercises.c.order,
+                    workout_exercises.c.sets,
+                    workout_exercises.c.reps,
+                    workout_exercises.c.duration,
+                    workout_exercises.c.rest_duration,
+                    workout_exercises.c.notes,
+                    workout_exercises.c.rep_scheme,
+                ).join_from(
+                    workout_exercises,
+                    workout_map,
+                    workout_map.c.old_id == workout_exercises.c.workout_id,
+                ),
+            )
+        )
+
+    @staticmethod
+    def _workout_map(pairs):
+        """VALUES clause mapping source workout ids to their copies"""
+        return values(
+            column("old_id", UUID(as_uuid=True)),
+            column("new_id", UUID(as_uuid=True)),
+            name="workout_map",
+        ).data(pairs)
+
+    @staticmethod
+    def clone_workout(
+        db: Session,
+        workout_id: str,
+        user: User,
+        name: Optional[str] = None
+    ) -> Workout:
+        """Copy a template (or any accessible workout) into the user's library"""
+        source = WorkoutService.get_workout(db, workout_id, user)
+        PlanLimitService.check_workout_limit(db, user)
+
+        new_id = uuid.uuid4()
+        try:
+            WorkoutService._copy_workouts(
+                db, WorkoutService._workout_map([(source.id, new_id)]), user, name=name
+            )
+            db.commit()
+        except IntegrityError:
+            db.rollback()
+            raise HTTPException(status_code=400, detail="Error cloning workout")
+
+        return (
+            db.query(Workout)
+            .options(selectinload(Workout.exercises))
+            .filter(Workout.id == new_id)
+            .one()
+        )
+
+    @staticmethod
+    def clone_workout_plan(
+        db: Session,
+        plan_id: str,
+        user: User,
+        name: Optional[str] = None
+    ) -> WorkoutPlan:
+        """
+        Instantiate a plan for the user: the plan, every scheduled workout and
+        their exercises are copied in one transaction with four INSERT ...
+        SELECT statements, however many weeks the plan spans.
+
+        Workouts the user can't access (another author's private workouts in
+        a public plan) are left out of the copy.
+        """
+        source = WorkoutService.get_workout_plan(db, plan_id, user)
+        workout_ids = db.execute(
+            select(WorkoutPlanWorkout.workout_id)
+            .join(Workout, Workout.id == WorkoutPlanWorkout.workout_id)
+            .where(
+                WorkoutPlanWorkout.workout_plan_id == source.id,
+                or_(Workout.is_public == True, Workout.created_by_id == user.id),
+            )
+        ).scalars().all()
+
+        PlanLimitService.check_plan_limit(db, user)
+        if workout_ids:
+            PlanLimitService.check_workout_limit(db, user, additional=len(workout_ids))
+
+        plans = WorkoutPlan.__table__
+        plan_workouts = WorkoutPlanWorkout.__table__
+        new_plan_id = uuid.uuid4()
+        workout_map = WorkoutService._workout_map(
+            [(workout_id, uuid.uuid4()) for workout_id in workout_ids]
+        )
+
+        try:
+            db.execute(
+                plans.insert().from_select(
+                    [
+                        "id", "name", "description", "duration_weeks",
+                        "difficulty", "is_public", "created_by_id",
+                    ],
+                    select(
+                        literal(new_plan_id, UUID(as_uuid=True)),
+                        literal(name, Text) if name else plans.c.name,
+                        plans.c.description,
+                        plans.c.duration_weeks,
+                        plans.c.difficulty,
+                        literal(False),
+                        literal(user.id, UUID(as_uuid=True)),
+                    ).where(plans.c.id == source.id),
+                )
+            )
+            if workout_ids:
+                WorkoutService._copy_workouts(db, workout_map, user)
+                db.execute(
+                    plan_workouts.insert().from_select(
+                        ["workout_plan_id", "workout_id", "week_number", "day_number"],
+                        select(
+                            literal(new_plan_id, UUID(as_uuid=True)),
+                            workout_map.c.new_id,
+                            plan_workouts.c.week_number,
+                            plan_workouts.c.day_number,
+                        )
+                        .join_from(
+                            plan_workouts,
+                            workout_map,
+                            workout_map.c.old_id == plan_workouts.c.workout_id,
+                        )
+                        .where(plan_workouts.c.workout_plan_id == source.id),
+                    )
+                )
+            db.commit()
+        except IntegrityError:
+            db.rollback()
+            raise HTTPException(status_code=400, detail="Error cloning workout plan")
+
+        return (
+            db.query(WorkoutPlan)
+            .options(
+                selectinload(WorkoutPlan.schedule)
+                .selectinload(WorkoutPlanWorkout.workout)
+                .selectinload(Workout.exercises)
+            )
+            .filter(WorkoutPlan.id == new_plan_id)
+            .one()
+        )
+
     @staticmethod
     def start_workout_session(
         db: Session,
         session: WorkoutSessionCreate,
-        user: User
+        user: User,
+        resume: bool = False
     ) -> WorkoutSession:
-        """Start a new workout session"""
-        # Verify workout exists and is accessible
-        workout = WorkoutService.get_workout(db, session.workout_id, user)
+        """
+        Start a new workout session.
 
-        # Check if there's already an active session
-        active_session = db.query(WorkoutSession).filter(
-            WorkoutSession.user_id == user.id,
-            WorkoutSession.status == WorkoutStatus.IN_PROGRESS
-        ).first()
+        The access check, the one-active-session rule and the insert happen in a
+        single INSERT ... SELECT ... ON CONFLICT ... RETURNING statement, guarded
+        by the partial unique index on in-progress sessions. With resume=True an
+        existing active session of the same workout is returned instead of
+        raising; one of a different workout still raises.
+        """
+        sessions = WorkoutSession.__table__
+        source = select(
+            literal(uuid.uuid4(), UUID(as_uuid=True)),
+            literal(user.id, UUID(as_uuid=True)),
+            Workout.id,
+            literal(session.notes, Text),
+            literal(WorkoutStatus.IN_PROGRESS, sessions.c.status.type),
+            func.now(),
+        ).where(
+            Workout.id == session.workout_id,
+            or_(Workout.is_public == True, Workout.created_by_id == user.id),
+        )
+
+        stmt = pg_insert(sessions).from_select(
+            ["id", "user_id", "workout_id", "notes", "status", "start_time"], source
+        )
+        conflict_target = dict(
+            index_elements=[sessions.c.user_id],
+            index_where=text("status = 'IN_PROGRESS'"),
+        )
+        if resume:
+            # DO UPDATE (rather than DO NOTHING) so RETURNING yields the existing
+            # row; the WHERE leaves a session of another workout unreturned
+            stmt = stmt.on_conflict_do_update(
+                set_={"updated_at": sessions.c.updated_at},
+                where=sessions.c.workout_id == stmt.excluded.workout_id,
+                **conflict_target,
+            )
+        else:
+            stmt = stmt.on_conflict_do_nothing(**conflict_target)
+        stmt = stmt.returning(*sessions.c)
+
+        try:
+            db_session = db.execute(
+                select(WorkoutSession).from_statement(stmt)
+            ).scalars().first()
+        except IntegrityError:
+            db.rollback()
+            raise HTTPException(status_code=400, detail="You already have an active workout session")
 
-        if active_session:
+        if db_session is None:
+            db.rollback()
+            # Nothing inserted: either the workout isn't accessible (raises 404/403)
+            # or there's already an active session.
+            WorkoutService.get_workout(db, session.workout_id, user)
             raise HTTPException(
                 status_code=400,
                 detail="You already have an active workout session"
             )
 
-        try:
-            db_session = WorkoutSession(
-                **session.dict(),
-                user_id=user.id,
-                status=WorkoutStatus.IN_PROGRESS,
-                start_time=datetime.utcnow()
+        db.commit()
+        if not resume:
+            # A session that was just created has no sets; skip the lazy load
+            set_committed_value(db_session, "exercise_sets", [])
+        return db_session
+
+    @staticmethod
+    @replica_reads
+    def list_session_history(
+        db: Session,
+        user: User,
+        limit: int = 20,
+        cursor: Optional[str] = None,
+        start: Optional[date] = None,
+        end: Optional[date] = None,
+        status: Optional[str] = None
+    ) -> dict:
+        """
+        A page of the user's started sessions, newest first, as summaries.
+
+        Keyset-paginated on (start_time, id): the cursor holds the last row
+        returned, so every page is one range read of
+        ix_workout_sessions_user_id_start_time, whose included columns
+        answer the query without visiting the table; only the workout name
+        is joined in.
+        """
+        stmt = (
+            select(
+                WorkoutSession.id,
+                WorkoutSession.workout_id,
+                Workout.name.label("workout_name"),
+                WorkoutSession.start_time,
+                WorkoutSession.status,
+                WorkoutSession.total_duration,
             )
-            db.add(db_session)
-            db.commit()
-            db.refresh(db_session)
-            return db_session
-        except IntegrityError:
-            db.rollback()
-            raise HTTPException(status_code=400, detail="Error starting workout session")
+            .join(Workout, Workout.id == WorkoutSession.workout_id)
+            .where(
+                WorkoutSession.user_id == user.id,
+                WorkoutSession.start_time.is_not(None),
+            )
+        )
+        if cursor:
+            stmt = stmt.where(
+                tuple_(WorkoutSession.start_time, WorkoutSession.id) < _decode_cursor(cursor)
+            )
+        if start:
+            stmt = stmt.where(WorkoutSession.start_time >= _day_start(start))
+        if end:
+            stmt = stmt.where(WorkoutSession.start_time < _day_start(end + timedelta(days=1)))
+        if status:
+            stmt = stmt.where(WorkoutSession.status == WorkoutStatus[status.upper()])
+
+        rows = db.execute(
+            stmt.order_by(WorkoutSession.start_time.desc(), WorkoutSession.id.desc())
+            .limit(limit + 1)
+        ).mappings().all()
+
+        items = []
+        for row in rows[:limit]:
+            item = dict(row)
+            item["status"] = item["status"].value
+            items.append(item)
+        next_cursor = None
+        if len(rows) > limit:
+            last = rows[limit - 1]
+            next_cursor = _encode_cursor(last["start_time"], last["id"])
+        return {"items": items, "next_cursor": next_cursor}
+
+    @staticmethod
+    @replica_reads
+    def get_workout_session(db: Session, session_id: str, user: User):
+        """A session with its sets, read back from the history archive if archived"""
+        session = db.query(WorkoutSession).filter(
+            WorkoutSession.id == session_id,
+            WorkoutSession.user_id == user.id
+        ).first()
+
+        if not session:
+            raise HTTPException(status_code=404, detail="Workout session not found")
+        if session.archive_key:
+            return HistoryArchiveService.session_with_sets(session)
+        return session
 
     @staticmethod
     def complete_workout_session(
@@ -200,8 +641,10 @@ class WorkoutService:
             if update_data.difficulty_rating:
                 session.difficulty_rating = update_data.difficulty_rating
 
+            db.flush()
+            ScheduleService.match_completed_session(db, session)
+
             db.commit()
-            db.refresh(session)
             return session
         except IntegrityError:
             db.rollback()
@@ -246,8 +689,13 @@ class WorkoutService:
                 workout_session_id=session_id
             )
             db.add(db_set)
+            db.flush()
+
+            # Not persisted; carried to the response so clients can celebrate
+            db_set.new_records = PersonalRecordService.update_from_set(
+                db, db_set, workout_exercise.exercise_id, user.id
+            )
             db.commit()
-            db.refresh(db_set)
             return db_set
         except IntegrityError:
             db.rollback()
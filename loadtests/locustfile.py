@@ -0,0 +1,134 @@
+"""
+Load-test scenarios for the API hot paths.
+
+Run against a local stack (docker-compose up -d, alembic upgrade head,
+uvicorn app.main:app) with the exercise catalog populated:
+
+    locust -f loadtests/locustfile.py --host http://localhost:8000 \
+        --headless -u 50 -r 10 -t 2m --csv loadtests/results/run
+
+then summarize and compare with loadtests/report.py.
+"""
+
+import random
+import uuid
+
+from locust import HttpUser, between, task
+
+API = "/api/v1"
+PASSWORD = "Load@Test1234"
+
+
+class FitnessUser(HttpUser):
+    wait_time = between(0.5, 2)
+
+    def on_start(self):
+        self.username = f"load_{uuid.uuid4().hex[:12]}"
+        self.client.post(
+            f"{API}/auth/register",
+            json={
+                "email": f"{self.username}@example.com",
+                "username": self.username,
+                "password": PASSWORD,
+            },
+            name="register",
+        )
+        self.login()
+
+        response = self.client.get(
+            f"{API}/fitness/exercises/",
+            params={"limit": 100},
+            headers=self.headers,
+            name="list_exercises",
+        )
+        self.exercise_ids = [e["id"] for e in response.json()] if response.ok else []
+        self.workouts = []
+
+    def login(self):
+        response = self.client.post(
+            f"{API}/auth/login",
+            data={"username": self.username, "password": PASSWORD},
+            name="login",
+        )
+        self.headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+    @task(1)
+    def relogin(self):
+        self.login()
+
+    @task(5)
+    def list_exercises(self):
+        self.client.get(
+            f"{API}/fitness/exercises/",
+            params={"skip": random.randint(0, 5) * 20, "limit": 20},
+            headers=self.headers,
+            name="list_exercises",
+        )
+
+    @task(3)
+    def list_workouts(self):
+        self.client.get(
+            f"{API}/fitness/workouts/",
+            params={"limit": 20},
+            headers=self.headers,
+            name="list_workouts",
+        )
+
+    @task(2)
+    def create_workout(self):
+        if not self.exercise_ids:
+            return
+        exercises = random.sample(self.exercise_ids, k=min(6, len(self.exercise_ids)))
+        response = self.client.post(
+            f"{API}/fitness/workouts/",
+            json={
+                "name": f"Workout {uuid.uuid4().hex[:6]}",
+                "difficulty": "intermediate",
+                "exercises": [
+                    {"exercise_id": e, "order": i + 1, "sets": 4, "reps": 8}
+                    for i, e in enumerate(exercises)
+                ],
+            },
+            headers=self.headers,
+            name="create_workout",
+        )
+        if response.ok:
+            self.workouts.append(response.json())
+
+    @task(2)
+    def train(self):
+        """Start a session, record a few sets and complete it"""
+        if not self.workouts:
+            return
+        workout = random.choice(self.workouts)
+        response = self.client.post(
+            f"{API}/fitness/workout-sessions/",
+            json={"workout_id": workout["id"]},
+            headers=self.headers,
+            name="start_session",
+        )
+        if not response.ok:
+            return
+        session_id = response.json()["id"]
+
+        for workout_exercise in workout["exercises"][:3]:
+            for set_number in range(1, 4):
+                self.client.post(
+                    f"{API}/fitness/workout-sessions/{session_id}/sets",
+                    json={
+                        "workout_exercise_id": workout_exercise["id"],
+                        "set_number": set_number,
+                        "reps": random.randint(5, 12),
+                        "weight": random.choice([40.0, 60.0, 80.0, 100.0]),
+                        "rpe": random.randint(6, 9),
+                    },
+                    headers=self.headers,
+                    name="record_set",
+                )
+
+        self.client.post(
+            f"{API}/fitness/workout-sessions/{session_id}/complete",
+            json={"mood_rating": 4},
+            headers=self.headers,
+            name="complete_session",
+        )
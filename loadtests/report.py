@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Summarize a Locust CSV run into a comparable JSON report and check it
+against a baseline.
+
+    python loadtests/report.py loadtests/results/run_stats.csv \
+        --output loadtests/results/report.json \
+        --baseline loadtests/baseline.json --threshold 0.15
+
+Exits non-zero if any endpoint's p95 or p99 regressed by more than the
+threshold (a fraction of the baseline value) or its failure rate rose.
+"""
+
+import argparse
+import csv
+import json
+import sys
+from pathlib import Path
+from typing import Dict
+
+
+def load_stats(csv_path: Path) -> Dict[str, dict]:
+    report = {}
+    with open(csv_path, newline="", encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            requests = int(row["Request Count"])
+            if not requests:
+                continue
+            report[row["Name"]] = {
+                "requests": requests,
+                "failures": int(row["Failure Count"]),
+                "failure_rate": int(row["Failure Count"]) / requests,
+                "rps": float(row["Requests/s"]),
+                "avg_ms": float(row["Average Response Time"]),
+                "p50_ms": float(row["50%"]),
+                "p95_ms": float(row["95%"]),
+                "p99_ms": float(row["99%"]),
+            }
+    return report
+
+
+def compare(report: Dict[str, dict], baseline: Dict[str, dict], threshold: float) -> list[str]:
+    regressions = []
+    for name, current in report.items():
+        previous = baseline.get(name)
+        if not previous:
+            continue
+        for metric in ("p95_ms", "p99_ms"):
+            limit = previous[metric] * (1 + threshold)
+            if current[metric] > limit:
+                regressions.append(
+                    f"{name}: {metric} {current[metric]:.0f} ms > {limit:.0f} ms "
+                    f"(baseline {previous[metric]:.0f} ms)"
+                )
+        if current["failure_rate"] > previous["failure_rate"] + 0.01:
+            regressions.append(
+                f"{name}: failure rate {current['failure_rate']:.2%} "
+                f"(baseline {previous['failure_rate']:.2%})"
+            )
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Summarize and compare Locust runs")
+    parser.add_argument("stats_csv", help="Locust <prefix>_stats.csv file")
+    parser.add_argument("--output", help="Write the JSON report here")
+    parser.add_argument("--baseline", help="Baseline JSON report to compare against")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.10,
+        help="Allowed p95/p99 regression as a fraction (default: 0.10)",
+    )
+    args = parser.parse_args()
+
+    report = load_stats(Path(args.stats_csv))
+    rendered = json.dumps(report, indent=2, sort_keys=True)
+    if args.output:
+        Path(args.output).write_text(rendered + "\n", encoding="utf-8")
+    else:
+        print(rendered)
+
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text(encoding="utf-8"))
+        regressions = compare(report, baseline, args.threshold)
+        if regressions:
+            print("Performance regressions:", file=sys.stderr)
+            for line in regressions:
+                print(f"  {line}", file=sys.stderr)
+            sys.exit(1)
+        print("No regressions against baseline.")
+
+
+if __name__ == "__main__":
+    main()
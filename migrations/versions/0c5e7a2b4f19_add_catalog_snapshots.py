@@ -0,0 +1,54 @@
+"""add catalog snapshots
+
+Revision ID: 0c5e7a2b4f19
+Revises: e61f0b3d9a28
+Create Date: 2025-09-17 14:31:58.019644
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = "0c5e7a2b4f19"
+down_revision = "e61f0b3d9a28"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "catalog_snapshots",
+        sa.Column("version", sa.String(), primary_key=True),
+        sa.Column("key", sa.String(), nullable=False),
+        sa.Column("size_bytes", sa.Integer(), nullable=False),
+        sa.Column("exercise_count", sa.Integer(), nullable=False),
+        sa.Column(
+            "deltas",
+            postgresql.JSONB(),
+            nullable=False,
+            server_default=sa.text("'{}'::jsonb"),
+        ),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.Column(
+            "updated_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+    )
+    op.create_index(
+        "ix_catalog_snapshots_created_at", "catalog_snapshots", ["created_at"]
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_catalog_snapshots_created_at", table_name="catalog_snapshots")
+    op.drop_table("catalog_snapshots")
@@ -0,0 +1,219 @@
+"""create workout tables
+
+Revision ID: 2c7e5a9f4d18
+Revises: 525d23801613
+Create Date: 2025-08-20 13:41:09.527316
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = "2c7e5a9f4d18"
+down_revision = "525d23801613"
+branch_labels = None
+depends_on = None
+
+# Enum columns store member names
+WORKOUT_DIFFICULTY = ("BEGINNER", "INTERMEDIATE", "ADVANCED")
+WORKOUT_STATUS = ("NOT_STARTED", "IN_PROGRESS", "COMPLETED", "ABANDONED")
+
+
+def _timestamps():
+    return (
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.Column(
+            "updated_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+    )
+
+
+def _created_here(bind) -> bool:
+    # create_all left Postgres' default constraint names (workouts_created_by_id_fkey);
+    # only this revision names them explicitly
+    return any(
+        fk["name"] == "fk_workouts_created_by_id_users"
+        for fk in sa.inspect(bind).get_foreign_keys("workouts")
+    )
+
+
+def upgrade() -> None:
+    # Databases set up before this revision existed got these tables from
+    # Base.metadata.create_all; leave theirs alone
+    bind = op.get_bind()
+    if sa.inspect(bind).has_table("workouts"):
+        return
+
+    sa.Enum(*WORKOUT_DIFFICULTY, name="workoutdifficulty").create(bind, checkfirst=True)
+    sa.Enum(*WORKOUT_STATUS, name="workoutstatus").create(bind, checkfirst=True)
+
+    # --- workouts ---
+    op.create_table(
+        "workouts",
+        sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True),
+        *_timestamps(),
+        sa.Column("name", sa.String(), nullable=False),
+        sa.Column("description", sa.Text(), nullable=True),
+        sa.Column(
+            "difficulty",
+            postgresql.ENUM(name="workoutdifficulty", create_type=False),
+            nullable=False,
+        ),
+        sa.Column("estimated_duration", sa.Integer(), nullable=True),
+        sa.Column("calories_burn_estimate", sa.Integer(), nullable=True),
+        sa.Column("is_public", sa.Boolean(), nullable=True),
+        sa.Column("is_template", sa.Boolean(), nullable=True),
+        sa.Column("created_by_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["created_by_id"],
+            ["users.id"],
+            name="fk_workouts_created_by_id_users",
+        ),
+    )
+
+    # --- workout_exercises ---
+    op.create_table(
+        "workout_exercises",
+        sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True),
+        *_timestamps(),
+        sa.Column("workout_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("exercise_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("order", sa.Integer(), nullable=False),
+        sa.Column("sets", sa.Integer(), nullable=False),
+        sa.Column("reps", sa.Integer(), nullable=True),
+        sa.Column("duration", sa.Integer(), nullable=True),
+        sa.Column("rest_duration", sa.Integer(), nullable=True),
+        sa.Column("notes", sa.Text(), nullable=True),
+        sa.Column("rep_scheme", postgresql.JSONB(), nullable=True),
+        sa.ForeignKeyConstraint(
+            ["workout_id"],
+            ["workouts.id"],
+            name="fk_workout_exercises_workout_id_workouts",
+        ),
+        sa.ForeignKeyConstraint(
+            ["exercise_id"],
+            ["exercise_catalog.id"],
+            name="fk_workout_exercises_exercise_id_exercise_catalog",
+        ),
+    )
+
+    # --- workout plans ---
+    op.create_table(
+        "workout_plans",
+        sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True),
+        *_timestamps(),
+        sa.Column("name", sa.String(), nullable=False),
+        sa.Column("description", sa.Text(), nullable=True),
+        sa.Column("duration_weeks", sa.Integer(), nullable=False),
+        sa.Column(
+            "difficulty",
+            postgresql.ENUM(name="workoutdifficulty", create_type=False),
+            nullable=False,
+        ),
+        sa.Column("is_public", sa.Boolean(), nullable=True),
+        sa.Column("created_by_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["created_by_id"],
+            ["users.id"],
+            name="fk_workout_plans_created_by_id_users",
+        ),
+    )
+    op.create_table(
+        "workout_plan_workouts",
+        sa.Column("workout_plan_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("workout_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("week_number", sa.Integer(), nullable=False),
+        sa.Column("day_number", sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint("workout_plan_id", "workout_id"),
+        sa.ForeignKeyConstraint(
+            ["workout_plan_id"],
+            ["workout_plans.id"],
+            name="fk_workout_plan_workouts_workout_plan_id_workout_plans",
+        ),
+        sa.ForeignKeyConstraint(
+            ["workout_id"],
+            ["workouts.id"],
+            name="fk_workout_plan_workouts_workout_id_workouts",
+        ),
+    )
+
+    # --- workout_sessions ---
+    op.create_table(
+        "workout_sessions",
+        sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True),
+        *_timestamps(),
+        sa.Column("user_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("workout_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("start_time", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("end_time", sa.DateTime(timezone=True), nullable=True),
+        sa.Column(
+            "status",
+            postgresql.ENUM(name="workoutstatus", create_type=False),
+            nullable=False,
+        ),
+        sa.Column("notes", sa.Text(), nullable=True),
+        sa.Column("total_duration", sa.Integer(), nullable=True),
+        sa.Column("calories_burned", sa.Integer(), nullable=True),
+        sa.Column("mood_rating", sa.Integer(), nullable=True),
+        sa.Column("difficulty_rating", sa.Integer(), nullable=True),
+        sa.ForeignKeyConstraint(
+            ["user_id"],
+            ["users.id"],
+            name="fk_workout_sessions_user_id_users",
+        ),
+        sa.ForeignKeyConstraint(
+            ["workout_id"],
+            ["workouts.id"],
+            name="fk_workout_sessions_workout_id_workouts",
+        ),
+    )
+
+    # --- exercise_sets (indexed in 3f6b2c8e1a47, partitioned in 6d2f8b4e9a13) ---
+    op.create_table(
+        "exercise_sets",
+        sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True),
+        *_timestamps(),
+        sa.Column("workout_session_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("workout_exercise_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("set_number", sa.Integer(), nullable=False),
+        sa.Column("reps", sa.Integer(), nullable=True),
+        sa.Column("weight", sa.Float(), nullable=True),
+        sa.Column("duration", sa.Integer(), nullable=True),
+        sa.Column("rpe", sa.Integer(), nullable=True),
+        sa.Column("notes", sa.Text(), nullable=True),
+        sa.ForeignKeyConstraint(
+            ["workout_session_id"],
+            ["workout_sessions.id"],
+            name="fk_exercise_sets_workout_session_id_workout_sessions",
+        ),
+        sa.ForeignKeyConstraint(
+            ["workout_exercise_id"],
+            ["workout_exercises.id"],
+            name="fk_exercise_sets_workout_exercise_id_workout_exercises",
+        ),
+    )
+
+
+def downgrade() -> None:
+    # Tables that predate this revision stay, as upgrade() didn't create them
+    if not _created_here(op.get_bind()):
+        return
+    op.drop_table("exercise_sets")
+    op.drop_table("workout_sessions")
+    op.drop_table("workout_plan_workouts")
+    op.drop_table("workout_plans")
+    op.drop_table("workout_exercises")
+    op.drop_table("workouts")
+    sa.Enum(name="workoutstatus").drop(op.get_bind(), checkfirst=True)
+    sa.Enum(name="workoutdifficulty").drop(op.get_bind(), checkfirst=True)
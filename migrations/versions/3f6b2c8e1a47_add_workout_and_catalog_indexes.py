@@ -0,0 +1,172 @@
+"""add workout and catalog indexes
+
+Revision ID: 3f6b2c8e1a47
+Revises: 2c7e5a9f4d18
+Create Date: 2025-09-02 10:14:52.118402
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "3f6b2c8e1a47"
+down_revision = "2c7e5a9f4d18"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # --- workouts ---
+    # WorkoutService.list_workouts: created_by_id = :user OR is_public = true
+    # PlanLimitService.check_workout_limit: created_by_id = :user AND NOT is_template
+    op.create_index(
+        "ix_workouts_created_by_id_is_template",
+        "workouts",
+        ["created_by_id", "is_template"],
+    )
+    op.create_index(
+        "ix_workouts_public_difficulty",
+        "workouts",
+        ["difficulty"],
+        postgresql_where=sa.text("is_public = true"),
+    )
+
+    # --- workout_exercises ---
+    # loading a workout's exercises, record_exercise_set's (id, workout_id) check
+    op.create_index(
+        "ix_workout_exercises_workout_id_order",
+        "workout_exercises",
+        ["workout_id", "order"],
+    )
+    op.create_index(
+        "ix_workout_exercises_exercise_id", "workout_exercises", ["exercise_id"]
+    )
+
+    # --- workout plans ---
+    op.create_index(
+        "ix_workout_plans_created_by_id", "workout_plans", ["created_by_id"]
+    )
+    op.create_index(
+        "ix_workout_plan_workouts_workout_id", "workout_plan_workouts", ["workout_id"]
+    )
+
+    # --- workout_sessions ---
+    op.create_index(
+        "ix_workout_sessions_user_id_status", "workout_sessions", ["user_id", "status"]
+    )
+    op.create_index(
+        "ix_workout_sessions_workout_id", "workout_sessions", ["workout_id"]
+    )
+    # Only one in-progress session per user. Enum columns store member names.
+    # Close out any duplicates left by the old check-then-insert race first,
+    # keeping each user's most recent session (start_time is nullable, so
+    # fall back to created_at and id).
+    op.execute(
+        """
+        UPDATE workout_sessions ws
+        SET status = 'ABANDONED', end_time = COALESCE(ws.end_time, now())
+        FROM (
+            SELECT id, row_number() OVER (
+                PARTITION BY user_id
+                ORDER BY start_time DESC NULLS LAST, created_at DESC, id DESC
+            ) AS rank
+            FROM workout_sessions
+            WHERE status = 'IN_PROGRESS'
+        ) ranked
+        WHERE ws.id = ranked.id AND ranked.rank > 1
+        """
+    )
+    op.create_index(
+        "uq_workout_sessions_user_in_progress",
+        "workout_sessions",
+        ["user_id"],
+        unique=True,
+        postgresql_where=sa.text("status = 'IN_PROGRESS'"),
+    )
+
+    # --- exercise_sets ---
+    op.create_index(
+        "ix_exercise_sets_workout_session_id", "exercise_sets", ["workout_session_id"]
+    )
+    op.create_index(
+        "ix_exercise_sets_workout_exercise_id", "exercise_sets", ["workout_exercise_id"]
+    )
+
+    # --- exercise_catalog ---
+    # ExerciseService.list_exercises filters on category_id / difficulty / is_custom
+    op.create_index(
+        "ix_exercise_catalog_category_id_difficulty",
+        "exercise_catalog",
+        ["category_id", "difficulty"],
+    )
+    op.create_index(
+        "ix_exercise_catalog_system_difficulty",
+        "exercise_catalog",
+        ["difficulty"],
+        postgresql_where=sa.text("is_custom = false"),
+    )
+    op.create_index(
+        "ix_exercise_catalog_created_by_id",
+        "exercise_catalog",
+        ["created_by_id"],
+        postgresql_where=sa.text("created_by_id IS NOT NULL"),
+    )
+
+    # --- junction tables: the PK covers (exercise_id, x); index the reverse side ---
+    op.create_index(
+        "ix_exercise_muscle_groups_muscle_group_id",
+        "exercise_muscle_groups",
+        ["muscle_group_id"],
+    )
+    op.create_index(
+        "ix_exercise_equipment_equipment_id", "exercise_equipment", ["equipment_id"]
+    )
+    op.create_index(
+        "ix_exercise_movement_patterns_movement_pattern_id",
+        "exercise_movement_patterns",
+        ["movement_pattern_id"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(
+        "ix_exercise_movement_patterns_movement_pattern_id",
+        table_name="exercise_movement_patterns",
+    )
+    op.drop_index(
+        "ix_exercise_equipment_equipment_id", table_name="exercise_equipment"
+    )
+    op.drop_index(
+        "ix_exercise_muscle_groups_muscle_group_id",
+        table_name="exercise_muscle_groups",
+    )
+    op.drop_index("ix_exercise_catalog_created_by_id", table_name="exercise_catalog")
+    op.drop_index(
+        "ix_exercise_catalog_system_difficulty", table_name="exercise_catalog"
+    )
+    op.drop_index(
+        "ix_exercise_catalog_category_id_difficulty", table_name="exercise_catalog"
+    )
+    op.drop_index(
+        "ix_exercise_sets_workout_exercise_id", table_name="exercise_sets"
+    )
+    op.drop_index("ix_exercise_sets_workout_session_id", table_name="exercise_sets")
+    op.drop_index(
+        "uq_workout_sessions_user_in_progress", table_name="workout_sessions"
+    )
+    op.drop_index("ix_workout_sessions_workout_id", table_name="workout_sessions")
+    op.drop_index("ix_workout_sessions_user_id_status", table_name="workout_sessions")
+    op.drop_index(
+        "ix_workout_plan_workouts_workout_id", table_name="workout_plan_workouts"
+    )
+    op.drop_index("ix_workout_plans_created_by_id", table_name="workout_plans")
+    op.drop_index(
+        "ix_workout_exercises_exercise_id", table_name="workout_exercises"
+    )
+    op.drop_index(
+        "ix_workout_exercises_workout_id_order", table_name="workout_exercises"
+    )
+    op.drop_index("ix_workouts_public_difficulty", table_name="workouts")
+    op.drop_index("ix_workouts_created_by_id_is_template", table_name="workouts")
@@ -0,0 +1,27 @@
+"""add user google_sub
+
+Revision ID: 5a9e3c7d1b60
+Revises: 0c5e7a2b4f19
+Create Date: 2025-09-19 10:12:44.301876
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "5a9e3c7d1b60"
+down_revision = "0c5e7a2b4f19"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("users", sa.Column("google_sub", sa.String(), nullable=True))
+    op.create_unique_constraint("uq_users_google_sub", "users", ["google_sub"])
+
+
+def downgrade() -> None:
+    op.drop_constraint("uq_users_google_sub", "users", type_="unique")
+    op.drop_column("users", "google_sub")
@@ -0,0 +1,155 @@
+"""partition exercise_sets by month
+
+Revision ID: 6d2f8b4e9a13
+Revises: 5a9e3c7d1b60
+Create Date: 2025-09-24 09:38:17.552310
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = "6d2f8b4e9a13"
+down_revision = "5a9e3c7d1b60"
+branch_labels = None
+depends_on = None
+
+COLUMNS = (
+    "id, created_at, updated_at, workout_session_id, workout_exercise_id, "
+    "set_number, reps, weight, duration, rpe, notes"
+)
+
+# Must match PARTITION_MONTHS_AHEAD's default; app/services/partitions.py
+# keeps creating them from here on
+MONTHS_AHEAD = 3
+
+
+def _create_exercise_sets(**kwargs) -> None:
+    op.create_table(
+        "exercise_sets",
+        sa.Column("id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.Column(
+            "updated_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.Column("workout_session_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("workout_exercise_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("set_number", sa.Integer(), nullable=False),
+        sa.Column("reps", sa.Integer(), nullable=True),
+        sa.Column("weight", sa.Float(), nullable=True),
+        sa.Column("duration", sa.Integer(), nullable=True),
+        sa.Column("rpe", sa.Integer(), nullable=True),
+        sa.Column("notes", sa.Text(), nullable=True),
+        sa.ForeignKeyConstraint(
+            ["workout_session_id"],
+            ["workout_sessions.id"],
+            name="fk_exercise_sets_workout_session_id_workout_sessions",
+        ),
+        sa.ForeignKeyConstraint(
+            ["workout_exercise_id"],
+            ["workout_exercises.id"],
+            name="fk_exercise_sets_workout_exercise_id_workout_exercises",
+        ),
+        **kwargs,
+    )
+
+
+def _index_exercise_sets(primary_key) -> None:
+    # Built after the copy; on the partitioned table each one cascades to
+    # every partition
+    op.create_primary_key("exercise_sets_pkey", "exercise_sets", primary_key)
+    op.create_index(
+        "ix_exercise_sets_workout_session_id", "exercise_sets", ["workout_session_id"]
+    )
+    op.create_index(
+        "ix_exercise_sets_workout_exercise_id", "exercise_sets", ["workout_exercise_id"]
+    )
+
+
+def upgrade() -> None:
+    # A foreign key into a partitioned table must cover the partition key
+    op.drop_constraint(
+        "fk_personal_records_exercise_set_id_exercise_sets",
+        "personal_records",
+        type_="foreignkey",
+    )
+    op.rename_table("exercise_sets", "exercise_sets_unpartitioned")
+
+    _create_exercise_sets(postgresql_partition_by="RANGE (created_at)")
+
+    # One partition per month from the oldest set through MONTHS_AHEAD
+    op.execute(
+        f"""
+        DO $$
+        DECLARE
+            bound date := date_trunc(
+                'month',
+                coalesce((SELECT min(created_at) FROM exercise_sets_unpartitioned), now())
+            )::date;
+            last_bound date := (date_trunc('month', now()) + interval '{MONTHS_AHEAD} months')::date;
+        BEGIN
+            WHILE bound <= last_bound LOOP
+                EXECUTE format(
+                    'CREATE TABLE %I PARTITION OF exercise_sets FOR VALUES FROM (%L) TO (%L)',
+                    'exercise_sets_p' || to_char(bound, 'YYYY_MM'),
+                    bound,
+                    (bound + interval '1 month')::date
+                );
+                bound := (bound + interval '1 month')::date;
+            END LOOP;
+        END $$;
+        """
+    )
+
+    op.execute(
+        f"INSERT INTO exercise_sets ({COLUMNS}) "
+        f"SELECT {COLUMNS} FROM exercise_sets_unpartitioned"
+    )
+    op.drop_table("exercise_sets_unpartitioned")
+    _index_exercise_sets(["id", "created_at"])
+
+
+def downgrade() -> None:
+    # Partitions already detached into the archive schema are left there
+    op.rename_table("exercise_sets", "exercise_sets_partitioned")
+    op.drop_constraint(
+        "fk_exercise_sets_workout_session_id_workout_sessions",
+        "exercise_sets_partitioned",
+        type_="foreignkey",
+    )
+    op.drop_constraint(
+        "fk_exercise_sets_workout_exercise_id_workout_exercises",
+        "exercise_sets_partitioned",
+        type_="foreignkey",
+    )
+    op.drop_constraint("exercise_sets_pkey", "exercise_sets_partitioned", type_="primary")
+    op.drop_index("ix_exercise_sets_workout_session_id", table_name="exercise_sets_partitioned")
+    op.drop_index("ix_exercise_sets_workout_exercise_id", table_name="exercise_sets_partitioned")
+
+    _create_exercise_sets()
+    op.execute(
+        f"INSERT INTO exercise_sets ({COLUMNS}) "
+        f"SELECT {COLUMNS} FROM exercise_sets_partitioned"
+    )
+    op.drop_table("exercise_sets_partitioned")
+    _index_exercise_sets(["id"])
+
+    op.create_foreign_key(
+        "fk_personal_records_exercise_set_id_exercise_sets",
+        "personal_records",
+        "exercise_sets",
+        ["exercise_set_id"],
+        ["id"],
+        ondelete="SET NULL",
+    )
@@ -0,0 +1,138 @@
+"""add plan enrollments and scheduled workouts
+
+Revision ID: 7b1d4e9a2c53
+Revises: 3f6b2c8e1a47
+Create Date: 2025-09-09 16:22:07.504913
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = "7b1d4e9a2c53"
+down_revision = "3f6b2c8e1a47"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # --- plan_enrollments ---
+    op.create_table(
+        "plan_enrollments",
+        sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column("user_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("workout_plan_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("start_date", sa.Date(), nullable=False),
+        sa.Column(
+            "status",
+            sa.Enum("ACTIVE", "COMPLETED", "CANCELLED", name="enrollmentstatus"),
+            nullable=False,
+        ),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.Column(
+            "updated_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.ForeignKeyConstraint(
+            ["user_id"],
+            ["users.id"],
+            name="fk_plan_enrollments_user_id_users",
+        ),
+        sa.ForeignKeyConstraint(
+            ["workout_plan_id"],
+            ["workout_plans.id"],
+            name="fk_plan_enrollments_workout_plan_id_workout_plans",
+        ),
+    )
+    op.create_index(
+        "ix_plan_enrollments_user_id_status", "plan_enrollments", ["user_id", "status"]
+    )
+    op.create_index(
+        "uq_plan_enrollments_user_plan_active",
+        "plan_enrollments",
+        ["user_id", "workout_plan_id"],
+        unique=True,
+        postgresql_where=sa.text("status = 'ACTIVE'"),
+    )
+
+    # --- scheduled_workouts ---
+    op.create_table(
+        "scheduled_workouts",
+        sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column("enrollment_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("user_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("workout_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("scheduled_date", sa.Date(), nullable=False),
+        sa.Column("week_number", sa.Integer(), nullable=False),
+        sa.Column("day_number", sa.Integer(), nullable=False),
+        sa.Column("workout_session_id", postgresql.UUID(as_uuid=True), nullable=True),
+        sa.Column("completed_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.Column(
+            "updated_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.ForeignKeyConstraint(
+            ["enrollment_id"],
+            ["plan_enrollments.id"],
+            name="fk_scheduled_workouts_enrollment_id_plan_enrollments",
+            ondelete="CASCADE",
+        ),
+        sa.ForeignKeyConstraint(
+            ["user_id"],
+            ["users.id"],
+            name="fk_scheduled_workouts_user_id_users",
+        ),
+        sa.ForeignKeyConstraint(
+            ["workout_id"],
+            ["workouts.id"],
+            name="fk_scheduled_workouts_workout_id_workouts",
+        ),
+        sa.ForeignKeyConstraint(
+            ["workout_session_id"],
+            ["workout_sessions.id"],
+            name="fk_scheduled_workouts_workout_session_id_workout_sessions",
+            ondelete="SET NULL",
+        ),
+    )
+    op.create_index(
+        "ix_scheduled_workouts_user_id_scheduled_date",
+        "scheduled_workouts",
+        ["user_id", "scheduled_date"],
+    )
+    op.create_index(
+        "ix_scheduled_workouts_enrollment_id", "scheduled_workouts", ["enrollment_id"]
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(
+        "ix_scheduled_workouts_enrollment_id", table_name="scheduled_workouts"
+    )
+    op.drop_index(
+        "ix_scheduled_workouts_user_id_scheduled_date", table_name="scheduled_workouts"
+    )
+    op.drop_table("scheduled_workouts")
+    op.drop_index(
+        "uq_plan_enrollments_user_plan_active", table_name="plan_enrollments"
+    )
+    op.drop_index("ix_plan_enrollments_user_id_status", table_name="plan_enrollments")
+    op.drop_table("plan_enrollments")
+    sa.Enum(name="enrollmentstatus").drop(op.get_bind(), checkfirst=True)
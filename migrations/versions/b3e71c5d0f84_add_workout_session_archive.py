@@ -0,0 +1,30 @@
+"""add workout session archive columns
+
+Revision ID: b3e71c5d0f84
+Revises: 6d2f8b4e9a13
+Create Date: 2025-09-26 15:02:31.804117
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "b3e71c5d0f84"
+down_revision = "6d2f8b4e9a13"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "workout_sessions",
+        sa.Column("archived_at", sa.DateTime(timezone=True), nullable=True),
+    )
+    op.add_column("workout_sessions", sa.Column("archive_key", sa.String(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("workout_sessions", "archive_key")
+    op.drop_column("workout_sessions", "archived_at")
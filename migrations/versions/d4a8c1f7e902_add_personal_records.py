@@ -0,0 +1,92 @@
+"""add personal records
+
+Revision ID: d4a8c1f7e902
+Revises: 7b1d4e9a2c53
+Create Date: 2025-09-12 11:03:41.772650
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = "d4a8c1f7e902"
+down_revision = "7b1d4e9a2c53"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "personal_records",
+        sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column("user_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("exercise_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column(
+            "record_type",
+            sa.Enum(
+                "MAX_WEIGHT",
+                "MAX_REPS_AT_WEIGHT",
+                "ESTIMATED_1RM",
+                "MAX_VOLUME",
+                name="personalrecordtype",
+            ),
+            nullable=False,
+        ),
+        sa.Column(
+            "scope_weight", sa.Float(), nullable=False, server_default=sa.text("0")
+        ),
+        sa.Column("value", sa.Float(), nullable=False),
+        sa.Column("weight", sa.Float(), nullable=True),
+        sa.Column("reps", sa.Integer(), nullable=True),
+        sa.Column("exercise_set_id", postgresql.UUID(as_uuid=True), nullable=True),
+        sa.Column("workout_session_id", postgresql.UUID(as_uuid=True), nullable=True),
+        sa.Column("achieved_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.Column(
+            "updated_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.ForeignKeyConstraint(
+            ["user_id"], ["users.id"], name="fk_personal_records_user_id_users"
+        ),
+        sa.ForeignKeyConstraint(
+            ["exercise_id"],
+            ["exercise_catalog.id"],
+            name="fk_personal_records_exercise_id_exercise_catalog",
+        ),
+        sa.ForeignKeyConstraint(
+            ["exercise_set_id"],
+            ["exercise_sets.id"],
+            name="fk_personal_records_exercise_set_id_exercise_sets",
+            ondelete="SET NULL",
+        ),
+        sa.ForeignKeyConstraint(
+            ["workout_session_id"],
+            ["workout_sessions.id"],
+            name="fk_personal_records_workout_session_id_workout_sessions",
+            ondelete="SET NULL",
+        ),
+        # Also serves "all records for a user (and exercise)" lookups
+        sa.UniqueConstraint(
+            "user_id",
+            "exercise_id",
+            "record_type",
+            "scope_weight",
+            name="uq_personal_records_user_exercise_type_scope",
+        ),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("personal_records")
+    sa.Enum(name="personalrecordtype").drop(op.get_bind(), checkfirst=True)
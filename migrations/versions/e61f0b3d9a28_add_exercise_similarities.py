@@ -0,0 +1,45 @@
+"""add exercise similarities
+
+Revision ID: e61f0b3d9a28
+Revises: d4a8c1f7e902
+Create Date: 2025-09-15 09:48:16.230187
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = "e61f0b3d9a28"
+down_revision = "d4a8c1f7e902"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "exercise_similarities",
+        sa.Column("exercise_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("rank", sa.Integer(), nullable=False),
+        sa.Column("similar_exercise_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("score", sa.Float(), nullable=False),
+        sa.PrimaryKeyConstraint("exercise_id", "rank"),
+        sa.ForeignKeyConstraint(
+            ["exercise_id"],
+            ["exercise_catalog.id"],
+            name="fk_exercise_similarities_exercise_id_exercise_catalog",
+            ondelete="CASCADE",
+        ),
+        sa.ForeignKeyConstraint(
+            ["similar_exercise_id"],
+            ["exercise_catalog.id"],
+            name="fk_exercise_similarities_similar_exercise_id_exercise_catalog",
+            ondelete="CASCADE",
+        ),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("exercise_similarities")
@@ -0,0 +1,40 @@
+"""add workout session history index
+
+Revision ID: e8c4a1f6d237
+Revises: b3e71c5d0f84
+Create Date: 2025-09-29 11:47:05.239814
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "e8c4a1f6d237"
+down_revision = "b3e71c5d0f84"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # WorkoutService.list_session_history: user_id = :user ORDER BY
+    # start_time DESC, id DESC, reading only the included columns.
+    # Built concurrently so session writes aren't blocked meanwhile.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_workout_sessions_user_id_start_time",
+            "workout_sessions",
+            ["user_id", sa.text("start_time DESC"), sa.text("id DESC")],
+            postgresql_include=["status", "total_duration", "workout_id"],
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_workout_sessions_user_id_start_time",
+            table_name="workout_sessions",
+            postgresql_concurrently=True,
+        )
@@ -0,0 +1,26 @@
+"""add exercise_sets default partition
+
+Revision ID: f1a9d3c6b258
+Revises: e8c4a1f6d237
+Create Date: 2025-10-02 09:21:46.713520
+
+"""
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "f1a9d3c6b258"
+down_revision = "e8c4a1f6d237"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Catches rows for months without a partition instead of failing the
+    # insert; PartitionService moves them out when the month is created
+    op.execute("CREATE TABLE exercise_sets_default PARTITION OF exercise_sets DEFAULT")
+
+
+def downgrade() -> None:
+    op.execute("DROP TABLE exercise_sets_default")
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Pick password hashing costs that fit a target verify latency on this machine.
+
+Run it on the hardware that serves logins. For bcrypt it tries increasing
+rounds; for argon2id it keeps the memory cost fixed (that bounds memory
+per concurrent login) and raises the time cost. It prints the highest cost
+whose median verify time stays within the target, as settings to copy
+into the environment.
+
+    python scripts/calibrate_password_hash.py --scheme argon2 --target-ms 250
+"""
+
+import argparse
+import statistics
+import time
+
+from app.core.security import build_crypt_context
+
+SAMPLE_PASSWORD = "correct horse battery staple"
+
+
+def median_verify_ms(context, samples: int) -> float:
+    hashed = context.hash(SAMPLE_PASSWORD)
+    timings = []
+    for _ in range(samples):
+        started = time.perf_counter()
+        context.verify(SAMPLE_PASSWORD, hashed)
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings)
+
+
+def calibrate_bcrypt(target_ms: float, samples: int) -> dict:
+    best = None
+    for rounds in range(10, 18):
+        elapsed = median_verify_ms(build_crypt_context("bcrypt", bcrypt_rounds=rounds), samples)
+        print(f"  bcrypt rounds={rounds}: {elapsed:.1f} ms")
+        if elapsed > target_ms:
+            break
+        best = {"BCRYPT_ROUNDS": rounds}
+    return best
+
+
+def calibrate_argon2(target_ms: float, samples: int, memory_cost: int, parallelism: int) -> dict:
+    best = None
+    for time_cost in range(1, 11):
+        context = build_crypt_context(
+            "argon2",
+            argon2_time_cost=time_cost,
+            argon2_memory_cost=memory_cost,
+            argon2_parallelism=parallelism,
+        )
+        elapsed = median_verify_ms(context, samples)
+        print(f"  argon2id t={time_cost} m={memory_cost}KiB p={parallelism}: {elapsed:.1f} ms")
+        if elapsed > target_ms:
+            break
+        best = {
+            "ARGON2_TIME_COST": time_cost,
+            "ARGON2_MEMORY_COST": memory_cost,
+            "ARGON2_PARALLELISM": parallelism,
+        }
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Calibrate password hashing cost")
+    parser.add_argument("--scheme", choices=["bcrypt", "argon2"], default="bcrypt")
+    parser.add_argument("--target-ms", type=float, default=250.0, help="Max median verify time")
+    parser.add_argument("--samples", type=int, default=5, help="Verifies timed per cost")
+    parser.add_argument(
+        "--memory-cost",
+        type=int,
+        default=19456,
+        help="argon2 memory per hash in KiB",
+    )
+    parser.add_argument("--parallelism", type=int, default=1, help="argon2 lanes")
+    args = parser.parse_args()
+
+    print(f"Calibrating {args.scheme} for a {args.target_ms:.0f} ms verify budget")
+    if args.scheme == "bcrypt":
+        best = calibrate_bcrypt(args.target_ms, args.samples)
+    else:
+        best = calibrate_argon2(args.target_ms, args.samples, args.memory_cost, args.parallelism)
+
+    if not best:
+        print("Even the cheapest cost exceeds the target; raise --target-ms")
+        return
+    print()
+    print(f"PASSWORD_HASH_SCHEME={args.scheme}")
+    for name, value in best.items():
+        print(f"{name}={value}")
+
+
+if __name__ == "__main__":
+    main()
@@ -26,6 +26,8 @@ from app.models.exercise import (
 )
 import mimetypes
 from app.config.settings import get_settings
+from app.services.catalog_snapshot import CatalogSnapshotService
+from app.services.exercise_similarity import ExerciseSimilarityService
 from app.services.s3 import S3Service
 
 settings = get_settings()
@@ -245,6 +247,16 @@ def main():
         action="store_true",
         help="Assume bucket is public-read; URLs formed as https://bucket.s3.amazonaws.com/key",
     )
+    parser.add_argument(
+        "--skip-similarity",
+        action="store_true",
+        help="Don't rebuild the exercise similarity index after importing",
+    )
+    parser.add_argument(
+        "--skip-snapshot",
+        action="store_true",
+        help="Don't publish a catalog snapshot to S3 after importing",
+    )
     args = parser.parse_args()
 
     engine = create_engine(args.db_url)
@@ -459,6 +471,14 @@ def main():
 
         session.commit()
         print(f"Done. Upserted {created_count} exercises.")
+
+        if not args.skip_similarity:
+            written = ExerciseSimilarityService.rebuild(session)
+            print(f"Rebuilt exercise similarity index ({written} neighbour rows).")
+
+        if not args.skip_snapshot:
+            snapshot = CatalogSnapshotService.publish(session, s3)
+            print(f"Published catalog snapshot {snapshot.version} ({snapshot.size_bytes} bytes).")
     except Exception as e:
         session.rollback()
         raise
@@ -0,0 +1,65 @@
+"""
+Plan-limit checks run a query per call, so these need a real Postgres
+(set TEST_POSTGRES_URL to a scratch database).
+"""
+
+import os
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+from app.core.security import get_password_hash
+from app.db.base import Base
+from app.models.subscription import Plan, PlanType, Subscription, PLAN_FEATURES
+from app.models.user import User
+import app.models.workout  # noqa: F401  (register tables on Base.metadata)
+from app.services.plan_limits import PlanLimitService
+
+TEST_POSTGRES_URL = os.getenv("TEST_POSTGRES_URL")
+
+pytestmark = pytest.mark.skipif(
+    not TEST_POSTGRES_URL, reason="TEST_POSTGRES_URL not set"
+)
+
+
+@pytest.fixture()
+def db():
+    engine = create_engine(TEST_POSTGRES_URL)
+    Base.metadata.create_all(bind=engine)
+    with Session(engine, expire_on_commit=False) as session:
+        yield session
+    Base.metadata.drop_all(bind=engine)
+    engine.dispose()
+
+
+@pytest.fixture()
+def subscribed_user(db: Session) -> User:
+    user = User(
+        email="bench@example.com",
+        username="benchuser",
+        hashed_password=get_password_hash("Bench@1234"),
+    )
+    plan = Plan(
+        name="Plus Plan",
+        type=PlanType.PLUS.value,
+        price=999,
+        features=PLAN_FEATURES[PlanType.PLUS],
+    )
+    db.add_all([user, plan])
+    db.flush()
+    db.add(Subscription(user_id=user.id, plan_id=plan.id, is_active=True))
+    db.commit()
+    return user
+
+
+def test_check_custom_exercise_permission(benchmark, db: Session, subscribed_user: User):
+    allowed = benchmark(PlanLimitService.check_custom_exercise_permission, db, subscribed_user)
+    assert allowed is True
+
+
+def test_check_workout_limit(benchmark, db: Session, subscribed_user: User):
+    benchmark(PlanLimitService.check_workout_limit, db, subscribed_user)
+
+
+def test_check_plan_limit(benchmark, db: Session, subscribed_user: User):
+    benchmark(PlanLimitService.check_plan_limit, db, subscribed_user)
@@ -0,0 +1,222 @@
+import json
+import uuid
+from collections import defaultdict
+from datetime import datetime
+from types import SimpleNamespace
+from typing import List
+
+import pytest
+from pydantic import TypeAdapter
+
+from app.core.responses import FastJSONResponse
+from app.models.exercise import DifficultyLevel
+from app.models.workout import WorkoutDifficulty
+from app.schemas.exercise import Exercise
+from app.schemas.workout import Workout
+from app.services import row_serializers
+
+NOW = datetime(2025, 1, 1, 12, 0, 0)
+
+
+def lookup(name: str) -> SimpleNamespace:
+    return SimpleNamespace(
+        id=uuid.uuid4(), name=name, description=None, created_at=NOW, updated_at=NOW
+    )
+
+
+def make_exercise(i: int) -> SimpleNamespace:
+    return SimpleNamespace(
+        id=uuid.uuid4(),
+        name=f"Exercise {i}",
+        description="A compound movement",
+        instructions="\n".join(f"Step {n}: keep your core braced" for n in range(6)),
+        difficulty="intermediate",
+        category_id=uuid.uuid4(),
+        video_url=None,
+        image_urls=[f"https://cdn.example.com/exercises/{i}/{n}.jpg" for n in range(2)],
+        is_custom=False,
+        created_by_id=None,
+        created_at=NOW,
+        updated_at=NOW,
+        category=lookup("strength"),
+        muscle_groups=[lookup("chest"), lookup("triceps")],
+        equipment=[lookup("barbell")],
+    )
+
+
+def make_workout_exercise(workout_id, n: int) -> SimpleNamespace:
+    exercise = make_exercise(n)
+    return SimpleNamespace(
+        id=uuid.uuid4(),
+        workout_id=workout_id,
+        exercise_id=exercise.id,
+        order=n + 1,
+        sets=4,
+        reps=8,
+        duration=None,
+        rest_duration=90,
+        notes=None,
+        rep_scheme=None,
+        exercise=exercise,
+        created_at=NOW,
+        updated_at=NOW,
+    )
+
+
+def make_workout(i: int, exercises_per_workout: int = 8) -> SimpleNamespace:
+    workout_id = uuid.uuid4()
+    return SimpleNamespace(
+        id=workout_id,
+        name=f"Workout {i}",
+        description=None,
+        difficulty="intermediate",
+        estimated_duration=60,
+        calories_burn_estimate=400,
+        is_public=True,
+        is_template=False,
+        created_by_id=uuid.uuid4(),
+        created_at=NOW,
+        updated_at=NOW,
+        exercises=[
+            make_workout_exercise(workout_id, n) for n in range(exercises_per_workout)
+        ],
+    )
+
+
+@pytest.fixture(scope="module")
+def exercise_page():
+    return [make_exercise(i) for i in range(100)]
+
+
+@pytest.fixture(scope="module")
+def workout_page():
+    return [make_workout(i) for i in range(100)]
+
+
+def test_serialize_exercise_page(benchmark, exercise_page):
+    def serialize():
+        return [Exercise.model_validate(e, from_attributes=True).model_dump_json() for e in exercise_page]
+
+    assert len(benchmark(serialize)) == 100
+
+
+def test_serialize_workout_page(benchmark, workout_page):
+    def serialize():
+        return [Workout.model_validate(w, from_attributes=True).model_dump_json() for w in workout_page]
+
+    assert len(benchmark(serialize)) == 100
+
+
+# FAST_LIST_SERIALIZATION: the whole list path (validate + encode) for the
+# current response_model route against row mappings -> dicts -> orjson.
+
+def exercise_rows(exercise):
+    """Flatten a SimpleNamespace exercise into the rows the fast path selects"""
+    row = {
+        column.key: getattr(exercise, column.key)
+        for column in row_serializers.EXERCISE_COLUMNS
+    }
+    row["difficulty"] = DifficultyLevel(exercise.difficulty)
+    for field in row_serializers.LOOKUP_FIELDS:
+        row[f"category__{field}"] = getattr(exercise.category, field)
+
+    def lookups(items):
+        return [
+            {"exercise_id": exercise.id, **{f: getattr(i, f) for f in row_serializers.LOOKUP_FIELDS}}
+            for i in items
+        ]
+
+    return row, lookups(exercise.muscle_groups), lookups(exercise.equipment)
+
+
+def workout_rows(workout):
+    row = {column.key: getattr(workout, column.key) for column in row_serializers.WORKOUT_COLUMNS}
+    row["difficulty"] = WorkoutDifficulty(workout.difficulty)
+    exercises = [
+        {
+            column.key: getattr(we, column.key)
+            for column in row_serializers.WORKOUT_EXERCISE_COLUMNS
+        }
+        for we in workout.exercises
+    ]
+    return row, exercises
+
+
+def build_exercises(rows):
+    muscle_groups = defaultdict(list)
+    equipment = defaultdict(list)
+    for _, mg_rows, eq_rows in rows:
+        for mg in mg_rows:
+            muscle_groups[mg["exercise_id"]].append(row_serializers.lookup_dict(mg))
+        for eq in eq_rows:
+            equipment[eq["exercise_id"]].append(row_serializers.lookup_dict(eq))
+    return {
+        row["id"]: row_serializers.exercise_dict(row, muscle_groups[row["id"]], equipment[row["id"]])
+        for row, _, _ in rows
+    }
+
+
+def test_exercise_list_pydantic(benchmark, exercise_page):
+    adapter = TypeAdapter(List[Exercise])
+
+    def serialize():
+        return adapter.dump_json(adapter.validate_python(exercise_page, from_attributes=True))
+
+    assert len(json.loads(benchmark(serialize))) == 100
+
+
+def test_exercise_list_fast(benchmark, exercise_page):
+    rows = [exercise_rows(e) for e in exercise_page]
+    response = FastJSONResponse(content=None)
+
+    def serialize():
+        return response.render(list(build_exercises(rows).values()))
+
+    assert len(json.loads(benchmark(serialize))) == 100
+
+
+def test_workout_list_pydantic(benchmark, workout_page):
+    adapter = TypeAdapter(List[Workout])
+
+    def serialize():
+        return adapter.dump_json(adapter.validate_python(workout_page, from_attributes=True))
+
+    assert len(json.loads(benchmark(serialize))) == 100
+
+
+def test_workout_list_fast(benchmark, workout_page):
+    rows = [workout_rows(w) for w in workout_page]
+    catalog_rows = [
+        exercise_rows(we.exercise) for w in workout_page for we in w.exercises
+    ]
+    response = FastJSONResponse(content=None)
+
+    def serialize():
+        catalog = build_exercises(catalog_rows)
+        return response.render([
+            row_serializers.workout_dict(
+                row,
+                [
+                    row_serializers.workout_exercise_dict(we, catalog[we["exercise_id"]])
+                    for we in exercises
+                ],
+            )
+            for row, exercises in rows
+        ])
+
+    assert len(json.loads(benchmark(serialize))) == 100
+
+
+def test_fast_path_matches_schema(workout_page):
+    """Fast-path payloads validate against the response_model unchanged"""
+    workout = workout_page[0]
+    row, exercises = workout_rows(workout)
+    catalog = build_exercises([exercise_rows(we.exercise) for we in workout.exercises])
+    payload = json.loads(FastJSONResponse(content=None).render(
+        row_serializers.workout_dict(
+            row,
+            [row_serializers.workout_exercise_dict(we, catalog[we["exercise_id"]]) for we in exercises],
+        )
+    ))
+    expected = json.loads(Workout.model_validate(workout, from_attributes=True).model_dump_json())
+    assert Workout.model_validate(payload).model_dump(mode="json") == expected
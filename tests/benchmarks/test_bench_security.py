@@ -0,0 +1,70 @@
+from datetime import datetime, timedelta
+from cryptography.hazmat.primitives.asymmetric import ec, ed25519
+from jose import jwt as jose_jwt
+from app.config.settings import settings
+from app.core.revocation import BloomFilter
+from app.core.security import create_access_token
+from app.core.tokens import KeySet
+from app.services.auth import AuthService
+
+
+def _claims():
+    return {
+        "exp": datetime.utcnow() + timedelta(minutes=30),
+        "sub": "benchuser",
+        "type": "access",
+        "jti": "0" * 32,
+    }
+
+
+def _asymmetric_key_set(algorithm, private_key):
+    public_key = private_key.public_key()
+    return KeySet("bench", algorithm, private_key, {"bench": (algorithm, public_key)})
+
+
+def test_create_access_token(benchmark):
+    token = benchmark(create_access_token, subject="benchuser")
+    assert token
+
+
+def test_verify_token(benchmark):
+    token = create_access_token(subject="benchuser")
+    username = benchmark(AuthService.verify_token, token)
+    assert username == "benchuser"
+
+
+def test_decode_jose_hs256(benchmark):
+    # The previous verification path, kept as the baseline
+    token = jose_jwt.encode(_claims(), settings.SECRET_KEY, algorithm="HS256")
+    payload = benchmark(
+        jose_jwt.decode, token, settings.SECRET_KEY, algorithms=["HS256"]
+    )
+    assert payload["sub"] == "benchuser"
+
+
+def test_decode_key_set_hs256(benchmark):
+    keys = KeySet("bench", "HS256", settings.SECRET_KEY, {"bench": ("HS256", settings.SECRET_KEY)})
+    token = keys.encode(_claims())
+    payload = benchmark(keys.decode, token)
+    assert payload["sub"] == "benchuser"
+
+
+def test_decode_key_set_eddsa(benchmark):
+    keys = _asymmetric_key_set("EdDSA", ed25519.Ed25519PrivateKey.generate())
+    token = keys.encode(_claims())
+    payload = benchmark(keys.decode, token)
+    assert payload["sub"] == "benchuser"
+
+
+def test_decode_key_set_es256(benchmark):
+    keys = _asymmetric_key_set("ES256", ec.generate_private_key(ec.SECP256R1()))
+    token = keys.encode(_claims())
+    payload = benchmark(keys.decode, token)
+    assert payload["sub"] == "benchuser"
+
+
+def test_revocation_filter_lookup(benchmark):
+    bloom = BloomFilter(100000, 0.001)
+    for i in range(10000):
+        bloom.add(f"revoked-{i}")
+    assert not benchmark(bloom.__contains__, "0" * 32)
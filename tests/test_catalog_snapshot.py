@@ -0,0 +1,32 @@
+from app.services.catalog_snapshot import compute_delta
+
+
+def catalog(version, exercises, equipment=()):
+    return {
+        "format": 1,
+        "version": version,
+        "exercises": exercises,
+        "equipment": list(equipment),
+        "categories": [],
+        "muscle_groups": [],
+        "movement_patterns": [],
+    }
+
+
+def test_delta_carries_changed_new_and_deleted_rows():
+    squat = {"id": "a", "name": "Squat", "equipment_ids": ["bar"]}
+    lunge = {"id": "b", "name": "Lunge", "equipment_ids": []}
+    old = catalog("v1", [squat, lunge], equipment=[{"id": "bar", "name": "Barbell"}])
+    new = catalog(
+        "v2",
+        [{**squat, "name": "Back Squat"}, {"id": "c", "name": "Step-up", "equipment_ids": []}],
+        equipment=[{"id": "bar", "name": "Barbell"}],
+    )
+
+    delta = compute_delta(old, new)
+
+    assert delta["from_version"] == "v1" and delta["version"] == "v2"
+    exercises = delta["tables"]["exercises"]
+    assert [row["id"] for row in exercises["upserted"]] == ["a", "c"]
+    assert exercises["deleted"] == ["b"]
+    assert delta["tables"]["equipment"] == {"upserted": [], "deleted": []}
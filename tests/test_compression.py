@@ -0,0 +1,106 @@
+import gzip
+import json
+
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import Response, StreamingResponse
+from fastapi.testclient import TestClient
+
+from app.core import middleware
+from app.core.middleware import CompressionMiddleware
+
+PAYLOAD = {"instructions": "Keep your core braced and drive through the heels. " * 100}
+
+
+def make_client(**kwargs) -> TestClient:
+    app = FastAPI()
+    app.add_middleware(CompressionMiddleware, **kwargs)
+
+    @app.get("/large")
+    def large():
+        return PAYLOAD
+
+    @app.get("/small")
+    def small():
+        return {"ok": True}
+
+    @app.get("/binary")
+    def binary():
+        return Response(b"\0" * 4096, media_type="application/octet-stream")
+
+    @app.get("/etag")
+    def etag():
+        return Response(json.dumps(PAYLOAD), media_type="application/json", headers={"ETag": '"abc"'})
+
+    @app.get("/export")
+    def export():
+        def rows():
+            for i in range(200):
+                yield json.dumps({"row": i, "note": "x" * 40}) + "\n"
+
+        return StreamingResponse(rows(), media_type="application/x-ndjson")
+
+    @app.get("/tiny-stream")
+    def tiny_stream():
+        return StreamingResponse(iter([b"a", b"b"]), media_type="text/plain")
+
+    return TestClient(app)
+
+
+@pytest.fixture()
+def client():
+    return make_client(minimum_size=512, content_types=["application/json", "application/x-ndjson", "text/"])
+
+
+def test_large_json_is_gzipped(client):
+    response = client.get("/large", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    assert "Accept-Encoding" in response.headers["vary"]
+    assert int(response.headers["content-length"]) < len(json.dumps(PAYLOAD))
+    assert response.json() == PAYLOAD
+
+
+def test_below_minimum_size_is_not_compressed(client):
+    response = client.get("/small", headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in response.headers
+    assert response.json() == {"ok": True}
+
+
+def test_content_type_outside_allowlist_is_not_compressed(client):
+    response = client.get("/binary", headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in response.headers
+
+
+def test_identity_only_client_gets_plain_body(client):
+    response = client.get("/large", headers={"Accept-Encoding": "identity, gzip;q=0"})
+    assert "content-encoding" not in response.headers
+    assert response.json() == PAYLOAD
+
+
+def test_strong_etag_is_weakened(client):
+    response = client.get("/etag", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["etag"] == 'W/"abc"'
+
+
+def test_streaming_response_is_compressed_incrementally(client):
+    with client.stream("GET", "/export", headers={"Accept-Encoding": "gzip"}) as response:
+        assert response.headers["content-encoding"] == "gzip"
+        assert "content-length" not in response.headers
+        raw = b"".join(response.iter_raw())
+
+    lines = gzip.decompress(raw).decode().splitlines()
+    assert len(lines) == 200
+    assert json.loads(lines[-1])["row"] == 199
+
+
+def test_short_stream_is_sent_uncompressed(client):
+    response = client.get("/tiny-stream", headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in response.headers
+    assert response.text == "ab"
+
+
+@pytest.mark.skipif(middleware.brotli is None, reason="brotli not installed")
+def test_brotli_preferred_when_accepted(client):
+    response = client.get("/large", headers={"Accept-Encoding": "gzip, br"})
+    assert response.headers["content-encoding"] == "br"
+    assert response.json() == PAYLOAD
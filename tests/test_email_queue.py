@@ -0,0 +1,150 @@
+import asyncio
+import socket
+from email.message import EmailMessage
+
+import pytest
+from aiosmtpd.controller import Controller
+
+from app.services.email_queue import EmailQueue, EmailQueueCollector
+
+
+class RecordingHandler:
+    def __init__(self, fail_first: int = 0, refuse: str = ""):
+        self.messages = []
+        self.connections = 0
+        self.fail_first = fail_first
+        self.refuse = refuse
+
+    async def handle_EHLO(self, server, session, envelope, hostname, responses):
+        self.connections += 1
+        session.host_name = hostname
+        return responses
+
+    async def handle_RCPT(self, server, session, envelope, address, rcpt_options):
+        if address == self.refuse:
+            return "550 No such user"
+        envelope.rcpt_tos.append(address)
+        return "250 OK"
+
+    async def handle_DATA(self, server, session, envelope):
+        if self.fail_first:
+            self.fail_first -= 1
+            return "451 Try again later"
+        self.messages.append(envelope)
+        return "250 Message accepted for delivery"
+
+
+def free_port() -> int:
+    # aiosmtpd connects to the port it was given to check the server is up,
+    # so it needs a real one rather than 0
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@pytest.fixture()
+def smtp_server():
+    def _start(handler):
+        controller = Controller(handler, hostname="127.0.0.1", port=free_port())
+        controller.start()
+        servers.append(controller)
+        return controller
+
+    servers = []
+    yield _start
+    for controller in servers:
+        controller.stop()
+
+
+def make_queue(controller, **kwargs) -> EmailQueue:
+    return EmailQueue(
+        hostname=controller.hostname,
+        port=controller.port,
+        username="",
+        password="",
+        start_tls=False,
+        use_tls=False,
+        use_credentials=False,
+        flush_interval=0.05,
+        retry_backoff=0.01,
+        **kwargs,
+    )
+
+
+def make_message(to: str) -> EmailMessage:
+    message = EmailMessage()
+    message["Subject"] = "Test"
+    message["From"] = "noreply@example.com"
+    message["To"] = to
+    message.set_content("<p>Hello</p>", subtype="html")
+    return message
+
+
+@pytest.mark.asyncio
+async def test_batch_reuses_one_connection(smtp_server):
+    handler = RecordingHandler()
+    queue = make_queue(smtp_server(handler), batch_size=10)
+    await queue.start()
+
+    for i in range(25):
+        queue.enqueue(make_message(f"user{i}@example.com"))
+    await asyncio.wait_for(queue.join(), timeout=5)
+    await queue.stop()
+
+    assert len(handler.messages) == 25
+    assert handler.connections == 1
+    assert queue.stats()["sent_total"] == 25
+    assert queue.stats()["depth"] == 0
+
+
+@pytest.mark.asyncio
+async def test_transient_failure_is_retried(smtp_server):
+    handler = RecordingHandler(fail_first=2)
+    queue = make_queue(smtp_server(handler), max_retries=3)
+    await queue.start()
+
+    queue.enqueue(make_message("user@example.com"))
+    await asyncio.wait_for(queue.join(), timeout=5)
+    await queue.stop()
+
+    stats = queue.stats()
+    assert len(handler.messages) == 1
+    assert stats["retried_total"] == 2
+    assert stats["failed_total"] == 0
+
+
+@pytest.mark.asyncio
+async def test_refused_message_does_not_sink_the_batch(smtp_server):
+    handler = RecordingHandler(refuse="gone@example.com")
+    queue = make_queue(smtp_server(handler), batch_size=10)
+    await queue.start()
+
+    queue.enqueue(make_message("gone@example.com"))
+    queue.enqueue(make_message("user@example.com"))
+    await asyncio.wait_for(queue.join(), timeout=5)
+    await queue.stop()
+
+    stats = queue.stats()
+    assert [m.rcpt_tos for m in handler.messages] == [["user@example.com"]]
+    assert stats["failed_total"] == 1
+    assert stats["sent_total"] == 1
+
+
+@pytest.mark.asyncio
+async def test_full_queue_drops_are_counted(smtp_server):
+    queue = make_queue(smtp_server(RecordingHandler()), max_size=1)
+    await queue.start()
+
+    # The sender can't run in between, so only the first one fits
+    for i in range(3):
+        queue.enqueue(make_message(f"user{i}@example.com"))
+    await asyncio.wait_for(queue.join(), timeout=5)
+    await queue.stop()
+
+    assert queue.stats()["dropped_total"] == 2
+    metrics = {
+        sample.name: sample.value
+        for family in EmailQueueCollector(queue).collect()
+        for sample in family.samples
+    }
+    assert metrics["email_queue_dropped_total"] == 2
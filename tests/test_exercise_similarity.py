@@ -0,0 +1,39 @@
+import numpy as np
+
+from app.services.exercise_similarity import top_k_neighbours
+
+
+def test_top_k_orders_by_cosine_and_skips_self():
+    features = np.array(
+        [
+            [1.0, 1.0, 0.0],  # 0
+            [1.0, 0.9, 0.0],  # 1: almost 0
+            [0.0, 0.0, 1.0],  # 2: unrelated
+            [1.0, 0.0, 0.0],  # 3
+        ],
+        dtype=np.float32,
+    )
+    indices, scores = top_k_neighbours(features, k=2)
+
+    assert indices.shape == (4, 2)
+    assert list(indices[0]) == [1, 3]
+    assert all(i not in row for i, row in enumerate(indices))
+    assert np.all(np.diff(scores, axis=1) <= 0)
+
+
+def test_top_k_is_capped_by_catalog_size():
+    indices, scores = top_k_neighbours(np.eye(3, dtype=np.float32), k=10)
+    assert indices.shape == (3, 2)
+    assert np.all(scores == 0)
+
+
+def test_chunked_result_matches_dense():
+    rng = np.random.default_rng(0)
+    features = (rng.random((1100, 40)) > 0.8).astype(np.float32)
+    indices, scores = top_k_neighbours(features, k=5)
+
+    unit = features / np.maximum(np.linalg.norm(features, axis=1, keepdims=True), 1e-12)
+    dense = unit @ unit.T
+    np.fill_diagonal(dense, -np.inf)
+    expected = -np.sort(-dense, axis=1)[:, :5]
+    assert np.allclose(scores, expected, atol=1e-5)
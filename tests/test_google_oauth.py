@@ -0,0 +1,125 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import jwt
+import pytest
+from cryptography.hazmat.primitives.asymmetric import rsa
+from fastapi import HTTPException
+
+from app.config.settings import settings
+from app.core.jwks import JWKSCache, cache_max_age
+from app.core.oauth2 import GoogleOAuth2
+
+
+def make_key(kid):
+    private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    jwk = json.loads(jwt.algorithms.RSAAlgorithm.to_jwk(private_key.public_key()))
+    jwk.update({"kid": kid, "alg": "RS256", "use": "sig"})
+    return private_key, jwk
+
+
+def id_token(private_key, kid, **overrides):
+    now = int(time.time())
+    claims = {
+        "iss": "https://accounts.google.com",
+        "aud": settings.GOOGLE_CLIENT_ID,
+        "sub": "1234567890",
+        "email": "runner@example.com",
+        "email_verified": True,
+        "iat": now,
+        "exp": now + 3600,
+    }
+    claims.update(overrides)
+    return jwt.encode(claims, private_key, algorithm="RS256", headers={"kid": kid})
+
+
+@pytest.fixture()
+def jwks_server():
+    """Local stand-in for Google's certs endpoint"""
+    state = {"keys": [], "requests": 0}
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            state["requests"] += 1
+            body = state.get("body") or json.dumps({"keys": state["keys"]}).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Cache-Control", "public, max-age=21600, must-revalidate")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    state["url"] = f"http://127.0.0.1:{server.server_address[1]}/oauth2/v3/certs"
+    yield state
+    server.shutdown()
+
+
+def test_cache_control_max_age():
+    assert cache_max_age("public, max-age=21600, must-revalidate", 60) == 21600
+    assert cache_max_age("no-cache", 60) == 60
+    assert cache_max_age(None, 60) == 60
+
+
+@pytest.mark.asyncio
+async def test_keys_are_fetched_once(jwks_server):
+    private_key, jwk = make_key("k1")
+    jwks_server["keys"] = [jwk]
+    cache = JWKSCache(jwks_server["url"])
+
+    for _ in range(3):
+        idinfo = await GoogleOAuth2.verify_token(id_token(private_key, "k1"), jwks=cache)
+        assert idinfo["sub"] == "1234567890"
+    assert jwks_server["requests"] == 1
+    await cache.stop()
+
+
+@pytest.mark.asyncio
+async def test_unknown_kid_refetches_rotated_keys(jwks_server):
+    old_key, old_jwk = make_key("k1")
+    new_key, new_jwk = make_key("k2")
+    jwks_server["keys"] = [old_jwk]
+    cache = JWKSCache(jwks_server["url"], min_refresh_interval=0)
+    await GoogleOAuth2.verify_token(id_token(old_key, "k1"), jwks=cache)
+
+    jwks_server["keys"] = [old_jwk, new_jwk]
+    idinfo = await GoogleOAuth2.verify_token(id_token(new_key, "k2"), jwks=cache)
+    assert idinfo["email"] == "runner@example.com"
+    assert jwks_server["requests"] == 2
+    await cache.stop()
+
+
+@pytest.mark.asyncio
+async def test_foreign_and_incomplete_tokens_are_rejected(jwks_server):
+    private_key, jwk = make_key("k1")
+    jwks_server["keys"] = [jwk]
+    cache = JWKSCache(jwks_server["url"])
+
+    for token in (
+        id_token(private_key, "k1", aud="someone-else.apps.googleusercontent.com"),
+        id_token(private_key, "k1", iss="https://evil.example.com"),
+        id_token(private_key, "k1", email=None),
+    ):
+        with pytest.raises(HTTPException) as exc:
+            await GoogleOAuth2.verify_token(token, jwks=cache)
+        assert exc.value.status_code == 401
+    await cache.stop()
+
+
+@pytest.mark.asyncio
+async def test_malformed_key_set_is_unavailable(jwks_server):
+    private_key, _ = make_key("k1")
+    cache = JWKSCache(jwks_server["url"], min_refresh_interval=0)
+
+    for body in (b"not json", b"{}", b"[]", b'{"keys": "k1"}'):
+        jwks_server["body"] = body
+        with pytest.raises(HTTPException) as exc:
+            await GoogleOAuth2.verify_token(id_token(private_key, "k1"), jwks=cache)
+        assert exc.value.status_code == 503
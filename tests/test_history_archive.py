@@ -0,0 +1,68 @@
+import datetime
+import uuid
+
+import pytest
+
+pytest.importorskip("pyarrow")
+
+from app.services.history_archive import (  # noqa: E402
+    archive_key,
+    merge_sets,
+    sets_from_parquet,
+    sets_to_parquet,
+)
+
+SESSION_ID = uuid.uuid4()
+NOW = datetime.datetime(2024, 3, 14, 18, 30, tzinfo=datetime.timezone.utc)
+
+
+def make_set(set_number, session_id=SESSION_ID, weight=100.0):
+    return {
+        "id": uuid.uuid4(),
+        "workout_session_id": session_id,
+        "workout_exercise_id": uuid.uuid4(),
+        "set_number": set_number,
+        "reps": 5,
+        "weight": weight,
+        "duration": None,
+        "rpe": 8,
+        "notes": None,
+        "created_at": NOW,
+        "updated_at": NOW,
+    }
+
+
+def test_parquet_round_trip_keeps_values():
+    row = make_set(1)
+    [back] = sets_from_parquet(sets_to_parquet([row]))
+    assert back["id"] == str(row["id"])
+    assert back["workout_session_id"] == str(SESSION_ID)
+    assert back["weight"] == 100.0
+    assert back["duration"] is None
+    assert back["created_at"] == NOW
+
+
+def test_merge_replaces_sets_already_in_the_file():
+    first, second = make_set(1), make_set(2)
+    existing = sets_from_parquet(sets_to_parquet([first, second]))
+    retried = {**second, "weight": 105.0}
+    merged = merge_sets(existing, [retried])
+    assert [row["set_number"] for row in merged] == [1, 2]
+    assert merged[1]["weight"] == 105.0
+
+
+def test_merge_groups_sets_by_session():
+    other = uuid.uuid4()
+    rows = [make_set(2), make_set(1, session_id=other), make_set(1)]
+    merged = merge_sets([], rows)
+    sessions = [str(row["workout_session_id"]) for row in merged]
+    assert sessions == sorted(sessions)
+
+
+def test_archive_keys_are_per_user_and_month_and_never_reused():
+    user_id = uuid.uuid4()
+    month = datetime.datetime(2024, 3, 1, tzinfo=datetime.timezone.utc)
+    first, second = archive_key(user_id, month), archive_key(user_id, month)
+    assert first != second
+    assert first.startswith(f"history/{user_id}/2024-03-")
+    assert first.endswith(".parquet")
@@ -0,0 +1,76 @@
+import uuid
+import pytest
+from fastapi import HTTPException, Request
+from redis.exceptions import RedisError
+from app.api.v1.auth import client_ip
+from app.config.settings import settings
+from app.core.redis_client import get_redis
+from app.services.login_throttle import LoginThrottle
+
+
+@pytest.fixture()
+def redis():
+    client = get_redis()
+    try:
+        client.ping()
+    except RedisError:
+        pytest.skip("Redis is not available")
+    return client
+
+
+def test_account_locks_after_threshold(redis):
+    account = f"user-{uuid.uuid4().hex}"
+    for _ in range(settings.LOGIN_MAX_FAILURES_PER_ACCOUNT - 1):
+        LoginThrottle.record_failure(account)
+        LoginThrottle.check(account)
+
+    LoginThrottle.record_failure(account)
+    with pytest.raises(HTTPException) as exc:
+        LoginThrottle.check(account.upper())
+    assert exc.value.status_code == 429
+    assert 0 < int(exc.value.headers["Retry-After"]) <= settings.LOGIN_LOCKOUT_BASE_SECONDS
+
+
+def test_lockout_doubles_per_extra_failure(redis):
+    account = f"user-{uuid.uuid4().hex}"
+    for _ in range(settings.LOGIN_MAX_FAILURES_PER_ACCOUNT + 2):
+        LoginThrottle.record_failure(account)
+
+    ttl = redis.ttl(f"auth:login:lock:account:{account}")
+    assert ttl > settings.LOGIN_LOCKOUT_BASE_SECONDS * 2
+
+
+def test_ip_lock_applies_to_every_account(redis):
+    ip = f"test-ip-{uuid.uuid4().hex}"
+    for _ in range(settings.LOGIN_MAX_FAILURES_PER_IP):
+        LoginThrottle.record_failure(f"stuffed-{uuid.uuid4().hex}", ip)
+
+    with pytest.raises(HTTPException):
+        LoginThrottle.check(f"someone-{uuid.uuid4().hex}", ip)
+
+
+def test_success_resets_account_failures(redis):
+    account = f"user-{uuid.uuid4().hex}"
+    for _ in range(settings.LOGIN_MAX_FAILURES_PER_ACCOUNT - 1):
+        LoginThrottle.record_failure(account)
+    LoginThrottle.record_success(account)
+
+    LoginThrottle.record_failure(account)
+    LoginThrottle.check(account)
+
+
+def _request(forwarded_for=None):
+    headers = [(b"x-forwarded-for", forwarded_for.encode())] if forwarded_for else []
+    return Request({"type": "http", "headers": headers, "client": ("10.0.0.2", 4321)})
+
+
+def test_client_ip_trusts_only_configured_proxy_hops(monkeypatch):
+    monkeypatch.setattr(settings, "TRUSTED_PROXY_HOPS", 0)
+    assert client_ip(_request("1.2.3.4")) == "10.0.0.2"
+
+    monkeypatch.setattr(settings, "TRUSTED_PROXY_HOPS", 1)
+    assert client_ip(_request("6.6.6.6, 203.0.113.7")) == "203.0.113.7"
+    assert client_ip(_request()) == "10.0.0.2"
+
+    monkeypatch.setattr(settings, "TRUSTED_PROXY_HOPS", 2)
+    assert client_ip(_request("6.6.6.6, 203.0.113.7, 10.0.0.1")) == "203.0.113.7"
@@ -0,0 +1,33 @@
+import pytest
+from app.core.security import build_crypt_context
+
+
+def test_lower_bcrypt_cost_needs_update():
+    old = build_crypt_context("bcrypt", bcrypt_rounds=4)
+    current = build_crypt_context("bcrypt", bcrypt_rounds=5)
+    hashed = old.hash("Test@1234")
+
+    assert current.verify("Test@1234", hashed)
+    assert current.needs_update(hashed)
+    assert not current.needs_update(current.hash("Test@1234"))
+
+
+def test_switching_to_argon2id_upgrades_bcrypt_hashes():
+    pytest.importorskip("argon2")
+    bcrypt_context = build_crypt_context("bcrypt", bcrypt_rounds=4)
+    argon2_context = build_crypt_context(
+        "argon2", argon2_time_cost=1, argon2_memory_cost=1024, argon2_parallelism=1
+    )
+    legacy = bcrypt_context.hash("Test@1234")
+
+    assert argon2_context.verify("Test@1234", legacy)
+    assert argon2_context.needs_update(legacy)
+
+    upgraded = argon2_context.hash("Test@1234")
+    assert upgraded.startswith("$argon2id$")
+    assert not argon2_context.needs_update(upgraded)
+
+
+def test_unknown_scheme_is_rejected():
+    with pytest.raises(ValueError):
+        build_crypt_context("md5_crypt")
@@ -0,0 +1,35 @@
+import pytest
+
+from app.models.workout import PersonalRecordType
+from app.services.personal_records import candidate_records, estimated_1rm
+
+
+def by_type(candidates):
+    return {(record_type, scope): value for record_type, scope, value in candidates}
+
+
+def test_loaded_set_claims_every_record_type():
+    records = by_type(candidate_records(100.0, 5))
+    assert records[(PersonalRecordType.MAX_WEIGHT, 0.0)] == 100.0
+    assert records[(PersonalRecordType.MAX_REPS_AT_WEIGHT, 100.0)] == 5.0
+    assert records[(PersonalRecordType.MAX_VOLUME, 0.0)] == 500.0
+    assert records[(PersonalRecordType.ESTIMATED_1RM, 0.0)] == pytest.approx(116.67, abs=0.01)
+
+
+def test_single_is_its_own_1rm():
+    assert estimated_1rm(140.0, 1) == 140.0
+
+
+def test_high_rep_sets_skip_1rm_estimate():
+    types = {record_type for record_type, _, _ in candidate_records(40.0, 20)}
+    assert PersonalRecordType.ESTIMATED_1RM not in types
+    assert PersonalRecordType.MAX_VOLUME in types
+
+
+def test_bodyweight_set_only_tracks_reps():
+    assert candidate_records(None, 15) == [(PersonalRecordType.MAX_REPS_AT_WEIGHT, 0.0, 15.0)]
+
+
+def test_sets_without_reps_claim_nothing():
+    assert candidate_records(60.0, None) == []
+    assert candidate_records(60.0, 0) == []
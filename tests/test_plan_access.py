@@ -0,0 +1,106 @@
+"""
+Public plans can reference their author's private workouts; using such a
+plan must not hand those workouts to someone else.
+
+These need a real Postgres (set TEST_POSTGRES_URL to a scratch database).
+"""
+
+import datetime
+import os
+
+import pytest
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import Session
+
+from app.db.base import Base
+from app.models.user import User
+from app.models.workout import (
+    ScheduledWorkout,
+    Workout,
+    WorkoutDifficulty,
+    WorkoutPlan,
+    WorkoutPlanWorkout,
+)
+import app.models.subscription  # noqa: F401  (register tables on Base.metadata)
+from app.schemas.workout import PlanEnrollmentCreate
+from app.services.schedule import ScheduleService
+from app.services.workout import WorkoutService
+
+TEST_POSTGRES_URL = os.getenv("TEST_POSTGRES_URL")
+
+pytestmark = pytest.mark.skipif(
+    not TEST_POSTGRES_URL, reason="TEST_POSTGRES_URL not set"
+)
+
+
+@pytest.fixture()
+def pg_db():
+    engine = create_engine(TEST_POSTGRES_URL)
+    Base.metadata.create_all(bind=engine)
+    with Session(engine, expire_on_commit=False) as session:
+        yield session
+    Base.metadata.drop_all(bind=engine)
+    engine.dispose()
+
+
+def make_user(db: Session, name: str) -> User:
+    user = User(email=f"{name}@example.com", username=name, hashed_password="x")
+    db.add(user)
+    db.flush()
+    return user
+
+
+@pytest.fixture()
+def public_plan(pg_db):
+    """A public plan by `author` with one public and one private workout"""
+    author = make_user(pg_db, "author")
+    public = Workout(
+        name="Shared", difficulty=WorkoutDifficulty.BEGINNER,
+        is_public=True, created_by_id=author.id,
+    )
+    private = Workout(
+        name="Secret", difficulty=WorkoutDifficulty.BEGINNER,
+        is_public=False, created_by_id=author.id,
+    )
+    plan = WorkoutPlan(
+        name="Public plan", duration_weeks=1, difficulty=WorkoutDifficulty.BEGINNER,
+        is_public=True, created_by_id=author.id,
+    )
+    pg_db.add_all([public, private, plan])
+    pg_db.flush()
+    pg_db.add_all([
+        WorkoutPlanWorkout(workout_plan_id=plan.id, workout_id=public.id, week_number=1, day_number=1),
+        WorkoutPlanWorkout(workout_plan_id=plan.id, workout_id=private.id, week_number=1, day_number=2),
+    ])
+    pg_db.commit()
+    return plan
+
+
+def test_clone_plan_skips_private_workouts_of_other_users(pg_db, public_plan):
+    cloner = make_user(pg_db, "cloner")
+    pg_db.commit()
+
+    clone = WorkoutService.clone_workout_plan(pg_db, str(public_plan.id), cloner)
+
+    assert [entry.workout.name for entry in clone.schedule] == ["Shared"]
+    names = pg_db.execute(
+        select(Workout.name).where(Workout.created_by_id == cloner.id)
+    ).scalars().all()
+    assert names == ["Shared"]
+
+
+def test_enroll_schedules_only_accessible_workouts(pg_db, public_plan):
+    follower = make_user(pg_db, "follower")
+    pg_db.commit()
+    start = datetime.date(2025, 1, 6)
+
+    ScheduleService.enroll(
+        pg_db, str(public_plan.id), PlanEnrollmentCreate(start_date=start), follower
+    )
+
+    scheduled = pg_db.execute(
+        select(ScheduledWorkout.workout_id).where(ScheduledWorkout.user_id == follower.id)
+    ).scalars().all()
+    assert len(scheduled) == 1
+    schedule = ScheduleService.get_schedule(pg_db, follower, start, start + datetime.timedelta(days=6))
+    assert [entry["workout_name"] for entry in schedule] == ["Shared"]
@@ -0,0 +1,227 @@
+"""
+EXPLAIN-based checks that the service predicates hit their indexes.
+
+These need a real Postgres (set TEST_POSTGRES_URL to a scratch database).
+Sequential scans are disabled so the planner's choice doesn't depend on how
+little data the test tables hold.
+"""
+
+import datetime
+import json
+import os
+import uuid
+
+import pytest
+from sqlalchemy import create_engine, func, insert, or_, select, text, tuple_
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import Session
+
+from app.db.base import Base
+from app.models.exercise import Equipment, ExerciseCatalog, ExerciseCategory, ExerciseEquipment
+from app.models.workout import (
+    ExerciseSet,
+    ScheduledWorkout,
+    Workout,
+    WorkoutExercise,
+    WorkoutSession,
+    WorkoutStatus,
+)
+import app.models.subscription  # noqa: F401  (register tables on Base.metadata)
+from app.services.partitions import PartitionService, add_months, month_start, partition_name
+
+TEST_POSTGRES_URL = os.getenv("TEST_POSTGRES_URL")
+
+LAST_MONTH = add_months(month_start(datetime.date.today()), -1)
+
+pytestmark = pytest.mark.skipif(
+    not TEST_POSTGRES_URL, reason="TEST_POSTGRES_URL not set"
+)
+
+
+@pytest.fixture(scope="module")
+def pg_conn():
+    engine = create_engine(TEST_POSTGRES_URL)
+    Base.metadata.create_all(bind=engine)
+    with Session(engine) as session:
+        # Last month and this month, so there is a partition to prune
+        PartitionService.ensure_partitions(
+            session, "exercise_sets", months_ahead=1, today=LAST_MONTH
+        )
+    with engine.connect() as conn:
+        conn.execute(text("ANALYZE"))
+        conn.execute(text("SET enable_seqscan = off"))
+        yield conn
+    Base.metadata.drop_all(bind=engine)
+    engine.dispose()
+
+
+def plan_values(conn, stmt, key: str) -> set:
+    sql = str(
+        stmt.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True})
+    )
+    plan = conn.execute(text(f"EXPLAIN (FORMAT JSON) {sql}")).scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+
+    found = set()
+
+    def walk(node):
+        if key in node:
+            found.add(node[key])
+        for child in node.get("Plans", []):
+            walk(child)
+
+    walk(plan[0]["Plan"])
+    return found
+
+
+def plan_indexes(conn, stmt) -> set:
+    return plan_values(conn, stmt, "Index Name")
+
+
+USER_ID = uuid.uuid4()
+
+
+def test_list_workouts_uses_owner_and_public_indexes(pg_conn):
+    stmt = select(Workout).where(
+        or_(Workout.created_by_id == USER_ID, Workout.is_public == True)
+    ).limit(20)
+    indexes = plan_indexes(pg_conn, stmt)
+    assert "ix_workouts_created_by_id_is_template" in indexes
+    assert "ix_workouts_public_difficulty" in indexes
+
+
+def test_workout_limit_count_uses_owner_index(pg_conn):
+    stmt = select(func.count()).select_from(Workout).where(
+        Workout.created_by_id == USER_ID, Workout.is_template == False
+    )
+    assert "ix_workouts_created_by_id_is_template" in plan_indexes(pg_conn, stmt)
+
+
+def test_active_session_lookup_uses_session_index(pg_conn):
+    stmt = select(WorkoutSession).where(
+        WorkoutSession.user_id == USER_ID,
+        WorkoutSession.status == WorkoutStatus.IN_PROGRESS,
+    )
+    indexes = plan_indexes(pg_conn, stmt)
+    assert indexes & {
+        "uq_workout_sessions_user_in_progress",
+        "ix_workout_sessions_user_id_status",
+    }
+
+
+def test_session_history_uses_covering_index(pg_conn):
+    stmt = (
+        select(
+            WorkoutSession.id,
+            WorkoutSession.workout_id,
+            Workout.name,
+            WorkoutSession.start_time,
+            WorkoutSession.status,
+            WorkoutSession.total_duration,
+        )
+        .join(Workout, Workout.id == WorkoutSession.workout_id)
+        .where(
+            WorkoutSession.user_id == USER_ID,
+            WorkoutSession.start_time.is_not(None),
+            tuple_(WorkoutSession.start_time, WorkoutSession.id)
+            < (datetime.datetime(2025, 1, 1, tzinfo=datetime.timezone.utc), uuid.uuid4()),
+        )
+        .order_by(WorkoutSession.start_time.desc(), WorkoutSession.id.desc())
+        .limit(21)
+    )
+    assert "ix_workout_sessions_user_id_start_time" in plan_indexes(pg_conn, stmt)
+
+
+def test_session_sets_use_session_index(pg_conn):
+    stmt = select(ExerciseSet).where(ExerciseSet.workout_session_id == uuid.uuid4())
+    # Each partition's copy of ix_exercise_sets_workout_session_id
+    indexes = plan_indexes(pg_conn, stmt)
+    assert indexes
+    assert all(name.endswith("workout_session_id_idx") for name in indexes)
+
+
+def test_session_sets_skip_partitions_older_than_the_session(pg_conn):
+    this_month = add_months(LAST_MONTH, 1)
+    stmt = select(ExerciseSet).where(
+        ExerciseSet.workout_session_id == uuid.uuid4(),
+        ExerciseSet.created_at >= datetime.datetime.combine(
+            this_month, datetime.time(), datetime.timezone.utc
+        ) + datetime.timedelta(days=1),
+    )
+    relations = plan_values(pg_conn, stmt, "Relation Name")
+    assert partition_name("exercise_sets", this_month) in relations
+    # Later months have no partition yet, so the DEFAULT one is still read
+    assert partition_name("exercise_sets", LAST_MONTH) not in relations
+
+
+def test_workout_exercise_check_uses_workout_index(pg_conn):
+    stmt = select(WorkoutExercise).where(WorkoutExercise.workout_id == uuid.uuid4())
+    assert "ix_workout_exercises_workout_id_order" in plan_indexes(pg_conn, stmt)
+
+
+def test_list_exercises_by_category_uses_category_index(pg_conn):
+    stmt = select(ExerciseCatalog).where(
+        ExerciseCatalog.category_id == uuid.uuid4(),
+        ExerciseCatalog.difficulty == "BEGINNER",
+    )
+    assert "ix_exercise_catalog_category_id_difficulty" in plan_indexes(pg_conn, stmt)
+
+
+def test_list_system_exercises_uses_partial_index(pg_conn):
+    stmt = select(ExerciseCatalog).where(ExerciseCatalog.is_custom == False).limit(20)
+    assert "ix_exercise_catalog_system_difficulty" in plan_indexes(pg_conn, stmt)
+
+
+def test_list_exercises_by_equipment_uses_reverse_junction_index(pg_conn):
+    # With empty tables, probing the junction's primary key per exercise
+    # costs the same, so give the planner a catalog where one item of
+    # equipment matches few exercises
+    savepoint = pg_conn.begin_nested()
+    category_id = uuid.uuid4()
+    equipment_ids = [uuid.uuid4() for _ in range(50)]
+    exercise_ids = [uuid.uuid4() for _ in range(1000)]
+    pg_conn.execute(insert(ExerciseCategory), [{"id": category_id, "name": "Strength"}])
+    pg_conn.execute(
+        insert(Equipment),
+        [{"id": id_, "name": f"Equipment {i}"} for i, id_ in enumerate(equipment_ids)],
+    )
+    pg_conn.execute(
+        insert(ExerciseCatalog),
+        [
+            {
+                "id": exercise_id,
+                "name": f"Exercise {i}",
+                "difficulty": "BEGINNER",
+                "category_id": category_id,
+            }
+            for i, exercise_id in enumerate(exercise_ids)
+        ],
+    )
+    pg_conn.execute(
+        insert(ExerciseEquipment),
+        [
+            {"exercise_id": exercise_id, "equipment_id": equipment_ids[i % 50]}
+            for i, exercise_id in enumerate(exercise_ids)
+        ],
+    )
+    pg_conn.execute(text("ANALYZE exercise_catalog, equipment, exercise_equipment"))
+
+    stmt = (
+        select(ExerciseCatalog)
+        .join(ExerciseCatalog.equipment)
+        .where(Equipment.id == equipment_ids[0])
+    )
+    try:
+        assert "ix_exercise_equipment_equipment_id" in plan_indexes(pg_conn, stmt)
+    finally:
+        savepoint.rollback()
+
+
+def test_todays_schedule_uses_calendar_index(pg_conn):
+    today = datetime.date(2025, 1, 1)
+    stmt = select(ScheduledWorkout).where(
+        ScheduledWorkout.user_id == USER_ID,
+        ScheduledWorkout.scheduled_date.between(today, today),
+    )
+    assert "ix_scheduled_workouts_user_id_scheduled_date" in plan_indexes(pg_conn, stmt)
@@ -0,0 +1,43 @@
+import pytest
+from sqlalchemy import column, create_engine, table, text, update
+from app.db.session import RoutingSession, replica_reads
+
+
+@pytest.fixture()
+def engines(tmp_path):
+    """Two databases standing in for primary and replica"""
+    primary = create_engine(f"sqlite:///{tmp_path / 'primary.db'}")
+    replica = create_engine(f"sqlite:///{tmp_path / 'replica.db'}")
+    for engine, source in ((primary, "primary"), (replica, "replica")):
+        with engine.begin() as conn:
+            conn.execute(text("CREATE TABLE origin (name TEXT)"))
+            conn.execute(text("INSERT INTO origin VALUES (:name)"), {"name": source})
+    yield primary, replica
+    primary.dispose()
+    replica.dispose()
+
+
+@replica_reads
+def read_origin(db):
+    return db.execute(text("SELECT name FROM origin")).scalar()
+
+
+def test_only_marked_reads_use_the_replica(engines):
+    primary, replica = engines
+    with RoutingSession(bind=primary, replica=replica) as db:
+        assert read_origin(db) == "replica"
+        assert db.execute(text("SELECT name FROM origin")).scalar() == "primary"
+
+
+def test_reads_stick_to_primary_after_a_write(engines):
+    primary, replica = engines
+    with RoutingSession(bind=primary, replica=replica) as db:
+        db.execute(update(table("origin", column("name"))).values(name="written"))
+        db.commit()
+        assert read_origin(db) == "written"
+
+
+def test_without_replica_everything_uses_primary(engines):
+    primary, _ = engines
+    with RoutingSession(bind=primary) as db:
+        assert read_origin(db) == "primary"
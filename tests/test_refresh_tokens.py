@@ -0,0 +1,61 @@
+import time
+import pytest
+from redis.exceptions import RedisError
+from app.core.exceptions import UnauthorizedException
+from app.core.redis_client import get_redis
+from app.core.tokens import get_key_set
+from app.services.refresh_tokens import RefreshTokenService
+
+
+@pytest.fixture()
+def redis():
+    client = get_redis()
+    try:
+        client.ping()
+    except RedisError:
+        pytest.skip("Redis is not available")
+    return client
+
+
+def claims(token):
+    return get_key_set().decode(token)
+
+
+def test_rotation_invalidates_previous_token(redis):
+    first = claims(RefreshTokenService.issue("rotating-user"))
+    second = claims(RefreshTokenService.rotate(first))
+
+    assert second["fam"] == first["fam"]
+    assert second["jti"] != first["jti"]
+    assert claims(RefreshTokenService.rotate(second))["fam"] == first["fam"]
+
+
+def test_reuse_revokes_the_whole_family(redis):
+    first = claims(RefreshTokenService.issue("replayed-user"))
+    second = claims(RefreshTokenService.rotate(first))
+
+    with pytest.raises(UnauthorizedException):
+        RefreshTokenService.rotate(first)
+    # The legitimate holder is logged out too
+    with pytest.raises(UnauthorizedException):
+        RefreshTokenService.rotate(second)
+
+
+def test_revoke_all_ends_every_family(redis):
+    a = claims(RefreshTokenService.issue("revoked-user"))
+    b = claims(RefreshTokenService.issue("revoked-user"))
+    RefreshTokenService.revoke_all("revoked-user")
+
+    for payload in (a, b):
+        with pytest.raises(UnauthorizedException):
+            RefreshTokenService.rotate(payload)
+
+
+def test_rotation_keeps_the_family_expiry(redis):
+    first = claims(RefreshTokenService.issue("long-lived-user"))
+    # As if the login was nearly a week old
+    redis.expire(f"auth:refresh:family:{first['fam']}", 5)
+    second = claims(RefreshTokenService.rotate(first))
+
+    assert redis.ttl(f"auth:refresh:family:{first['fam']}") <= 5
+    assert second["exp"] - time.time() <= 5
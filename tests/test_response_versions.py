@@ -0,0 +1,82 @@
+"""
+Cache versions (ETags) of exercise and workout responses change when a
+category, muscle group or equipment item they embed is renamed.
+
+These need a real Postgres (set TEST_POSTGRES_URL to a scratch database).
+"""
+
+import os
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from app.db.base import Base
+import app.models.subscription  # noqa: F401  (register tables on Base.metadata)
+from app.models.exercise import (
+    DifficultyLevel,
+    Equipment,
+    ExerciseCatalog,
+    ExerciseCategory,
+    MuscleGroup,
+)
+from app.models.user import User
+from app.models.workout import Workout, WorkoutDifficulty, WorkoutExercise
+from app.services.exercise import ExerciseService
+from app.services.workout import WorkoutService
+
+TEST_POSTGRES_URL = os.getenv("TEST_POSTGRES_URL")
+
+pytestmark = pytest.mark.skipif(
+    not TEST_POSTGRES_URL, reason="TEST_POSTGRES_URL not set"
+)
+
+
+@pytest.fixture()
+def pg_db():
+    engine = create_engine(TEST_POSTGRES_URL)
+    Base.metadata.create_all(bind=engine)
+    with Session(engine, expire_on_commit=False) as session:
+        yield session
+    Base.metadata.drop_all(bind=engine)
+    engine.dispose()
+
+
+@pytest.fixture()
+def catalog(pg_db: Session):
+    user = User(email="coach@example.com", username="coach", hashed_password="x")
+    category = ExerciseCategory(name="Strength")
+    muscle_group = MuscleGroup(name="Quads")
+    equipment = Equipment(name="Barbell")
+    exercise = ExerciseCatalog(
+        name="Back Squat",
+        difficulty=DifficultyLevel.INTERMEDIATE,
+        category=category,
+        muscle_groups=[muscle_group],
+        equipment=[equipment],
+    )
+    workout = Workout(
+        name="Leg Day",
+        difficulty=WorkoutDifficulty.INTERMEDIATE,
+        is_public=True,
+        created_by=user,
+    )
+    pg_db.add_all([user, exercise, workout])
+    pg_db.flush()
+    pg_db.add(WorkoutExercise(workout_id=workout.id, exercise_id=exercise.id, order=1, sets=5))
+    pg_db.commit()
+    return user, exercise, workout, [category, muscle_group, equipment]
+
+
+def test_renaming_related_rows_changes_versions(pg_db: Session, catalog):
+    user, exercise, workout, related = catalog
+
+    for row in related:
+        exercise_version = ExerciseService.get_exercise_version(pg_db, exercise.id)
+        workout_version = WorkoutService.get_public_workout_version(pg_db, workout.id, user)
+
+        row.name = f"{row.name} (renamed)"
+        pg_db.commit()
+
+        assert ExerciseService.get_exercise_version(pg_db, exercise.id) != exercise_version
+        assert WorkoutService.get_public_workout_version(pg_db, workout.id, user) != workout_version
@@ -0,0 +1,98 @@
+import base64
+from datetime import datetime, timedelta
+import jwt
+import pytest
+from cryptography.hazmat.primitives.asymmetric import ed25519
+from fastapi import HTTPException
+from redis.exceptions import ConnectionError as RedisConnectionError
+import app.core.revocation as revocation
+from app.core.revocation import BloomFilter, RevocationList
+from app.core.tokens import KeySet
+
+
+def _claims(**overrides):
+    claims = {
+        "exp": datetime.utcnow() + timedelta(minutes=5),
+        "sub": "testuser",
+        "type": "access",
+        "jti": "a" * 32,
+    }
+    claims.update(overrides)
+    return claims
+
+
+def _key_set(kid, private_key, retired=None):
+    verification_keys = {kid: ("EdDSA", private_key.public_key())}
+    verification_keys.update(retired or {})
+    return KeySet(kid, "EdDSA", private_key, verification_keys)
+
+
+def test_eddsa_round_trip_carries_kid():
+    keys = _key_set("k1", ed25519.Ed25519PrivateKey.generate())
+    token = keys.encode(_claims())
+    assert jwt.get_unverified_header(token)["kid"] == "k1"
+    assert keys.decode(token)["sub"] == "testuser"
+
+
+def test_retired_kid_still_verifies_after_rotation():
+    old_key = ed25519.Ed25519PrivateKey.generate()
+    token = _key_set("k1", old_key).encode(_claims())
+
+    rotated = _key_set(
+        "k2",
+        ed25519.Ed25519PrivateKey.generate(),
+        retired={"k1": ("EdDSA", old_key.public_key())},
+    )
+    assert rotated.decode(token)["sub"] == "testuser"
+
+
+def test_unknown_kid_and_foreign_signature_are_rejected():
+    token = _key_set("k1", ed25519.Ed25519PrivateKey.generate()).encode(_claims())
+
+    with pytest.raises(jwt.PyJWTError):
+        _key_set("k2", ed25519.Ed25519PrivateKey.generate()).decode(token)
+    with pytest.raises(jwt.PyJWTError):
+        _key_set("k1", ed25519.Ed25519PrivateKey.generate()).decode(token)
+
+
+def test_expired_and_incomplete_tokens_are_rejected():
+    keys = _key_set("k1", ed25519.Ed25519PrivateKey.generate())
+    expired = keys.encode(_claims(exp=datetime.utcnow() - timedelta(seconds=1)))
+    untyped = keys.encode({"exp": datetime.utcnow() + timedelta(minutes=5), "sub": "testuser"})
+
+    with pytest.raises(jwt.ExpiredSignatureError):
+        keys.decode(expired)
+    with pytest.raises(jwt.MissingRequiredClaimError):
+        keys.decode(untyped)
+
+
+def test_non_string_key_id_is_an_invalid_token():
+    keys = _key_set("k1", ed25519.Ed25519PrivateKey.generate())
+    _, payload, signature = keys.encode(_claims()).split(".")
+    # jwt.encode refuses such a header, so forge it
+    header = base64.urlsafe_b64encode(b'{"alg":"EdDSA","kid":["k1"]}').rstrip(b"=").decode()
+    token = f"{header}.{payload}.{signature}"
+
+    with pytest.raises(jwt.InvalidTokenError):
+        keys.decode(token)
+
+
+def test_bloom_filter_has_no_false_negatives():
+    bloom = BloomFilter(1000, 0.01)
+    revoked = [f"jti-{i}" for i in range(1000)]
+    for jti in revoked:
+        bloom.add(jti)
+
+    assert all(jti in bloom for jti in revoked)
+    false_positives = sum(f"other-{i}" in bloom for i in range(10000))
+    assert false_positives < 300
+
+
+def test_revoke_fails_loudly_when_redis_is_down(monkeypatch):
+    def unavailable():
+        raise RedisConnectionError("down")
+
+    monkeypatch.setattr(revocation, "get_redis", unavailable)
+    with pytest.raises(HTTPException) as exc:
+        RevocationList(capacity=100, error_rate=0.01, sync_interval=0).revoke("jti-1", 0)
+    assert exc.value.status_code == 503
@@ -0,0 +1,62 @@
+"""
+Starting and resuming workout sessions against the partial unique index on
+in-progress sessions.
+
+These need a real Postgres (set TEST_POSTGRES_URL to a scratch database).
+"""
+
+import os
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from app.db.base import Base
+from app.models.user import User
+from app.models.workout import Workout, WorkoutDifficulty
+import app.models.subscription  # noqa: F401  (register tables on Base.metadata)
+from app.schemas.workout import WorkoutSessionCreate
+from app.services.workout import WorkoutService
+
+TEST_POSTGRES_URL = os.getenv("TEST_POSTGRES_URL")
+
+pytestmark = pytest.mark.skipif(
+    not TEST_POSTGRES_URL, reason="TEST_POSTGRES_URL not set"
+)
+
+
+@pytest.fixture()
+def pg_db():
+    engine = create_engine(TEST_POSTGRES_URL)
+    Base.metadata.create_all(bind=engine)
+    with Session(engine, expire_on_commit=False) as session:
+        yield session
+    Base.metadata.drop_all(bind=engine)
+    engine.dispose()
+
+
+def test_resume_only_returns_a_session_of_the_same_workout(pg_db):
+    user = User(email="lifter@example.com", username="lifter", hashed_password="x")
+    pg_db.add(user)
+    pg_db.flush()
+    legs, arms = (
+        Workout(name=name, difficulty=WorkoutDifficulty.BEGINNER, created_by_id=user.id)
+        for name in ("Legs", "Arms")
+    )
+    pg_db.add_all([legs, arms])
+    pg_db.commit()
+
+    started = WorkoutService.start_workout_session(
+        pg_db, WorkoutSessionCreate(workout_id=legs.id), user
+    )
+    resumed = WorkoutService.start_workout_session(
+        pg_db, WorkoutSessionCreate(workout_id=legs.id), user, resume=True
+    )
+    assert resumed.id == started.id
+
+    with pytest.raises(HTTPException) as exc:
+        WorkoutService.start_workout_session(
+            pg_db, WorkoutSessionCreate(workout_id=arms.id), user, resume=True
+        )
+    assert exc.value.status_code == 400
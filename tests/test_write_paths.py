@@ -0,0 +1,89 @@
+"""
+Writes fetch server-generated columns with RETURNING instead of a refresh
+after commit.
+
+These need a real Postgres (set TEST_POSTGRES_URL to a scratch database).
+"""
+
+import os
+from contextlib import contextmanager
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import Session
+
+from app.db.base import Base
+import app.models.subscription  # noqa: F401  (register tables on Base.metadata)
+import app.models.workout  # noqa: F401
+from app.schemas.user import UserCreate, UserUpdate
+from app.services.user import UserService
+
+TEST_POSTGRES_URL = os.getenv("TEST_POSTGRES_URL")
+
+pytestmark = pytest.mark.skipif(
+    not TEST_POSTGRES_URL, reason="TEST_POSTGRES_URL not set"
+)
+
+
+@pytest.fixture()
+def pg_db():
+    engine = create_engine(TEST_POSTGRES_URL)
+    Base.metadata.create_all(bind=engine)
+    with Session(engine, expire_on_commit=False) as session:
+        yield session
+    Base.metadata.drop_all(bind=engine)
+    engine.dispose()
+
+
+@contextmanager
+def count_queries(db: Session):
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    engine = db.get_bind()
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+
+def make_user(db: Session):
+    return UserService.create_user(
+        db,
+        UserCreate(
+            email="writer@example.com",
+            username="writer",
+            password="Test@1234",
+        ),
+    )
+
+
+def test_create_user_fetches_defaults_with_returning(pg_db: Session):
+    with count_queries(pg_db) as statements:
+        user = make_user(pg_db)
+        # Server defaults are already populated; reading them must not query
+        assert user.created_at is not None
+        assert user.updated_at is not None
+        assert user.id is not None
+
+    # two uniqueness checks + one INSERT ... RETURNING, no post-commit SELECT
+    assert len(statements) == 3
+    assert "RETURNING" in statements[-1].upper()
+
+
+def test_update_user_skips_refresh(pg_db: Session):
+    user = make_user(pg_db)
+    created_at = user.created_at
+
+    with count_queries(pg_db) as statements:
+        updated = UserService.update_user(pg_db, str(user.id), UserUpdate(full_name="Renamed"))
+        assert updated.full_name == "Renamed"
+        assert updated.created_at == created_at
+        assert updated.updated_at is not None
+
+    # SELECT by id + UPDATE ... RETURNING updated_at
+    assert len(statements) == 2
+    assert statements[-1].upper().startswith("UPDATE")